@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+基准测试 - 比较逐关键词子串扫描与编译后的KeywordClassifier在大型README文本上的耗时
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import yaml
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from utils.classifier import KeywordClassifier, METADATA_DIR  # noqa: E402
+
+FILLER_WORDS = [
+    "the", "model", "demo", "space", "using", "with", "results", "install", "run", "example",
+    "python", "requirements", "license", "training", "inference", "dataset", "config", "support",
+    "quick", "start", "parameters", "output", "input", "performance", "benchmark", "user",
+]
+
+
+def make_readme(rng, words, keywords):
+    """生成一段随机README文本，偶尔混入分类关键词"""
+    tokens = [rng.choice(FILLER_WORDS) for _ in range(words)]
+    for _ in range(max(1, words // 2000)):
+        tokens[rng.randrange(words)] = rng.choice(keywords)
+    return " ".join(tokens)
+
+
+def naive_category(table, tags, text):
+    """重构前的分类做法：每个分类的每个关键词都重新拼接标签并分别做子串扫描"""
+    text = text.lower()
+    for category, keywords in table:
+        if any(keyword in ' '.join(tags) or keyword in text for keyword in keywords):
+            return category
+    return 'text'
+
+
+def naive_tags(tag_table, text):
+    """重构前的标签做法：逐个标签对全文做子串扫描"""
+    text = text.lower()
+    return [tag for tag, keywords in tag_table.items() if any(keyword in text for keyword in keywords)]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='关键词分类器基准测试')
+    parser.add_argument('--docs', type=int, default=200, help='README数量')
+    parser.add_argument('--words', type=int, default=20000, help='每个README的词数')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_args()
+    rng = random.Random(args.seed)
+
+    # 与 Hugging Face 爬虫使用相同的分类规则
+    classifier = KeywordClassifier.from_metadata(default_category='text', crawler='huggingface')
+    with open(os.path.join(METADATA_DIR, "categories.yaml"), encoding='utf-8') as f:
+        category_meta = yaml.safe_load(f)
+    with open(os.path.join(METADATA_DIR, "tags.yaml"), encoding='utf-8') as f:
+        tag_meta = yaml.safe_load(f)
+    rules = category_meta['crawler_rules']['huggingface']
+    table = [(name, rules['keywords'][name]) for name in rules['category_priority']]
+    tag_table = {
+        tag['name']: [tag['name']] + (tag.get('aliases') or [])
+        for group in tag_meta['tags'].values() for tag in group['tags']
+    }
+    keywords = [keyword for _, kws in table for keyword in kws]
+
+    docs = [make_readme(rng, args.words, keywords) for _ in range(args.docs)]
+    tags = ["gradio", "region:us", "docker"]
+    megabytes = sum(len(doc) for doc in docs) / 1e6
+
+    start = time.perf_counter()
+    for doc in docs:
+        naive_category(table, tags, doc)
+    category_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for doc in docs:
+        naive_category(table, tags, doc)
+        naive_tags(tag_table, doc)
+    naive_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = [classifier.classify(' '.join(tags), doc) for doc in docs]
+    compiled_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    categories = [classifier.classify_category(' '.join(tags), doc) for doc in docs]
+    category_only_seconds = time.perf_counter() - start
+    assert categories == [category for category, _ in results], "只分类的结果与完整扫描不一致"
+
+    print(f"文本总量: {megabytes:.1f} MB ({args.docs} 个README)")
+    print(f"逐关键词子串扫描(仅分类，命中即停): {category_seconds:.3f}s ({megabytes / category_seconds:.1f} MB/s)")
+    print(f"逐关键词子串扫描(分类+标签): {naive_seconds:.3f}s ({megabytes / naive_seconds:.1f} MB/s)")
+    print(f"编译分类器(分类+标签): {compiled_seconds:.3f}s ({megabytes / compiled_seconds:.1f} MB/s)")
+    print(f"classify_category(仅分类，命中即停): {category_only_seconds:.3f}s "
+          f"({megabytes / category_only_seconds:.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
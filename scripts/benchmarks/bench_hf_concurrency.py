@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+基准测试 - 在本地桩HTTP服务器上测量HuggingFaceCrawler并发抓取详情页的耗时
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(SCRIPTS_DIR, "crawlers"))
+
+from huggingface_crawler import HuggingFaceCrawler  # noqa: E402
+
+
+class StubServer(ThreadingHTTPServer):
+    """放大监听队列，避免高并发时连接被拒"""
+    request_queue_size = 128
+
+
+def make_handler(spaces_per_page, pages, latency):
+    """构造模拟Hugging Face列表页与详情页的请求处理器"""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            if parsed.path == "/spaces":
+                page = int(parse_qs(parsed.query).get("p", ["1"])[0])
+                body = self._listing(page)
+            else:
+                time.sleep(latency)
+                body = self._detail(parsed.path)
+
+            payload = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _listing(self, page):
+            if page > pages:
+                return "<html><body></body></html>"
+            cards = []
+            for i in range(spaces_per_page):
+                name = f"space-{page}-{i}"
+                cards.append(
+                    f'<article class="space-card"><a class="header" href="/spaces/bench/{name}">{name}</a>'
+                    f'<div class="description">stub space {name}</div>'
+                    f'<span class="inline-flex"><span>{i}</span></span><a class="tag">image</a></article>'
+                )
+            return "<html><body>" + "".join(cards) + "</body></html>"
+
+        def _detail(self, path):
+            return (
+                "<html><body><div class=\"space-readme\"><article>"
+                f"Readme for {path} with diffusion model</article></div>"
+                "<div class=\"space-sdk-items\"><a class=\"link-box\">gradio</a></div>"
+                "<span class=\"discussion-tab-count\">3</span>"
+                "<div class=\"metadata\"><time datetime=\"2024-01-02\"></time><time datetime=\"2024-01-01\"></time></div>"
+                "</body></html>"
+            )
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='HuggingFaceCrawler并发基准测试')
+    parser.add_argument('--pages', type=int, default=2, help='桩服务器列表页数')
+    parser.add_argument('--spaces-per-page', type=int, default=30, help='每页Space数量')
+    parser.add_argument('--latency', type=float, default=0.05, help='详情页模拟延迟(秒)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8, 16], help='要测试的并发数')
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_args()
+    logging.getLogger("huggingface_crawler").setLevel(logging.WARNING)
+
+    handler = make_handler(args.spaces_per_page, args.pages, args.latency)
+    server = StubServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    total = args.pages * args.spaces_per_page
+    print(f"{'concurrency':>11} | {'spaces':>6} | {'seconds':>8} | {'speedup':>7}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as output_dir:
+        for n in args.concurrency:
+            crawler = HuggingFaceCrawler(base_url=base_url, max_pages=args.pages + 1, delay=0, concurrency=n,
+                                         use_cache=False)
+            crawler.output_dir = output_dir
+            start = time.perf_counter()
+            count = crawler.crawl()
+            elapsed = time.perf_counter() - start
+            assert count == total, f"期望 {total} 个Space，实际 {count}"
+            baseline = baseline or elapsed
+            print(f"{n:>11} | {count:>6} | {elapsed:>8.3f} | {baseline / elapsed:>6.1f}x")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+基准测试 - 在10万工具的合成工具库上合并不同数量的新记录，比较重构前的逐条合并与 merge_batch 的耗时，
+检查扣除建表开销后每条记录的耗时不随批次增大而增长，并校验两者合并的标签一致
+
+重构前的做法只合并标签并原地修改；merge_batch 还要按字段策略合并、记录来源、复制被修改的工具，
+开启近似重复索引时还要为未命中URL的记录做文本相似度查找，因此耗时比值反映的是这些额外工作的开销，而不是加速比
+"""
+
+import os
+import sys
+import copy
+import time
+import random
+import argparse
+import multiprocessing
+from datetime import datetime
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(0, os.path.join(SCRIPTS_DIR, 'processors'))
+
+from tool_merge import merge_batch  # noqa: E402
+from utils import urls  # noqa: E402
+from utils.urls import normalize_url  # noqa: E402
+from utils.tool_ids import stable_tool_id  # noqa: E402
+
+TAGS = [f"tag-{i}" for i in range(500)]
+
+
+def make_tool(rng, index, max_tags):
+    """生成一条合成工具记录，约一半与已有工具的URL相同"""
+    return {
+        'id': f"tool-{index:07d}",
+        'name': f"Tool {index}",
+        'url': f"https://example{index % 997}.com/tools/{index}",
+        'description': f"Synthetic tool {index}",
+        'category': 'other',
+        'tags': rng.sample(TAGS, rng.randint(0, max_tags)),
+        'source': {'type': 'crawler'},
+    }
+
+
+def legacy_merge(existing_tools, new_tools):
+    """重构前的合并方式：列表去重合并标签，每条记录单独读取时钟，原地修改"""
+    existing_map = {}
+    for tool in existing_tools:
+        existing_map[normalize_url(tool['url'])] = tool
+        existing_map[tool['id']] = tool
+
+    for new_tool in new_tools:
+        norm_url = normalize_url(new_tool['url'])
+        if norm_url in existing_map:
+            existing_tool = existing_map[norm_url]
+            existing_tags = existing_tool.get('tags', [])
+            for tag in new_tool['tags']:
+                if tag not in existing_tags:
+                    existing_tags.append(tag)
+            existing_tool['tags'] = existing_tags
+            existing_tool['updated_date'] = datetime.now().strftime("%Y-%m-%d")
+        else:
+            new_tool.setdefault('id', stable_tool_id(new_tool['url']))
+            new_tool['added_date'] = datetime.now().strftime("%Y-%m-%d")
+            existing_tools.append(new_tool)
+            existing_map[norm_url] = new_tool
+    return existing_tools
+
+
+class InProcessPool:
+    """在当前进程中执行 map 并累计耗时，用来测量 merge_batch 交给进程池的那部分工作"""
+
+    def __init__(self):
+        self.seconds = 0.0
+
+    def map(self, func, chunks):
+        start = time.perf_counter()
+        results = [func(chunk) for chunk in chunks]
+        self.seconds += time.perf_counter() - start
+        return results
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='工具合并基准测试')
+    parser.add_argument('--tools', type=int, default=100000, help='现有工具数量')
+    parser.add_argument('--incoming', type=int, default=100000, help='新记录数量的上限，按1/4、1/2和全部测量')
+    parser.add_argument('--max-tags', type=int, default=40, help='每条记录的最大标签数')
+    parser.add_argument('--near-duplicates', action='store_true', help='同时启用近似重复索引')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='大于1时另外测量使用进程池的合并，校验结果与单进程相同，并估算多核上的加速上限')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_args()
+    rng = random.Random(args.seed)
+    existing = [make_tool(rng, i, args.max_tags) for i in range(args.tools)]
+    # 一半新记录命中已有工具（同URL），另一半为新工具
+    incoming = []
+    for i in range(args.incoming):
+        index = rng.randrange(args.tools) if i % 2 == 0 else args.tools + i
+        tool = make_tool(rng, index, args.max_tags)
+        del tool['id']
+        incoming.append(tool)
+    run_date = datetime.now().strftime("%Y-%m-%d")
+
+    # 空批次的耗时即为建立现有工具映射表（和索引）的固定开销
+    _, base_time = timed(lambda: merge_batch(existing, [], run_date, near_duplicates=args.near_duplicates))
+    print(f"现有工具: {args.tools}，近似重复索引: {'开启' if args.near_duplicates else '关闭'}，"
+          f"建立映射表: {base_time:.2f}s")
+    print(f"{'incoming':>9} | {'legacy':>8} | {'batch':>8} | {'batch/rec':>9} | {'legacy/batch':>12}")
+    for size in (args.incoming // 4, args.incoming // 2, args.incoming):
+        batch = incoming[:size]
+        legacy_input = copy.deepcopy(existing), copy.deepcopy(batch)
+        legacy_tools, legacy_time = timed(lambda: legacy_merge(*legacy_input))
+        (merged, _, _), batch_time = timed(
+            lambda: merge_batch(existing, batch, run_date, near_duplicates=args.near_duplicates)
+        )
+        if not args.near_duplicates:
+            assert [tool.get('tags') for tool in merged] == [tool.get('tags') for tool in legacy_tools], \
+                "合并后的标签与重构前不一致"
+        print(f"{size:>9} | {legacy_time:>7.2f}s | {batch_time:>7.2f}s | "
+              f"{(batch_time - base_time) / size * 1e6:>7.1f}us | {legacy_time / batch_time:>11.2f}x")
+
+    if args.workers > 1:
+        # 每次测量前清空URL解析缓存，单进程和进程池都从头解析
+        urls._parse.cache_clear()
+        with multiprocessing.Pool(args.workers) as pool:
+            parallel, parallel_time = timed(
+                lambda: merge_batch(existing, incoming, run_date, near_duplicates=args.near_duplicates, pool=pool)
+            )
+        urls._parse.cache_clear()
+        serial, serial_time = timed(
+            lambda: merge_batch(existing, incoming, run_date, near_duplicates=args.near_duplicates)
+        )
+        assert parallel == serial, "多进程合并结果与单进程不一致"
+        print(f"{args.workers} 个工作进程（CPU核数 {os.cpu_count()}）: {parallel_time:.2f}s，"
+              f"单进程: {serial_time:.2f}s，结果一致")
+
+        # 按可并行部分的占比估算多核上的加速上限（Amdahl定律，不含进程间通信），单核机器上无法直接测出
+        urls._parse.cache_clear()
+        in_process = InProcessPool()
+        merge_batch(existing, incoming, run_date, near_duplicates=args.near_duplicates, pool=in_process)
+        share = min(in_process.seconds / serial_time, 1.0)
+        print(f"可并行部分（规范化URL和近似重复特征）占单进程耗时 {share:.0%}，"
+              f"{args.workers} 核上的加速上限 {1 / ((1 - share) + share / args.workers):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+基准测试 - 在合成工具库上测量近似重复索引的建索引和查找耗时、召回率与误判数，
+并与逐一比较所有工具的做法对比查找耗时
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from utils.near_duplicates import NearDuplicateIndex, shingles  # noqa: E402
+
+
+def make_vocabulary(rng, size):
+    """生成随机词表"""
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return [''.join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(size)]
+
+
+def make_tool(rng, vocabulary, index):
+    """生成一条合成工具记录"""
+    return {
+        'id': f"tool-{index:06d}",
+        'name': ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(1, 3))),
+        'url': f"https://site{index}.example.com/app",
+        'description': ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(10, 40))),
+    }
+
+
+def make_variant(rng, vocabulary, tool):
+    """生成同一工具的另一个入口：换域名、加查询参数并轻微改写描述"""
+    words = tool['description'].split()
+    words[rng.randrange(len(words))] = rng.choice(vocabulary)
+    return {
+        'name': tool['name'].title(),
+        'url': f"https://mirror-{tool['id']}.example.org/?utm_source=reddit",
+        'description': ' '.join(words) + '.',
+    }
+
+
+def brute_force_find(index, features, tool):
+    """不使用LSH，逐一计算与所有已索引工具的相似度"""
+    name_features, description_features = shingles(tool)
+    best_key, best_score = None, 0.0
+    for key, (names, descriptions) in features.items():
+        name_union = len(name_features | names)
+        if not name_union or len(name_features & names) / name_union < index.name_threshold:
+            continue
+        score = (len(name_features & names) + len(description_features & descriptions)) / (
+            name_union + len(description_features | descriptions)
+        )
+        if score >= index.threshold and score > best_score:
+            best_key, best_score = key, score
+    return best_key
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='近似重复索引基准测试')
+    parser.add_argument('--tools', type=int, default=100000, help='已有工具数量')
+    parser.add_argument('--queries', type=int, default=2000, help='查找次数（一半为已有工具的变体，一半为新工具）')
+    parser.add_argument('--brute-force-queries', type=int, default=20, help='逐一比较方式的查找次数')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_args()
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(rng, 20000)
+    tools = [make_tool(rng, vocabulary, i) for i in range(args.tools)]
+
+    start = time.perf_counter()
+    index = NearDuplicateIndex()
+    for position, tool in enumerate(tools):
+        index.add(position, tool)
+    build_time = time.perf_counter() - start
+
+    targets = [rng.randrange(args.tools) for _ in range(args.queries // 2)]
+    variants = [make_variant(rng, vocabulary, tools[target]) for target in targets]
+    fresh = [make_tool(rng, vocabulary, args.tools + i) for i in range(args.queries - len(variants))]
+
+    start = time.perf_counter()
+    found = [index.find(variant) for variant in variants]
+    false_matches = sum(index.find(tool) is not None for tool in fresh)
+    query_time = time.perf_counter() - start
+    recall = sum(key == target for key, target in zip(found, targets)) / len(targets)
+
+    features = {
+        position: tuple(map(set, shingles(tool))) for position, tool in enumerate(tools)
+    }
+    start = time.perf_counter()
+    for variant in variants[:args.brute_force_queries]:
+        brute_force_find(index, features, variant)
+    brute_time = (time.perf_counter() - start) / args.brute_force_queries
+
+    per_query = query_time / args.queries
+    print(f"工具数量: {args.tools}，建索引耗时: {build_time:.2f}s")
+    print(f"查找 {args.queries} 次: {query_time:.2f}s（每次 {per_query * 1e3:.3f}ms），"
+          f"变体召回率: {recall:.1%}，新工具误判: {false_matches}")
+    print(f"逐一比较每次查找: {brute_time * 1e3:.1f}ms，索引加速: {brute_time / per_query:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
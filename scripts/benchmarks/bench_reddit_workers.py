@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+基准测试 - 使用注入延迟的假PRAW客户端测量RedditCrawler并发抓取的耗时
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import logging
+import argparse
+import tempfile
+from types import SimpleNamespace
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(SCRIPTS_DIR, "crawlers"))
+
+from reddit_crawler import RedditCrawler  # noqa: E402
+
+
+class FakeComments:
+    """模拟 post.comments，replace_more 时注入一次请求延迟"""
+
+    def __init__(self, latency, bodies):
+        self.latency = latency
+        self.bodies = bodies
+
+    def replace_more(self, limit=0):
+        time.sleep(self.latency)
+
+    def list(self):
+        return [SimpleNamespace(body=body) for body in self.bodies]
+
+
+class FakeSubreddit:
+    """模拟 praw Subreddit，每次列表请求注入延迟并返回合成帖子"""
+
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+
+    def _posts(self, prefix, limit):
+        time.sleep(self.client.latency)
+        now = time.time()
+        for i in range(limit):
+            post_id = f"{self.name}-{prefix}-{i}"
+            yield SimpleNamespace(
+                id=post_id,
+                title=f"I built an AI tool for image generation #{i}",
+                selftext="open source, with api",
+                url=f"https://example.com/{self.name}/{i % self.client.unique_urls}",
+                comments=FakeComments(self.client.latency, ["great tool"]),
+                score=10, num_comments=1, upvote_ratio=0.9,
+                permalink=f"/r/{self.name}/comments/{post_id}",
+                created_utc=now,
+            )
+
+    def new(self, limit):
+        return self._posts("new", limit)
+
+    def search(self, query, sort, time_filter, limit):
+        return self._posts(query.replace(" ", "_"), limit)
+
+
+class FakeReddit:
+    """模拟 praw.Reddit"""
+
+    def __init__(self, latency, unique_urls):
+        self.latency = latency
+        self.unique_urls = unique_urls
+
+    def subreddit(self, name):
+        return FakeSubreddit(self, name)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='RedditCrawler并发基准测试')
+    parser.add_argument('--subreddits', type=int, default=4, help='子版块数量')
+    parser.add_argument('--limit', type=int, default=10, help='每个子版块的帖子数量限制')
+    parser.add_argument('--latency', type=float, default=0.02, help='每次API请求的模拟延迟(秒)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help='要测试的线程数')
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_args()
+    logging.getLogger("reddit_crawler").setLevel(logging.WARNING)
+    subreddits = [f"sub{i}" for i in range(args.subreddits)]
+    unique_urls = args.limit * 2
+
+    print(f"{'workers':>7} | {'tools':>5} | {'seconds':>8} | {'speedup':>7}")
+    baseline = None
+    expected = None
+    with tempfile.TemporaryDirectory() as output_dir:
+        for workers in args.workers:
+            crawler = RedditCrawler(
+                None, None, None, subreddits, limit=args.limit, workers=workers,
+                requests_per_minute=100000, use_seen_index=False,
+                reddit_factory=lambda: FakeReddit(args.latency, unique_urls),
+            )
+            crawler.output_dir = output_dir
+            start = time.perf_counter()
+            count = crawler.crawl()
+            elapsed = time.perf_counter() - start
+
+            # 去重集合在并发下必须保持一致：每个URL只产出一个工具
+            output_file = max(glob.glob(os.path.join(output_dir, "reddit_tools_*.jsonl")), key=os.path.getmtime)
+            with open(output_file, 'r', encoding='utf-8') as f:
+                urls = sorted(json.loads(line)['url'] for line in f if line.strip())
+            assert len(urls) == count
+            assert len(urls) == len(set(urls)), "并发抓取产生了重复URL"
+            expected = expected or urls
+            assert urls == expected, "不同线程数的抓取结果不一致"
+
+            baseline = baseline or elapsed
+            print(f"{workers:>7} | {count:>5} | {elapsed:>8.3f} | {baseline / elapsed:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
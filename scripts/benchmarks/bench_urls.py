@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+基准测试 - 在一百万个合成URL上测量URL规范化的吞吐量，比较重构前每次调用 urlparse 的做法、
+从空缓存开始的第一遍和全部命中缓存的第二遍，并统计两种规则得到的不同URL数量
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from urllib.parse import urlparse
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from utils import urls  # noqa: E402
+
+HOST_PREFIXES = ['', '', '', 'www.', 'www2.', 'm.']
+QUERIES = ['', '', '', '?utm_source=reddit', '?utm_source=x&utm_medium=social', '?ref=producthunt', '?fbclid=abc']
+
+
+def legacy_normalize_url(url):
+    """重构前的 normalize_url"""
+    if not url:
+        return ""
+    parsed = urlparse(url)
+    return parsed.netloc.replace("www.", "") + parsed.path.rstrip("/")
+
+
+def make_url(index, variant):
+    """生成第 index 个工具的第 variant 种写法：通用站点、GitHub仓库、HF Space或Reddit帖子，带随机的大小写、主机前缀和跟踪参数"""
+    rng = random.Random(index * 1000 + variant)
+    kind = index % 4
+    if kind == 0:
+        host = f"{rng.choice(HOST_PREFIXES)}site{index}.example.com"
+        url = f"https://{rng.choice([host, host.upper()])}/app/"
+    elif kind == 1:
+        owner, repo = f"Owner{index}", f"Repo{index}"
+        url = f"https://github.com/{rng.choice([owner, owner.lower()])}/{rng.choice([repo, repo + '.git'])}"
+    elif kind == 2:
+        url = f"https://huggingface.co/spaces/owner{index}/space{index}"
+    else:
+        subreddit = rng.choice(['LocalLLaMA', 'MachineLearning'])
+        url = f"https://{rng.choice(['www.', 'old.', ''])}reddit.com/r/{subreddit}/comments/p{index}/title_{index}/"
+    return url + rng.choice(QUERIES)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='URL规范化基准测试')
+    parser.add_argument('--urls', type=int, default=1000000, help='URL数量')
+    parser.add_argument('--unique', type=int, default=50000, help='不同工具的数量，URL从中随机抽取')
+    parser.add_argument('--variants', type=int, default=3, help='每个工具的URL写法数量')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_args()
+    rng = random.Random(args.seed)
+    # 每个工具有几种固定的写法，模拟现有工具与多个来源的新记录在多次合并中反复出现
+    url_list = [make_url(rng.randrange(args.unique), rng.randrange(args.variants)) for _ in range(args.urls)]
+    distinct = len(set(url_list))
+
+    legacy_keys, legacy_time = timed(lambda: [legacy_normalize_url(url) for url in url_list])
+    urls._parse.cache_clear()
+    _, cold_time = timed(lambda: [urls.normalize_url(url) for url in url_list])
+    keys, warm_time = timed(lambda: [urls.normalize_url(url) for url in url_list])
+    _, alias_time = timed(lambda: [urls.canonical_key(url) for url in url_list])
+    cache = urls._parse.cache_info()
+
+    print(f"URL数量: {args.urls}，不同的URL字符串: {distinct}，工具数量: {args.unique}")
+    for label, elapsed in (('重构前（urlparse）', legacy_time), ('第一遍（空缓存）', cold_time),
+                           ('第二遍（命中缓存）', warm_time), ('canonical_key（命中缓存）', alias_time)):
+        print(f"{label:<24} {elapsed:>6.2f}s  {args.urls / elapsed / 1e6:>5.2f}M URL/s")
+    print(f"缓存: 命中 {cache.hits}，未命中 {cache.misses}，条目 {cache.currsize}/{cache.maxsize}")
+    print(f"不同的规范化URL: 重构前 {len(set(legacy_keys))}，现在 {len(set(keys))}")
+
+
+if __name__ == "__main__":
+    main()
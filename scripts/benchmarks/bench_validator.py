@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+基准测试 - 在合成工具库上测量整库校验（所有规则加ID/URL唯一性）的耗时，并检查注入的错误全部被报告
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from collections import Counter
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(0, os.path.join(SCRIPTS_DIR, 'processors'))
+
+from data_validator import validate_tools, VALID_CATEGORIES  # noqa: E402
+
+CATEGORIES = sorted(VALID_CATEGORIES)
+
+
+def make_tool(rng, index):
+    """生成一条合法的合成工具记录"""
+    tool = {
+        'id': f"tool-{index:07d}",
+        'name': f"Tool {index}",
+        'url': f"https://site{index}.example.com/app",
+        'description': f"Synthetic tool {index}",
+        'category': rng.choice(CATEGORIES),
+        'tags': ['synthetic'],
+        'experience': {'rating': rng.randint(1, 5)},
+    }
+    if index % 3 == 0:
+        tool['open_source'] = True
+        tool['github_repo'] = f"https://github.com/owner/tool-{index}"
+    return tool
+
+
+def inject_errors(rng, tools, count):
+    """随机选取工具注入错误，返回每条规则应报告的错误数"""
+    expected = Counter()
+    for position in rng.sample(range(1, len(tools)), count):
+        tool = tools[position]
+        kind = position % 4
+        if kind == 0:
+            tool['id'] = tools[position - 1]['id']
+            expected['duplicate-id'] += 1
+        elif kind == 1:
+            tool['url'] = tools[position - 1]['url'].replace('https://', 'http://www.')
+            expected['duplicate-url'] += 1
+        elif kind == 2:
+            del tool['description']
+            tool['category'] = 'unknown'
+            expected['missing-field'] += 1
+            expected['invalid-category'] += 1
+        else:
+            tool['experience']['rating'] = 9
+            expected['rating-out-of-range'] += 1
+    return expected
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='整库校验基准测试')
+    parser.add_argument('--tools', type=int, default=50000, help='工具数量')
+    parser.add_argument('--errors', type=int, default=500, help='注入错误的工具数量')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_args()
+    rng = random.Random(args.seed)
+    tools = [make_tool(rng, i) for i in range(args.tools)]
+    expected = inject_errors(rng, tools, args.errors)
+
+    start = time.perf_counter()
+    errors = validate_tools(tools)
+    elapsed = time.perf_counter() - start
+
+    # 相邻的两个被注入工具可能互相影响（如ID被复制后又被改掉），只检查不少于预期
+    reported = Counter(error['rule'] for error in errors)
+    for rule, count in expected.items():
+        assert reported[rule] >= count, f"规则 {rule} 报告 {reported[rule]} 个错误，预期至少 {count} 个"
+    print(f"工具数量: {args.tools}，校验耗时: {elapsed:.3f}s，报告错误: {len(errors)}")
+    print('，'.join(f"{rule}: {count}" for rule, count in sorted(reported.items())))
+
+
+if __name__ == "__main__":
+    main()
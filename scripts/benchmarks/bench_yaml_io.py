@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+基准测试 - 在合成的大型工具数据库上比较纯Python与LibYAML读写tools.yaml的耗时，并校验输出逐字节一致
+
+含emoji等BMP以外字符的工具由 dump_yaml 改用纯Python实现输出，因此另外测量不含这类字符的工具
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+import yaml
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from utils.yaml_io import HAS_LIBYAML, dump_yaml  # noqa: E402
+
+CATEGORIES = ['text', 'image', 'video', 'audio', 'workflow', 'robotics', 'multimodal', 'other']
+TAGS = ['open-source', 'api', 'free', 'freemium', 'gradio', 'streamlit', 'llm', 'stable-diffusion', 'docker']
+WORDS = ['AI', 'tool', 'for', 'image', 'generation', 'chat', 'with', 'your', 'documents', 'fast', 'model',
+         '生成', '图像', '视频', '工具', 'naïve', 'café', '🚀']
+
+
+def make_tool(rng, index):
+    """生成一条与爬虫输出结构一致的合成工具记录"""
+    description = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 40)))
+    tool = {
+        'id': f"tool-{index:06d}",
+        'name': f"Tool {index}: {rng.choice(WORDS)}",
+        'url': f"https://example{index % 97}.com/tools/{index}?ref=x#y",
+        'description': description + ("\n第二行说明: yes" if index % 13 == 0 else ''),
+        'category': rng.choice(CATEGORIES),
+        'tags': rng.sample(TAGS, rng.randint(0, 5)),
+        'added_date': f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        'source': {
+            'type': 'crawler',
+            'platform': rng.choice(['huggingface', 'reddit']),
+            'crawled_at': '2025-01-01 00:00:00',
+        },
+        'popularity': {'likes': rng.randint(0, 10000), 'score': rng.random()},
+        'open_source': rng.random() < 0.3,
+    }
+    if index % 7 == 0:
+        tool['github_repo'] = None
+    if index % 17 == 0:
+        # Reddit正文常见的行尾空格加长链接，以双引号输出并折行
+        tool['detailed_description'] = (
+            f"I built a tool for {description} \n\nRepo: https://github.com/someuser/"
+            f"some-really-long-repository-name-{index}/tree/main/src \n\nFeedback welcome!"
+        )
+    return tool
+
+
+ASTRAL = re.compile('[\U00010000-\U0010FFFF]')
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='tools.yaml读写基准测试')
+    parser.add_argument('--tools', type=int, default=50000, help='合成工具数量')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_args()
+    if not HAS_LIBYAML:
+        print("当前PyYAML未编译LibYAML支持，无法比较")
+        return
+
+    rng = random.Random(args.seed)
+    tools = [make_tool(rng, i) for i in range(args.tools)]
+
+    # 重构前的写法：yaml.dump 默认使用纯Python实现
+    py_text, py_dump = timed(lambda: yaml.dump(tools, allow_unicode=True, sort_keys=False, indent=2))
+    c_text, c_dump = timed(lambda: dump_yaml(tools))
+    assert py_text == c_text, "LibYAML与纯Python的输出不一致"
+
+    py_tools, py_load = timed(lambda: yaml.safe_load(py_text))
+    c_tools, c_load = timed(lambda: yaml.load(c_text, Loader=yaml.CSafeLoader))
+    assert py_tools == c_tools == tools, "加载结果不一致"
+
+    bmp_tools = [tool for tool in tools if not ASTRAL.search(repr(tool))]
+    py_bmp_text, py_bmp_dump = timed(lambda: yaml.dump(bmp_tools, allow_unicode=True, sort_keys=False, indent=2))
+    c_bmp_text, c_bmp_dump = timed(lambda: dump_yaml(bmp_tools))
+    assert py_bmp_text == c_bmp_text, "LibYAML与纯Python的输出不一致"
+
+    print(f"工具数量: {args.tools}，文件大小: {len(py_text.encode('utf-8')) / 1e6:.1f} MB，输出逐字节一致")
+    print(f"不含BMP以外字符的工具: {len(bmp_tools)} ({len(bmp_tools) / args.tools:.0%})")
+    print(f"{'':>10} | {'python':>8} | {'libyaml':>8} | {'speedup':>7}")
+    print(f"{'dump':>10} | {py_dump:>7.2f}s | {c_dump:>7.2f}s | {py_dump / c_dump:>6.1f}x")
+    print(f"{'dump(BMP)':>10} | {py_bmp_dump:>7.2f}s | {c_bmp_dump:>7.2f}s | {py_bmp_dump / c_bmp_dump:>6.1f}x")
+    print(f"{'load':>10} | {py_load:>7.2f}s | {c_load:>7.2f}s | {py_load / c_load:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,15 +6,26 @@ Hugging Face Spaces爬虫脚本 - 用于从Hugging Face Spaces抓取AI工具相
 """
 
 import os
-import json
+import sys
 import time
 import logging
 import argparse
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from utils.classifier import KeywordClassifier  # noqa: E402
+from utils.http_cache import HttpCache  # noqa: E402
+from utils.jsonl_writer import JsonlWriter  # noqa: E402
+from utils.rate_limiter import RateLimiter  # noqa: E402
+from utils.tool_shards import load_catalog  # noqa: E402
 
 # 配置日志
 logging.basicConfig(
@@ -30,7 +41,10 @@ logger = logging.getLogger(__name__)
 class HuggingFaceCrawler:
     """从Hugging Face Spaces抓取AI工具信息的爬虫类"""
     
-    def __init__(self, base_url="https://huggingface.co", max_pages=10, delay=1):
+    def __init__(self, base_url="https://huggingface.co", max_pages=10, delay=1, concurrency=1,
+                 use_cache=True, cache_max_age_days=30, cache_max_size_mb=100,
+                 incremental=False, tools_yaml_path=None, use_api=False, api_page_size=100,
+                 resume=False):
         """
         初始化Hugging Face爬虫
         
@@ -38,28 +52,179 @@ class HuggingFaceCrawler:
             base_url (str): Hugging Face基础URL
             max_pages (int): 最大抓取页数
             delay (int): 请求延迟(秒)
+            concurrency (int): 并发获取详情页的线程数，1表示顺序抓取
+            use_cache (bool): 是否对详情页使用条件请求缓存
+            cache_max_age_days (float): 缓存条目最长保留天数
+            cache_max_size_mb (float): 缓存目录总大小上限(MB)
+            incremental (bool): 增量模式，跳过tools.yaml中已存在且未更新的Space
+            tools_yaml_path (str): 主工具数据库路径（tools.yaml或分片目录），默认为data/processed/tools.yaml
+            use_api (bool): 使用JSON API获取列表，API缺少简介或SDK时才请求详情页补充
+            api_page_size (int): API每页返回的Space数量
+            resume (bool): 从最近一个未完成的输出文件的检查点继续抓取
         """
         self.base_url = base_url
         self.max_pages = max_pages
         self.delay = delay
+        self.concurrency = max(1, concurrency)
+        self.use_api = use_api
+        self.api_page_size = api_page_size
+        self.resume = resume
+        # 并发模式下所有线程共享同一限速器：每 delay 秒最多发出 concurrency 个详情请求
+        self.rate_limiter = RateLimiter(self.concurrency, self.delay)
         self.session = requests.Session()
+        if self.concurrency > 1:
+            adapter = HTTPAdapter(pool_connections=self.concurrency, pool_maxsize=self.concurrency + 1)
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
         })
         
-        self.output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
-                                      "data", "raw", "huggingface")
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data")
+        self.output_dir = os.path.join(data_dir, "raw", "huggingface")
         
         # 确保输出目录存在
         os.makedirs(self.output_dir, exist_ok=True)
+        
+        # 分类关键词表只编译一次，使用 categories.yaml 中 Hugging Face 自己的分类规则，未命中时默认为文本类别
+        self.classifier = KeywordClassifier.from_metadata(default_category='text', crawler='huggingface')
+        
+        # 详情页缓存：保存ETag/Last-Modified及解析结果，304时直接复用
+        self.http_cache = None
+        if use_cache:
+            self.http_cache = HttpCache(os.path.join(self.output_dir, ".cache"),
+                                        max_age_days=cache_max_age_days,
+                                        max_size_mb=cache_max_size_mb)
+        
+        # 增量模式：已收录Space的 id -> updated_at 索引
+        self.known_spaces = {}
+        self.skipped_count = 0
+        if incremental:
+            self.known_spaces = self._load_known_spaces(
+                tools_yaml_path or os.path.join(data_dir, "processed", "tools.yaml"))
+    
+    def _load_known_spaces(self, tools_path):
+        """
+        从主工具数据库构建已收录Space的紧凑索引
+        
+        Args:
+            tools_path (str): tools.yaml路径或按分类分片的目录
+            
+        Returns:
+            dict: Space id到updated_at的映射
+        """
+        try:
+            tools = load_catalog(tools_path)
+        except FileNotFoundError:
+            logger.warning(f"工具库不存在: {tools_path}，增量模式将抓取全部Space")
+            return {}
+        except Exception as e:
+            logger.error(f"加载工具库 {tools_path} 时出错: {str(e)}")
+            return {}
+        
+        known_spaces = {
+            tool['id']: tool.get('updated_at', "")
+            for tool in tools
+            if str(tool.get('id', "")).startswith("hf-space-")
+        }
+        logger.info(f"增量模式: 已收录 {len(known_spaces)} 个Space")
+        return known_spaces
+    
+    def _is_unchanged(self, space_data):
+        """
+        判断Space是否已收录且列表页显示的更新时间未变化
+        
+        Args:
+            space_data (dict): 从卡片提取的Space数据
+            
+        Returns:
+            bool: 是否可以跳过详情抓取
+        """
+        updated_at = space_data.get('updated_at')
+        return bool(updated_at) and self.known_spaces.get(space_data['id']) == updated_at
     
     def crawl(self):
-        """执行爬取过程"""
-        all_spaces = []
+        """
+        执行爬取过程，记录逐条写入JSONL文件，每完成一页写一次检查点
+        
+        Returns:
+            int: 输出文件中的Space数量
+        """
+        writer = JsonlWriter(self.output_dir, "huggingface_spaces", resume=self.resume)
+        
+        # 并发模式下每页的详情页在线程池中获取
+        executor = ThreadPoolExecutor(max_workers=self.concurrency) if self.concurrency > 1 else None
+        
+        # 抓取Spaces列表（API或HTML），从检查点之后的页继续
+        if self.use_api:
+            listing_pages = self._iter_api_pages(writer.state)
+        else:
+            listing_pages = self._iter_html_pages(writer.state)
+        for page_state, page_spaces in listing_pages:
+            pending = []
+            for space_data in page_spaces:
+                try:
+                    if self._is_unchanged(space_data):
+                        self.skipped_count += 1
+                        continue
+                    
+                    # API数据已足够时不再请求详情页
+                    if self.use_api and self._has_api_details(space_data):
+                        writer.write(space_data)
+                        logger.info(f"抓取到Space: {space_data['name']}")
+                        continue
+                    
+                    if executor:
+                        future = executor.submit(self._fetch_space_details_limited, space_data['url'])
+                        pending.append((space_data, future))
+                        continue
+                    
+                    # 获取详细信息
+                    space_details = self._fetch_space_details(space_data['url'])
+                    self._merge_details(space_data, space_details)
+                    
+                    writer.write(space_data)
+                    logger.info(f"抓取到Space: {space_data['name']}")
+                except Exception as e:
+                    logger.error(f"处理Space数据时出错: {str(e)}")
+            
+            # 按提交顺序收集并发结果，保证输出顺序与顺序抓取一致
+            for space_data, future in pending:
+                self._merge_details(space_data, future.result())
+                writer.write(space_data)
+                logger.info(f"抓取到Space: {space_data['name']}")
+            
+            writer.checkpoint(page_state)
+            
+            # 添加延迟，避免请求过快
+            time.sleep(self.delay)
+        
+        if executor:
+            executor.shutdown()
+        
+        if self.known_spaces:
+            logger.info(f"增量模式跳过了 {self.skipped_count} 个未更新的Space")
+        
+        if self.http_cache:
+            logger.info(f"详情页缓存命中 {self.http_cache.hits} 次")
+            self.http_cache.evict()
         
-        # 抓取Spaces列表页
-        for page in range(1, self.max_pages + 1):
+        writer.close()
+        logger.info(f"爬取完成，共抓取 {writer.count} 个Space，保存到 {writer.path}")
+        return writer.count
+    
+    def _iter_html_pages(self, resume_state):
+        """
+        逐页抓取并解析Spaces趋势列表HTML
+        
+        Args:
+            resume_state (dict): 续爬检查点，为空时从第一页开始
+            
+        Yields:
+            tuple: (该页完成后的检查点, 该页的Space数据列表)
+        """
+        for page in range(resume_state.get('page', 0) + 1, self.max_pages + 1):
             try:
                 url = f"{self.base_url}/spaces?sort=trending&p={page}"
                 logger.info(f"正在抓取页面: {url}")
@@ -79,35 +244,144 @@ class HuggingFaceCrawler:
                     break
                 
                 # 遍历卡片提取信息
+                page_spaces = []
                 for card in space_cards:
-                    try:
-                        space_data = self._extract_space_data(card)
-                        if space_data:
-                            # 获取详细信息
-                            space_details = self._fetch_space_details(space_data['url'])
-                            if space_details:
-                                space_data.update(space_details)
-                                
-                            all_spaces.append(space_data)
-                            logger.info(f"抓取到Space: {space_data['name']}")
-                    except Exception as e:
-                        logger.error(f"处理Space卡片时出错: {str(e)}")
-                
-                # 添加延迟，避免请求过快
-                time.sleep(self.delay)
+                    space_data = self._extract_space_data(card)
+                    if space_data:
+                        page_spaces.append(space_data)
                 
             except Exception as e:
                 logger.error(f"抓取页面 {page} 时出错: {str(e)}")
+                continue
+            
+            yield {"page": page}, page_spaces
+    
+    def _iter_api_pages(self, resume_state):
+        """
+        通过JSON API按游标分页抓取Spaces列表
         
-        # 保存结果
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_file = os.path.join(self.output_dir, f"huggingface_spaces_{timestamp}.json")
+        Args:
+            resume_state (dict): 续爬检查点，包含已完成的页码和下一页游标地址
+            
+        Yields:
+            tuple: (该页完成后的检查点, 该页的Space数据列表)
+        """
+        url = f"{self.base_url}/api/spaces"
+        params = {"sort": "trendingScore", "direction": -1, "limit": self.api_page_size, "full": "true"}
+        if resume_state:
+            url, params = resume_state.get('next_url'), None
+            if not url:
+                return
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(all_spaces, f, ensure_ascii=False, indent=2)
+        for page in range(resume_state.get('page', 0) + 1, self.max_pages + 1):
+            try:
+                logger.info(f"正在请求API第 {page} 页: {url}")
+                
+                response = self.session.get(url, params=params)
+                if response.status_code != 200:
+                    logger.error(f"API请求失败，状态码: {response.status_code}")
+                    break
+                
+                items = response.json()
+                if not items:
+                    logger.warning(f"API第 {page} 页没有数据，已到达末页")
+                    break
+                
+                page_spaces = []
+                for item in items:
+                    space_data = self._extract_api_space_data(item)
+                    if space_data:
+                        page_spaces.append(space_data)
+                
+            except Exception as e:
+                logger.error(f"请求API第 {page} 页时出错: {str(e)}")
+                break
+            
+            # 下一页地址由Link头中的游标给出，已包含全部查询参数
+            next_link = response.links.get('next', {}).get('url')
+            next_url = urljoin(self.base_url, next_link) if next_link else None
+            
+            yield {"page": page, "next_url": next_url}, page_spaces
+            
+            if not next_url:
+                break
+            url, params = next_url, None
+    
+    def _extract_api_space_data(self, item):
+        """
+        将API返回的Space对象映射为与HTML抓取相同的数据结构
         
-        logger.info(f"爬取完成，共抓取 {len(all_spaces)} 个Space，保存到 {output_file}")
-        return all_spaces
+        Args:
+            item (dict): API返回的Space对象
+            
+        Returns:
+            dict: Space数据字典
+        """
+        space_id = item.get('id', "")
+        if space_id.count('/') != 1:
+            return None
+        author, space_name = space_id.split('/')
+        
+        space_url = f"{self.base_url}/spaces/{space_id}"
+        card_data = item.get('cardData') or {}
+        sdk = item.get('sdk') or card_data.get('sdk')
+        
+        space_data = {
+            "id": f"hf-space-{author}-{space_name}",
+            "name": card_data.get('title') or space_name,
+            "url": space_url,
+            "description": card_data.get('short_description') or "",
+            "author": author,
+            "space_name": space_name,
+            "likes": item.get('likes', 0),
+            "tags": item.get('tags') or [],
+            "source": {
+                "type": "crawler",
+                "url": space_url,
+                "date": datetime.now().strftime("%Y-%m-%d")
+            },
+            "added_date": datetime.now().strftime("%Y-%m-%d"),
+            "sdk": sdk or "",
+            "tech_stack": [sdk] if sdk else [],
+            "created_at": item.get('createdAt', ""),
+            "updated_at": item.get('lastModified', ""),
+        }
+        if self._has_api_details(space_data):
+            space_data["category"] = self._determine_category(space_data["tags"], space_data["description"])
+        return space_data
+    
+    def _has_api_details(self, space_data):
+        """
+        判断API数据是否足以代替详情页：有简介可用于分类，有SDK作为技术栈
+        
+        详情页另外提供README全文和评论数，缺少时合并时保留已有的值。
+        
+        Args:
+            space_data (dict): 由API数据生成的Space数据
+            
+        Returns:
+            bool: 是否可以跳过详情页
+        """
+        return bool(space_data.get('description')) and bool(space_data.get('sdk'))
+    
+    def _merge_details(self, space_data, space_details):
+        """
+        将详情页数据合并到Space数据中；API模式下只补充API缺少的字段
+        
+        列表中的更新时间是增量模式判断Space是否变化的依据，与已收录的值比较，不被详情页的值替换；
+        详情页缺失的字段（空值）也不覆盖列表中已有的值。
+        
+        Args:
+            space_data (dict): Space数据
+            space_details (dict): 详情页数据
+        """
+        if not space_details:
+            return
+        for key, value in space_details.items():
+            if space_data.get(key) in (None, "", []):
+                space_data[key] = value
+            elif not self.use_api and key != 'updated_at' and value not in ("", []):
+                space_data[key] = value
     
     def _extract_space_data(self, card):
         """
@@ -152,6 +426,12 @@ class HuggingFaceCrawler:
                 if tag:
                     tags.append(tag)
             
+            # 提取更新时间（增量模式用于判断是否需要重新抓取详情）
+            updated_at = ""
+            time_element = card.select_one('time')
+            if time_element:
+                updated_at = time_element.get('datetime', "")
+            
             # 创建数据结构
             space_data = {
                 "id": f"hf-space-{author}-{space_name}",
@@ -169,6 +449,8 @@ class HuggingFaceCrawler:
                 },
                 "added_date": datetime.now().strftime("%Y-%m-%d")
             }
+            if updated_at:
+                space_data["updated_at"] = updated_at
             
             return space_data
             
@@ -186,12 +468,26 @@ class HuggingFaceCrawler:
         Returns:
             tuple: (author, space_name)
         """
-        pattern = r'https?://huggingface\.co/spaces/([^/]+)/([^/]+)'
+        host = re.escape(urlparse(self.base_url).netloc)
+        pattern = rf'https?://{host}/spaces/([^/]+)/([^/]+)'
         match = re.match(pattern, url)
         if match:
             return match.group(1), match.group(2)
         return None, None
     
+    def _fetch_space_details_limited(self, space_url):
+        """
+        经共享限速器放行后获取Space详细信息（并发模式使用）
+        
+        Args:
+            space_url (str): Space URL
+            
+        Returns:
+            dict: 详细信息字典
+        """
+        self.rate_limiter.acquire()
+        return self._fetch_space_details(space_url)
+    
     def _fetch_space_details(self, space_url):
         """
         获取Space详细信息
@@ -205,109 +501,125 @@ class HuggingFaceCrawler:
         try:
             logger.info(f"正在获取Space详情: {space_url}")
             
-            response = self.session.get(space_url)
+            headers = self.http_cache.conditional_headers(space_url) if self.http_cache else {}
+            response = self.session.get(space_url, headers=headers)
+            if response.status_code == 304 and self.http_cache:
+                cached_page = self.http_cache.revalidated(space_url)
+                if cached_page is not None and 'page_tags' in cached_page:
+                    return self._space_details(cached_page)
+                # 缓存条目已被淘汰或是不含页面标签的旧格式，重新无条件请求
+                response = self.session.get(space_url)
+            
             if response.status_code != 200:
                 logger.error(f"请求Space详情失败，状态码: {response.status_code}")
                 return {}
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 提取详细描述
-            readme_element = soup.select_one('div.space-readme article')
-            detailed_description = ""
-            if readme_element:
-                detailed_description = readme_element.text.strip()
-            
-            # 尝试确定分类
-            category = self._determine_category(soup, detailed_description)
-            
-            # 提取SDK/模型信息
-            sdk_elements = soup.select('div.space-sdk-items a.link-box')
-            sdk_info = []
-            for element in sdk_elements:
-                sdk_name = element.text.strip()
-                if sdk_name:
-                    sdk_info.append(sdk_name)
-            
-            # 获取评论数
-            comments_count = 0
-            comments_element = soup.select_one('span.discussion-tab-count')
-            if comments_element:
-                comments_text = comments_element.text.strip()
-                if comments_text.isdigit():
-                    comments_count = int(comments_text)
-            
-            # 获取创建/更新时间
-            created_at = ""
-            updated_at = ""
-            time_elements = soup.select('div.metadata time')
-            if len(time_elements) >= 2:
-                updated_at = time_elements[0].get('datetime', "")
-                created_at = time_elements[1].get('datetime', "")
-            
-            return {
-                "detailed_description": detailed_description,
-                "category": category,
-                "tech_stack": sdk_info,
-                "comments_count": comments_count,
-                "created_at": created_at,
-                "updated_at": updated_at,
-            }
+            page = self._parse_space_details(response.text)
+            if self.http_cache:
+                self.http_cache.store(space_url, response.headers, page)
+            return self._space_details(page)
             
         except Exception as e:
             logger.error(f"获取Space详情时出错: {str(e)}")
             return {}
     
-    def _determine_category(self, soup, description):
+    def _parse_space_details(self, html):
         """
-        确定Space的类别
+        解析Space详情页HTML，结果可直接缓存
+        
+        分类不在此处确定：分类关键词表可能在两次运行之间变化，
+        缓存中保存页面标签，每次使用时由 _space_details 重新分类。
         
         Args:
-            soup: BeautifulSoup对象
-            description (str): 详细描述
+            html (str): 详情页HTML
             
         Returns:
-            str: 类别
+            dict: 页面字段字典，page_tags 为页面上的标签
         """
-        # 首先查找标签
-        tags = [tag.text.strip().lower() for tag in soup.select('a.tag')]
+        soup = BeautifulSoup(html, 'html.parser')
         
-        # 将描述转为小写
-        description = description.lower()
+        # 提取详细描述
+        readme_element = soup.select_one('div.space-readme article')
+        detailed_description = ""
+        if readme_element:
+            detailed_description = readme_element.text.strip()
         
-        # 根据标签和描述判断类别
-        if any(keyword in ' '.join(tags) or keyword in description for keyword in 
-               ['image', 'img', 'vision', 'picture', 'photo', 'gan', 'diffusion']):
-            return 'image'
-            
-        elif any(keyword in ' '.join(tags) or keyword in description for keyword in 
-                ['video', 'movie', 'animation', 'motion']):
-            return 'video'
-            
-        elif any(keyword in ' '.join(tags) or keyword in description for keyword in 
-                ['audio', 'sound', 'music', 'voice', 'speech', 'whisper']):
-            return 'audio'
-            
-        elif any(keyword in ' '.join(tags) or keyword in description for keyword in 
-                ['workflow', 'pipeline', 'automation', 'langchain']):
-            return 'workflow'
-            
-        elif any(keyword in ' '.join(tags) or keyword in description for keyword in 
-                ['multimodal', 'multi-modal', 'vision-language']):
-            return 'multimodal'
+        # 提取SDK/模型信息
+        sdk_elements = soup.select('div.space-sdk-items a.link-box')
+        sdk_info = []
+        for element in sdk_elements:
+            sdk_name = element.text.strip()
+            if sdk_name:
+                sdk_info.append(sdk_name)
+        
+        # 获取评论数
+        comments_count = 0
+        comments_element = soup.select_one('span.discussion-tab-count')
+        if comments_element:
+            comments_text = comments_element.text.strip()
+            if comments_text.isdigit():
+                comments_count = int(comments_text)
+        
+        # 获取创建/更新时间
+        created_at = ""
+        updated_at = ""
+        time_elements = soup.select('div.metadata time')
+        if len(time_elements) >= 2:
+            updated_at = time_elements[0].get('datetime', "")
+            created_at = time_elements[1].get('datetime', "")
+        
+        return {
+            "detailed_description": detailed_description,
+            "page_tags": [tag.text.strip() for tag in soup.select('a.tag')],
+            "tech_stack": sdk_info,
+            "comments_count": comments_count,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+    
+    def _space_details(self, page):
+        """
+        由详情页字段（新解析的或缓存的）生成详细信息，并用当前的分类关键词表确定类别
+        
+        Args:
+            page (dict): _parse_space_details 返回的页面字段
             
-        elif any(keyword in ' '.join(tags) or keyword in description for keyword in 
-                ['robotics', 'robot', 'hardware']):
-            return 'robotics'
+        Returns:
+            dict: 详细信息字典
+        """
+        details = {key: value for key, value in page.items() if key not in ('page_tags', 'category')}
+        details['category'] = self._determine_category(page.get('page_tags') or [],
+                                                       page.get('detailed_description', ""))
+        return details
+    
+    def _determine_category(self, tags, description):
+        """
+        确定Space的类别
+        
+        Args:
+            tags (list): 详情页上的标签
+            description (str): 详细描述
             
-        # 默认为文本类别
-        return 'text'
+        Returns:
+            str: 类别
+        """
+        # 只需要分类，不扫描标签关键词
+        return self.classifier.classify_category(' '.join(tags), description)
 
 def parse_args():
     parser = argparse.ArgumentParser(description='Hugging Face Spaces爬虫')
     parser.add_argument('--base-url', default='https://huggingface.co', help='Hugging Face基础URL')
     parser.add_argument('--max-pages', type=int, default=10, help='最大抓取页数')
     parser.add_argument('--delay', type=int, default=1, help='请求延迟(秒)')
+    parser.add_argument('--concurrency', type=int, default=1, help='并发获取详情页的线程数')
+    parser.add_argument('--no-cache', action='store_true', help='禁用详情页条件请求缓存')
+    parser.add_argument('--cache-max-age', type=float, default=30, help='缓存条目最长保留天数')
+    parser.add_argument('--cache-max-size', type=float, default=100, help='缓存目录总大小上限(MB)')
+    parser.add_argument('--incremental', action='store_true', help='增量模式：跳过已收录且未更新的Space')
+    parser.add_argument('--tools-yaml', default=None, help='增量模式使用的tools.yaml路径或分片目录')
+    parser.add_argument('--use-api', action='store_true', help='使用JSON API获取Spaces列表')
+    parser.add_argument('--api-page-size', type=int, default=100, help='API每页返回的Space数量')
+    parser.add_argument('--resume', action='store_true', help='从上次中断的页继续抓取')
     return parser.parse_args()
 
 def main():
@@ -317,11 +629,20 @@ def main():
     crawler = HuggingFaceCrawler(
         base_url=args.base_url,
         max_pages=args.max_pages,
-        delay=args.delay
+        delay=args.delay,
+        concurrency=args.concurrency,
+        use_cache=not args.no_cache,
+        cache_max_age_days=args.cache_max_age,
+        cache_max_size_mb=args.cache_max_size,
+        incremental=args.incremental,
+        tools_yaml_path=args.tools_yaml,
+        use_api=args.use_api,
+        api_page_size=args.api_page_size,
+        resume=args.resume
     )
     
-    spaces = crawler.crawl()
-    logger.info(f"共抓取到 {len(spaces)} 个Space")
+    count = crawler.crawl()
+    logger.info(f"共抓取到 {count} 个Space")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
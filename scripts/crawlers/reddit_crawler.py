@@ -6,13 +6,22 @@ Reddit爬虫脚本 - 用于从Reddit抓取AI工具相关信息
 """
 
 import os
-import json
+import sys
 import time
 import logging
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import praw
-import yaml
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from utils.classifier import KeywordClassifier  # noqa: E402
+from utils.jsonl_writer import JsonlWriter  # noqa: E402
+from utils.rate_limiter import RateLimiter  # noqa: E402
+from utils.seen_index import SeenIndex  # noqa: E402
 
 # 配置日志
 logging.basicConfig(
@@ -25,10 +34,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+SEARCH_QUERIES = ["AI tool", "AI new tool", "GPT tool", "LLM tool", "machine learning app", "AI project release"]
+
 class RedditCrawler:
     """从Reddit抓取AI工具信息的爬虫类"""
     
-    def __init__(self, client_id, client_secret, user_agent, subreddits, limit=100):
+    def __init__(self, client_id, client_secret, user_agent, subreddits, limit=100, lazy_comments=False,
+                 workers=1, requests_per_minute=100, reddit_factory=None,
+                 use_seen_index=True, seen_ttl_days=14, resume=False):
         """
         初始化Reddit爬虫
         
@@ -38,79 +51,204 @@ class RedditCrawler:
             user_agent (str): User Agent字符串
             subreddits (list): 要抓取的子版块列表
             limit (int): 每个子版块抓取的帖子数量限制
+            lazy_comments (bool): 分级提取，仅当标题和正文不足以确定分类或标签时才获取评论
+            workers (int): 并发抓取单元（子版块列表或搜索关键词）的线程数
+            requests_per_minute (int): 所有线程共享的每分钟API请求配额
+            reddit_factory (callable): 创建PRAW客户端的工厂函数，默认使用给定凭据创建praw.Reddit
+            use_seen_index (bool): 是否使用跨运行的已处理帖子索引跳过之前处理过的帖子
+            seen_ttl_days (float): 索引记录保留天数
+            resume (bool): 从最近一个未完成的输出文件的检查点继续抓取
         """
-        self.reddit = praw.Reddit(
+        self._reddit_factory = reddit_factory or (lambda: praw.Reddit(
             client_id=client_id,
             client_secret=client_secret,
             user_agent=user_agent
-        )
+        ))
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.workers = max(1, workers)
+        self.resume = resume
+        self.rate_limiter = RateLimiter(requests_per_minute, 60)
         self.subreddits = subreddits
         self.limit = limit
+        self.lazy_comments = lazy_comments
+        self.comment_fetches_saved = 0
         self.output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
                                       "data", "raw", "reddit")
         
         # 确保输出目录存在
         os.makedirs(self.output_dir, exist_ok=True)
         self.crawled_urls = set() # To avoid processing duplicate URLs within a single crawl
+        # 分类关键词表只编译一次，未命中任何关键词时归为其他类别
+        self.classifier = KeywordClassifier.from_metadata(default_category='other')
+        
+        # 跨运行的已处理帖子索引，避免重叠的7天窗口重复分类和获取评论
+        self.seen_index = None
+        if use_seen_index:
+            self.seen_index = SeenIndex(os.path.join(self.output_dir, ".cache", "seen_posts.sqlite3"),
+                                        ttl_days=seen_ttl_days)
         
     def crawl(self):
-        """执行爬取过程"""
-        all_tools = []
+        """
+        执行爬取过程，记录逐条写入JSONL文件，每完成一个抓取单元写一次检查点
+        
+        Returns:
+            int: 输出文件中的工具数量
+        """
         seven_days_ago = datetime.utcnow() - timedelta(days=7)
+        writer = JsonlWriter(self.output_dir, "reddit_tools", resume=self.resume)
+        
+        # 续爬时用已写出的记录恢复URL去重集合
+        for tool_data in writer.records():
+            self.crawled_urls.add(tool_data['url'])
 
+        # 每个子版块的 'new' 列表和每个搜索关键词都是独立的抓取单元
+        units = []
         for subreddit_name in self.subreddits:
-            logger.info(f"开始抓取子版块: r/{subreddit_name}")
-            try:
-                subreddit = self.reddit.subreddit(subreddit_name)
-                
+            units.append((subreddit_name, None))
+            units.extend((subreddit_name, query) for query in SEARCH_QUERIES)
+        completed_units = writer.state.get('units', 0)
+
+        # executor.map 按单元顺序返回结果，保证输出顺序与并发度无关
+        subreddit_timings = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = executor.map(lambda unit: self._crawl_unit(*unit, seven_days_ago), units[completed_units:])
+            for index, (tools, seen_posts, elapsed) in enumerate(results, start=completed_units + 1):
+                for tool_data in tools:
+                    writer.write(tool_data)
+                writer.checkpoint({"units": index})
+                # 单元的工具写出后才登记其帖子，出错的单元下次运行会重新处理
+                if self.seen_index:
+                    for post_id, url in seen_posts:
+                        self.seen_index.add(post_id, url)
+                subreddit_name = units[index - 1][0]
+                subreddit_timings[subreddit_name] = subreddit_timings.get(subreddit_name, 0) + elapsed
+        for subreddit_name, elapsed in subreddit_timings.items():
+            logger.info(f"r/{subreddit_name} 累计用时 {elapsed:.2f} 秒")
+        
+        if self.lazy_comments:
+            logger.info(f"分级提取节省了 {self.comment_fetches_saved} 次评论请求")
+        
+        writer.close()
+        
+        # 结果落盘后再写入已处理索引，崩溃时下次运行会重新处理这些帖子
+        if self.seen_index:
+            self.seen_index.commit()
+            logger.info(f"已处理帖子索引跳过了 {self.seen_index.skipped} 个帖子")
+        
+        logger.info(f"爬取完成，共抓取 {writer.count} 个工具，保存到 {writer.path}")
+        return writer.count
+    
+    def _crawl_unit(self, subreddit_name, query, seven_days_ago):
+        """
+        抓取一个单元：子版块的最新帖子（query为None）或一个搜索关键词的结果
+        
+        Args:
+            subreddit_name (str): 子版块名称
+            query (str): 搜索关键词，None表示抓取 'new' 列表
+            seven_days_ago (datetime): 帖子时间下限
+            
+        Returns:
+            tuple: (工具数据列表, 已处理帖子的 (ID, 产出工具时的URL) 列表, 用时秒数)；出错时不返回已处理帖子
+        """
+        start_time = time.monotonic()
+        tools = []
+        seen_posts = []
+        try:
+            subreddit = self._get_reddit().subreddit(subreddit_name)
+            candidates = []
+            
+            if query is None:
                 # 获取最新帖子 (过去7天内)
                 logger.info(f"正在从 r/{subreddit_name} 获取最新帖子...")
+                self._acquire_listing(self.limit * 2)
                 for post in subreddit.new(limit=self.limit * 2): # Fetch more to filter by date
                     post_time = datetime.utcfromtimestamp(post.created_utc)
                     if post_time >= seven_days_ago:
-                        if self._is_ai_tool_post(post) and post.url not in self.crawled_urls:
-                            tool_data = self._extract_tool_data(post)
-                            if tool_data:
-                                all_tools.append(tool_data)
-                                self.crawled_urls.add(tool_data['url'])
-                                logger.info(f"从 'new' 抓取到工具: {tool_data['name']}")
+                        if self._check_seen(post):
+                            continue
+                        seen_posts.append((post.id, None))
+                        if self._is_ai_tool_post(post) and self._claim_url(post.url):
+                            candidates.append(post)
                     else:
                         # Posts are sorted by new, so we can break if older than 7 days
                         break 
-                
+                for post, tool_data in self._extract_tools(candidates):
+                    tools.append(tool_data)
+                    seen_posts.append((post.id, post.url))
+                    logger.info(f"从 'new' 抓取到工具: {tool_data['name']}")
+            else:
                 # 获取带有特定关键词的帖子 (过去7天内)
-                search_queries = ["AI tool", "AI new tool", "GPT tool", "LLM tool", "machine learning app", "AI project release"]
-                logger.info(f"正在从 r/{subreddit_name} 搜索关键词帖子 (time_filter='week')...")
-                for query in search_queries:
-                    try:
-                        for post in subreddit.search(query, sort='new', time_filter='week', limit=self.limit // 2):
-                            # Search with time_filter='week' should already limit to past week
-                            # but double check created_utc just in case of edge cases or PRAW behavior
-                            post_time = datetime.utcfromtimestamp(post.created_utc)
-                            if post_time >= seven_days_ago: # Redundant if time_filter='week' is strict, but safe
-                                if self._is_ai_tool_post(post) and post.url not in self.crawled_urls:
-                                    tool_data = self._extract_tool_data(post)
-                                    if tool_data:
-                                        all_tools.append(tool_data)
-                                        self.crawled_urls.add(tool_data['url'])
-                                        logger.info(f"通过搜索 '{query}' 找到工具: {tool_data['name']}")
-                            # else: # Not strictly necessary to break here as search limit is smaller
-                            #    pass 
-                    except Exception as e:
-                        logger.error(f"在 r/{subreddit_name} 中搜索关键词 '{query}' 时出错: {str(e)}")
-
-            except Exception as e:
+                logger.info(f"正在从 r/{subreddit_name} 搜索关键词 '{query}' (time_filter='week')...")
+                self._acquire_listing(self.limit // 2)
+                for post in subreddit.search(query, sort='new', time_filter='week', limit=self.limit // 2):
+                    # Search with time_filter='week' should already limit to past week
+                    # but double check created_utc just in case of edge cases or PRAW behavior
+                    post_time = datetime.utcfromtimestamp(post.created_utc)
+                    if post_time >= seven_days_ago: # Redundant if time_filter='week' is strict, but safe
+                        if self._check_seen(post):
+                            continue
+                        seen_posts.append((post.id, None))
+                        if self._is_ai_tool_post(post) and self._claim_url(post.url):
+                            candidates.append(post)
+                for post, tool_data in self._extract_tools(candidates):
+                    tools.append(tool_data)
+                    seen_posts.append((post.id, post.url))
+                    logger.info(f"通过搜索 '{query}' 找到工具: {tool_data['name']}")
+                    
+        except Exception as e:
+            seen_posts = []
+            if query is None:
                 logger.error(f"抓取子版块 r/{subreddit_name} 时出错: {str(e)}")
+            else:
+                logger.error(f"在 r/{subreddit_name} 中搜索关键词 '{query}' 时出错: {str(e)}")
         
-        # 保存结果
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_file = os.path.join(self.output_dir, f"reddit_tools_{timestamp}.json")
+        elapsed = time.monotonic() - start_time
+        label = "'new'" if query is None else f"搜索 '{query}'"
+        logger.info(f"r/{subreddit_name} {label} 用时 {elapsed:.2f} 秒")
+        return tools, seen_posts, elapsed
+    
+    def _get_reddit(self):
+        """获取当前线程的PRAW客户端（PRAW实例不是线程安全的）"""
+        reddit = getattr(self._local, 'reddit', None)
+        if reddit is None:
+            reddit = self._local.reddit = self._reddit_factory()
+        return reddit
+    
+    def _acquire_listing(self, limit):
+        """按列表请求的分页数（每页最多100条）从共享配额中取令牌"""
+        for _ in range(max(1, -(-limit // 100))):
+            self.rate_limiter.acquire()
+    
+    def _check_seen(self, post):
+        """
+        检查帖子是否在之前的运行中处理过
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(all_tools, f, ensure_ascii=False, indent=2)
+        Args:
+            post: Reddit帖子对象
+            
+        Returns:
+            bool: 是否应跳过该帖子
+        """
+        if self.seen_index is None:
+            return False
+        return self.seen_index.seen(post.id, post.url)
+    
+    def _claim_url(self, url):
+        """
+        线程安全地登记URL
         
-        logger.info(f"爬取完成，共抓取 {len(all_tools)} 个工具，保存到 {output_file}")
-        return all_tools
+        Args:
+            url (str): 帖子URL
+            
+        Returns:
+            bool: URL此前未被登记时返回True
+        """
+        with self._lock:
+            if url in self.crawled_urls:
+                return False
+            self.crawled_urls.add(url)
+            return True
     
     def _is_ai_tool_post(self, post):
         """
@@ -140,24 +278,72 @@ class RedditCrawler:
         
         return (has_tool_keyword and has_ai_keyword) or (has_ai_keyword and has_url)
     
-    def _extract_tool_data(self, post):
+    def _extract_tools(self, posts):
         """
-        从帖子中提取工具数据
+        批量从帖子中提取工具数据，所有帖子的分类和标签一次完成
         
         Args:
-            post: Reddit帖子对象
+            posts (list): Reddit帖子对象列表
             
         Returns:
-            dict: 工具数据字典，如果无法提取则返回None
+            list: (帖子, 工具数据字典) 列表
         """
         # 如果没有URL，则跳过
-        if not post.url or 'reddit.com' in post.url:
-            return None
+        posts = [post for post in posts if post.url and 'reddit.com' not in post.url]
+        if not posts:
+            return []
+        
+        if self.lazy_comments:
+            # 先只用标题和正文分类，分类为other或没有标签的帖子才需要评论
+            results = self.classifier.classify_many((post.title, post.selftext) for post in posts)
+            ambiguous = [i for i, (category, tags) in enumerate(results) if category == 'other' or not tags]
+            with self._lock:
+                self.comment_fetches_saved += len(posts) - len(ambiguous)
+        else:
+            results = [None] * len(posts)
+            ambiguous = list(range(len(posts)))
         
         # 获取评论
+        comments_texts = [self._fetch_comments_text(posts[i]) for i in ambiguous]
+        
+        rechecked = self.classifier.classify_many(
+            (posts[i].title, posts[i].selftext, comments_text)
+            for i, comments_text in zip(ambiguous, comments_texts)
+        )
+        for i, result in zip(ambiguous, rechecked):
+            results[i] = result
+        
+        return [
+            (post, self._extract_tool_data(post, category, tags))
+            for post, (category, tags) in zip(posts, results)
+        ]
+    
+    def _fetch_comments_text(self, post):
+        """
+        获取帖子前10条评论的文本
+        
+        Args:
+            post: Reddit帖子对象
+            
+        Returns:
+            str: 评论文本
+        """
+        self.rate_limiter.acquire()
         post.comments.replace_more(limit=0)
-        comments_text = " ".join([comment.body for comment in post.comments.list()[:10]])
+        return " ".join([comment.body for comment in post.comments.list()[:10]])
+    
+    def _extract_tool_data(self, post, category, tags):
+        """
+        从帖子中提取工具数据
         
+        Args:
+            post: Reddit帖子对象
+            category (str): 工具类别
+            tags (frozenset): 标签集合
+            
+        Returns:
+            dict: 工具数据字典
+        """
         # 提取工具名称（默认使用帖子标题）
         name = post.title
         
@@ -175,8 +361,6 @@ class RedditCrawler:
         # 提取描述
         description = post.selftext[:500] if post.selftext else post.title
         
-        # 尝试确定类别
-        category = self._determine_category(post.title, post.selftext, comments_text)
         # 获取热度指标
         score = post.score
         num_comments = post.num_comments
@@ -190,7 +374,7 @@ class RedditCrawler:
             "description": description.strip(),
             "detailed_description": post.selftext.strip() if post.selftext else "",
             "category": category,
-            "tags": self._extract_tags(post.title, post.selftext, comments_text),
+            "tags": sorted(tags),
             "source": {
                 "type": "crawler",
                 "name": "Reddit",
@@ -207,96 +391,6 @@ class RedditCrawler:
         }
         
         return tool_data
-    
-    def _determine_category(self, title, selftext, comments):
-        """
-        根据帖子信息确定工具类别
-        
-        Args:
-            title (str): 帖子标题
-            selftext (str): 帖子内容
-            comments (str): 评论内容
-            
-        Returns:
-            str: 工具类别
-        """
-        combined_text = f"{title} {selftext} {comments}".lower()
-        
-        # 根据关键词判断类别
-        if any(kw in combined_text for kw in ['image', 'photo', 'picture', 'art', 'drawing', 'painting', 'stable diffusion', 'midjourney', 'dalle', 'imaging', 'computer vision', 'cv', 'segmentation', 'object detection']):
-            return 'image'
-        elif any(kw in combined_text for kw in ['video', 'movie', 'film', 'animation', 'motion graphics', 'editing', 'streaming']):
-            return 'video'
-        elif any(kw in combined_text for kw in ['audio', 'music', 'sound', 'voice', 'speech', 'podcast', 'tts', 'asr', 'sound effect']):
-            return 'audio'
-        elif any(kw in combined_text for kw in ['workflow', 'automation', 'nocode', 'no-code', 'automate', 'pipeline', 'agent', 'multi-agent', 'langchain', 'flow']):
-            return 'workflow'
-        elif any(kw in combined_text for kw in ['robot', 'robotics', 'hardware', 'ros', 'drone', 'manipulator']):
-            return 'robotics'
-        elif any(kw in combined_text for kw in ['multimodal', 'multi-modal', 'text-to-image', 'image-to-text', 'text-to-video', 'video-to-text', 'vision-language']):
-            return 'multimodal'
-        elif any(kw in combined_text for kw in ['text', 'nlp', 'writing', 'translation', 'summarization', 'chat', 'gpt', 'llm', 'language model', 'content generation', 'copywriting']):
-            return 'text' # Explicitly check for text last as it can be broad
-        else:
-            # 默认为其他类别
-            return 'other'
-    
-    def _extract_tags(self, title, selftext, comments):
-        """
-        根据帖子信息提取标签
-        
-        Args:
-            title (str): 帖子标题
-            selftext (str): 帖子内容
-            comments (str): 评论内容
-            
-        Returns:
-            list: 标签列表
-        """
-        combined_text = f"{title} {selftext} {comments}".lower()
-        tags = []
-        
-        # 技术标签
-        tech_keywords = {
-            'gpt': ['gpt', 'openai'],
-            'stable-diffusion': ['stable diffusion', 'sd'],
-            'llama': ['llama', 'meta-llama'],
-            'bert': ['bert'],
-            'open-source': ['open source', 'open-source', 'github', 'opensource'],
-            'api-available': ['api', 'rest api', 'graphql', 'sdk'],
-            'cli': ['cli', 'command line'],
-            'gui': ['gui', 'desktop app', 'ui'],
-            'web-app': ['web app', 'online tool', 'webapp', 'browser-based'],
-            'mobile-app': ['mobile app', 'ios', 'android'],
-            'plugin': ['plugin', 'extension', 'addon'],
-            'library': ['library', 'framework', 'package'],
-            'research': ['research', 'paper', 'study', 'arxiv']
-        }
-        
-        for tag, keywords in tech_keywords.items():
-            if any(kw in combined_text for kw in keywords):
-                tags.append(tag)
-        
-        # 功能标签
-        function_keywords = {
-            'summarization': ['summary', 'summarize', 'summarization'],
-            'translation': ['translate', 'translation', 'multilingual'],
-            'generation': ['generate', 'generation', 'creator'],
-            'editing': ['edit', 'editing', 'modify'],
-            'coding': ['code', 'programming', 'developer'],
-            'analysis': ['analyze', 'analysis', 'analytics', 'data analysis', 'insights'],
-            'search': ['search', 'retrieval', 'information retrieval'],
-            'personalization': ['personalize', 'customization', 'recommendation'],
-            'productivity': ['productivity', 'efficiency', 'workflow optimization'],
-            'education': ['education', 'learning', 'teaching', 'edtech'],
-            'developer-tool': ['developer tool', 'devtool', 'coding tool', 'ide']
-        }
-        
-        for tag, keywords in function_keywords.items():
-            if any(kw in combined_text for kw in keywords):
-                tags.append(tag)
-        
-        return tags
         
 
 def parse_args():
@@ -307,6 +401,12 @@ def parse_args():
     parser.add_argument('--subreddits', nargs='+', default=['artificial', 'MachineLearning', 'OpenAI', 'StableDiffusion', 'AItools', 'LocalLLaMA', 'SingularityNET', 'GenerativeAI', 'AISafety'], 
                         help='要抓取的子版块列表')
     parser.add_argument('--limit', type=int, default=50, help='每个子版块抓取的帖子数量限制 (new listings limit will be 2x this)')
+    parser.add_argument('--workers', type=int, default=1, help='并发抓取的线程数')
+    parser.add_argument('--requests-per-minute', type=int, default=100, help='所有线程共享的每分钟API请求配额')
+    parser.add_argument('--no-seen-index', action='store_true', help='禁用跨运行的已处理帖子索引')
+    parser.add_argument('--seen-ttl-days', type=float, default=14, help='已处理帖子索引的记录保留天数')
+    parser.add_argument('--resume', action='store_true', help='从上次中断的抓取单元继续')
+    parser.add_argument('--lazy-comments', action='store_true', help='仅在标题和正文无法确定分类或标签时获取评论')
     return parser.parse_args()
 
 def main():
@@ -318,11 +418,17 @@ def main():
         client_secret=args.client_secret,
         user_agent=args.user_agent,
         subreddits=args.subreddits,
-        limit=args.limit
+        limit=args.limit,
+        lazy_comments=args.lazy_comments,
+        workers=args.workers,
+        requests_per_minute=args.requests_per_minute,
+        use_seen_index=not args.no_seen_index,
+        seen_ttl_days=args.seen_ttl_days,
+        resume=args.resume
     )
     
-    tools = crawler.crawl()
-    logger.info(f"共抓取到 {len(tools)} 个工具")
+    count = crawler.crawl()
+    logger.info(f"共抓取到 {count} 个工具")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -2,8 +2,16 @@
 # -*- coding: utf-8 -*-
 """Simple data validator for Toolverse tools.yaml files."""
 
+import os
 import re
-from urllib.parse import urlparse
+import sys
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.tool_shards import load_catalog  # noqa: E402
+from utils.urls import normalize_url  # noqa: E402
 
 REQUIRED_FIELDS = ["name", "url", "description", "category"]
 VALID_CATEGORIES = {
@@ -14,58 +22,123 @@ VALID_CATEGORIES = {
 URL_REGEX = re.compile(r"^https?://")
 
 
-def validate_tool(tool):
-    """Validate a single tool dictionary."""
-    # Rule 1: id must be unique - uniqueness should be checked externally
+def tool_errors(tool):
+    """Check every per-tool rule and return all failures as (rule, message) pairs."""
+    if not isinstance(tool, dict):
+        return [("invalid-entry", f"expected a mapping, got {type(tool).__name__}")]
+
+    errors = []
     # Rule 2: required fields must exist
     for field in REQUIRED_FIELDS:
         if not tool.get(field):
-            return False, f"missing required field: {field}"
+            errors.append(("missing-field", f"missing required field: {field}"))
 
     # Rule 3: url must be valid
-    url = tool["url"]
-    if not URL_REGEX.match(url):
-        return False, "invalid url"
+    url = tool.get("url")
+    if url and not (isinstance(url, str) and URL_REGEX.match(url)):
+        errors.append(("invalid-url", "invalid url"))
 
     # Rule 4: category must be one of predefined categories
-    if tool.get("category") not in VALID_CATEGORIES:
-        return False, f"invalid category: {tool.get('category')}"
+    category = tool.get("category")
+    if category and (not isinstance(category, str) or category not in VALID_CATEGORIES):
+        errors.append(("invalid-category", f"invalid category: {category}"))
 
     # Rule 5: if open_source true, github_repo must be provided
     if tool.get("open_source") and not tool.get("github_repo"):
-        return False, "open_source set but github_repo missing"
+        errors.append(("missing-github-repo", "open_source set but github_repo missing"))
 
     # Rule 6: rating must be between 1 and 5 if provided
     if "experience" in tool and isinstance(tool["experience"], dict):
         rating = tool["experience"].get("rating")
-        if rating is not None and not (1 <= float(rating) <= 5):
-            return False, "rating out of range"
+        if rating is not None:
+            try:
+                in_range = 1 <= float(rating) <= 5
+            except (TypeError, ValueError):
+                errors.append(("invalid-rating", f"rating is not a number: {rating!r}"))
+            else:
+                if not in_range:
+                    errors.append(("rating-out-of-range", "rating out of range"))
 
+    return errors
+
+
+def validate_tool(tool):
+    """Validate a single tool dictionary, reporting the first failing rule."""
+    errors = tool_errors(tool)
+    if errors:
+        return False, errors[0][1]
     return True, None
 
 
+def validate_tools(tools):
+    """
+    Validate a whole catalog in one pass.
+
+    Runs every per-tool rule on every tool and checks Rule 1 (id must be unique)
+    plus URL uniqueness through hash indexes keyed by id and normalized URL, so
+    the cost stays linear in the number of tools.
+
+    Returns a list of error dicts with index, id, rule and message; duplicate
+    errors also carry first_index, the position of the first tool holding the
+    same id or URL.
+    """
+    errors = []
+    id_index = {}
+    url_index = {}
+    for index, tool in enumerate(tools):
+        tool_id = tool.get("id") if isinstance(tool, dict) else None
+        for rule, message in tool_errors(tool):
+            errors.append({"index": index, "id": tool_id, "rule": rule, "message": message})
+        if not isinstance(tool, dict):
+            continue
+
+        # Rule 1: id must be unique
+        if tool_id:
+            first = id_index.setdefault(tool_id, index)
+            if first != index:
+                errors.append({"index": index, "id": tool_id, "rule": "duplicate-id",
+                               "message": f"duplicate id: {tool_id}", "first_index": first})
+
+        url = tool.get("url")
+        if url and isinstance(url, str):
+            first = url_index.setdefault(normalize_url(url), index)
+            if first != index:
+                errors.append({"index": index, "id": tool_id, "rule": "duplicate-url",
+                               "message": f"duplicate url: {url}", "first_index": first})
+
+    return errors
+
+
 def main():
     import argparse
-    import yaml
-    from pathlib import Path
 
     parser = argparse.ArgumentParser(description="Validate tools YAML file")
-    parser.add_argument("path", help="Path to tools.yaml")
+    parser.add_argument("path", help="Path to tools.yaml or a per-category shard directory")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON results")
     args = parser.parse_args()
 
-    data_path = Path(args.path)
-    tools = yaml.safe_load(data_path.read_text())
-    errors = []
-    for idx, tool in enumerate(tools):
-        valid, message = validate_tool(tool)
-        if not valid:
-            errors.append(f"Item {idx}: {message}")
+    # Validation only reads the catalog; a fresh cache is used but never written next to it
+    tools = load_catalog(args.path, write_cache=False)
+    start = time.perf_counter()
+    errors = validate_tools(tools)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        result = {
+            "valid": not errors,
+            "tools": len(tools),
+            "error_count": len(errors),
+            "elapsed_seconds": round(elapsed, 4),
+            "errors": errors,
+        }
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    elif errors:
+        print("Validation failed:\n" + "\n".join(f"Item {e['index']}: {e['message']}" for e in errors))
+    else:
+        print("All tools validated successfully.")
 
     if errors:
-        print("Validation failed:\n" + "\n".join(errors))
         exit(1)
-    else:
-        print("All tools validated successfully.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+
+"""
+原始数据读取 - 按文件名中的时间戳挑选爬虫输出文件，跳过已合并过的文件，并逐条流式读取其中的工具记录
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+RAW_EXTENSIONS = ('.json', '.jsonl')
+
+# 爬虫输出文件名形如 huggingface_spaces_20250101_120000.jsonl 或 reddit_tools_20250101_120000_1.jsonl
+FILENAME_TIMESTAMP = re.compile(r'_(\d{8}_\d{6})(?:_\d+)?\.jsonl?$')
+
+# 清单记录的保留天数，超过后对应文件早已不在处理窗口内
+MANIFEST_RETENTION_DAYS = 90
+
+
+def file_timestamp(path):
+    """
+    获取原始文件的生成时间，优先使用文件名中的时间戳，没有时才读取修改时间
+
+    Args:
+        path (str): 文件路径
+
+    Returns:
+        datetime: 文件生成时间
+    """
+    match = FILENAME_TIMESTAMP.search(os.path.basename(path))
+    if match:
+        try:
+            return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S")
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(os.path.getmtime(path))
+
+
+def select_raw_files(raw_dir, days=7, file_list=None, now=None):
+    """
+    挑选需要处理的原始文件
+
+    Args:
+        raw_dir (str): 原始数据目录
+        days (int): 只处理最近几天生成的文件
+        file_list (str): 清单文件路径，每行一个相对raw_dir的文件路径；提供时忽略days
+        now (datetime): 当前时间，默认为 datetime.now()
+
+    Returns:
+        list: 按生成时间从新到旧排列的文件路径
+    """
+    if file_list:
+        with open(file_list, 'r', encoding='utf-8') as f:
+            paths = [os.path.join(raw_dir, line.strip()) for line in f if line.strip()]
+        missing = [path for path in paths if not os.path.exists(path)]
+        for path in missing:
+            logger.warning(f"清单中的文件不存在，已跳过: {path}")
+        return [path for path in paths if path not in missing]
+
+    cutoff = (now or datetime.now()) - timedelta(days=days)
+    selected = []
+    # 跳过爬虫的 .cache 等隐藏目录
+    for root, dirs, files in os.walk(raw_dir):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for file in files:
+            if not file.endswith(RAW_EXTENSIONS):
+                continue
+            path = os.path.join(root, file)
+            # 带检查点的文件属于尚未完成的爬取，等续爬完成后再处理
+            if os.path.exists(f"{path}.progress"):
+                logger.info(f"跳过未完成的爬取输出: {path}")
+                continue
+            timestamp = file_timestamp(path)
+            if timestamp >= cutoff:
+                selected.append((timestamp, path))
+
+    selected.sort(reverse=True)
+    return [path for _, path in selected]
+
+
+def iter_file_records(path):
+    """
+    逐条读取一个原始文件中的工具记录
+
+    JSONL文件逐行解析，无法解析的行（如爬虫中断时写了一半的行）会被跳过；
+    JSON文件必须是工具列表，一次只加载这一个文件。
+
+    Args:
+        path (str): 文件路径
+
+    Yields:
+        dict: 工具记录
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"{path} 第 {line_number} 行不是有效的JSON，已跳过")
+        else:
+            tools = json.load(f)
+            if not isinstance(tools, list):
+                logger.warning(f"JSON文件 {path} 格式不正确，应为列表")
+                return
+            yield from tools
+
+
+def iter_raw_records(paths, on_complete=None):
+    """
+    依次流式读取多个原始文件中的工具记录，单个文件出错不影响其它文件
+
+    Args:
+        paths (list): 文件路径列表
+        on_complete (callable): 每个文件完整读取后以文件路径调用
+
+    Yields:
+        dict: 工具记录
+    """
+    for path in paths:
+        count = 0
+        try:
+            for record in iter_file_records(path):
+                count += 1
+                yield record
+        except Exception as e:
+            logger.error(f"读取原始文件 {path} 时出错: {str(e)}")
+            continue
+        logger.info(f"从 {path} 读取了 {count} 个工具")
+        if on_complete:
+            on_complete(path)
+
+
+def file_hash(path):
+    """
+    计算文件内容的SHA-256
+
+    Args:
+        path (str): 文件路径
+
+    Returns:
+        str: 十六进制摘要
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ProcessedManifest:
+    """
+    已合并原始文件的清单，以文件内容哈希为键
+
+    文件改名或移动后不会被重复合并，内容变化（如续爬追加了记录）后会重新合并。
+    新记录只有在调用save后才写入，合并或保存失败后重跑会重新处理同样的文件。
+    """
+
+    def __init__(self, manifest_path, reprocess=False):
+        """
+        加载清单
+
+        Args:
+            manifest_path (str): 清单JSON文件路径
+            reprocess (bool): 忽略已有记录，重新合并所有文件
+        """
+        self.manifest_path = manifest_path
+        self.entries = {}
+        self._hashes = {}
+        self._pending = {}
+
+        if os.path.exists(manifest_path) and not reprocess:
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f).get('files', {})
+            except Exception as e:
+                logger.error(f"读取已处理文件清单 {manifest_path} 时出错: {str(e)}，将重新处理所有文件")
+
+    def filter_new(self, paths):
+        """
+        过滤掉内容已合并过的文件
+
+        Args:
+            paths (list): 文件路径列表
+
+        Returns:
+            list: 尚未合并的文件路径，顺序不变
+        """
+        new_paths = []
+        for path in paths:
+            self._hashes[path] = file_hash(path)
+            if self._hashes[path] in self.entries:
+                logger.info(f"文件已合并过，跳过: {path}")
+            else:
+                new_paths.append(path)
+        return new_paths
+
+    def mark(self, path):
+        """
+        记录一个已完整读取的文件，保存前不生效
+
+        Args:
+            path (str): 文件路径
+        """
+        digest = self._hashes.get(path) or file_hash(path)
+        self._pending[digest] = {
+            "path": os.path.relpath(path, os.path.dirname(self.manifest_path)),
+            "merged_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    def save(self):
+        """写入新记录并淘汰过期记录"""
+        self.entries.update(self._pending)
+        self._pending = {}
+
+        cutoff = (datetime.now() - timedelta(days=MANIFEST_RETENTION_DAYS)).strftime("%Y-%m-%d %H:%M:%S")
+        self.entries = {
+            digest: entry for digest, entry in self.entries.items() if entry['merged_at'] >= cutoff
+        }
+
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"files": self.entries}, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+        logger.info(f"已处理文件清单已更新，共 {len(self.entries)} 条记录")
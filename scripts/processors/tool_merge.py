@@ -0,0 +1,476 @@
+# -*- coding: utf-8 -*-
+
+"""
+工具合并核心 - 不读时钟、不写日志、不修改输入的批量合并函数，供 update_yaml 和基准测试共用
+
+爬虫数据命中现有工具时按 FIELD_POLICIES 逐字段合并，被爬虫改写的字段在工具的 provenance 中
+记录来源和日期。标签等列表字段以有序集合（dict 的键）累积，合并一个工具的标签是 O(标签数)；
+运行日期由调用方传入，同一次运行中更新和添加的所有工具使用同一个日期。
+"""
+
+import gc
+import os
+import sys
+from functools import partial, wraps
+from itertools import chain, islice
+from urllib.parse import urlparse
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from utils.urls import url_keys, clean_url  # noqa: E402
+from utils.near_duplicates import NearDuplicateIndex, fingerprint  # noqa: E402
+from utils.tool_ids import stable_tool_id, unique_id  # noqa: E402
+
+# 字段合并策略，未列出的字段保持现有值:
+#     overwrite    使用新值；新旧值都是字典时按键合并
+#     max          取较大值（数值或ISO格式的时间字符串）
+#     union        按首次出现的顺序合并列表并去重
+#     keep-manual  现有值由爬虫写入时使用新值，人工填写的值保持不变
+FIELD_POLICIES = {
+    'tags': 'union',
+    'tech_stack': 'union',
+    'likes': 'max',
+    'comments_count': 'max',
+    'updated_at': 'max',
+    'popularity': 'overwrite',
+    'name': 'keep-manual',
+    'description': 'keep-manual',
+    'detailed_description': 'keep-manual',
+    'sdk': 'keep-manual',
+}
+
+POLICIES = ('overwrite', 'max', 'union', 'keep-manual')
+
+# 有效的工具类别，无效时保存为 other
+VALID_CATEGORIES = ('text', 'image', 'video', 'audio', 'workflow', 'robotics', 'multimodal', 'other')
+
+# 并行执行时每个任务处理的记录数
+CHUNK_SIZE = 2000
+
+# 每次从输入中读取的新记录数，合并的内存占用与之成正比，与输入的总记录数无关
+BATCH_SIZE = 20000
+
+# 来源记录所在的字段：{字段: {source: 来源, date: 写入日期}}
+PROVENANCE_FIELD = 'provenance'
+
+
+def merge_tags(existing_tags, new_tags):
+    """
+    按首次出现的顺序合并标签并去重
+
+    Args:
+        existing_tags (list): 现有标签
+        new_tags (list): 新标签
+
+    Returns:
+        list: 合并后的标签
+    """
+    return list(dict.fromkeys(chain(existing_tags or [], new_tags or [])))
+
+
+def _is_crawled(tool):
+    return (tool.get('source') or {}).get('type') == 'crawler'
+
+
+def _is_empty(value):
+    return value is None or value == '' or value == [] or value == {}
+
+
+def source_label(tool):
+    """
+    生成记录在 provenance 中的来源名称：来源名称、来源URL的域名或来源类型
+
+    Args:
+        tool (dict): 新工具数据
+
+    Returns:
+        str: 来源名称
+    """
+    source = tool.get('source') or {}
+    if source.get('name'):
+        return source['name']
+    if source.get('url'):
+        return urlparse(source['url']).netloc.replace("www.", "")
+    return source.get('type') or 'unknown'
+
+
+def check_policies(policies):
+    """
+    检查字段合并策略是否有效
+
+    Args:
+        policies (dict): 字段到策略名的映射
+
+    Raises:
+        ValueError: 存在无效的策略名
+    """
+    for field, policy in policies.items():
+        if policy not in POLICIES:
+            raise ValueError(f"字段 {field} 的合并策略无效: {policy}")
+
+
+class _PendingUpdate:
+    """一个现有工具在本次运行中累积的修改，工具在第一次有字段变化时才复制"""
+
+    __slots__ = ('original', 'tool', 'sets', 'changed')
+
+    def __init__(self, original):
+        self.original = original
+        self.tool = None
+        self.sets = None
+        self.changed = []
+
+    def _set(self, field, value, label, run_date):
+        if self.tool is None:
+            self.tool = dict(self.original)
+            self.tool[PROVENANCE_FIELD] = dict(self.original.get(PROVENANCE_FIELD) or {})
+        self.tool[field] = value
+        self.tool[PROVENANCE_FIELD][field] = {'source': label, 'date': run_date}
+        if field not in self.changed:
+            self.changed.append(field)
+
+    def apply(self, new_tool, run_date, policies):
+        """
+        按字段策略合并一条爬虫记录
+
+        Returns:
+            bool: 是否有字段变化
+        """
+        label = None
+        current = self.tool or self.original
+        changed = False
+
+        for field, policy in policies.items():
+            new_value = new_tool.get(field)
+            if new_value is None or new_value == '' or new_value == [] or new_value == {}:
+                continue
+
+            if policy == 'union':
+                if self.sets is None:
+                    self.sets = {}
+                items = self.sets.get(field)
+                if items is None:
+                    items = self.sets[field] = dict.fromkeys(current.get(field) or [])
+                size = len(items)
+                # 已有的键保持原位置，新元素按首次出现的顺序追加到末尾
+                items.update(dict.fromkeys(new_value))
+                if len(items) != size:
+                    label = label or source_label(new_tool)
+                    self._set(field, items, label, run_date)
+                    changed = True
+                continue
+
+            old_value = current.get(field)
+            if policy == 'max':
+                try:
+                    value = new_value if _is_empty(old_value) or new_value > old_value else old_value
+                except TypeError:
+                    value = new_value
+            elif policy == 'keep-manual':
+                # 没有来源记录的字段随工具本身录入，工具为人工录入时视为人工填写
+                if (not _is_crawled(self.original) and field not in (current.get(PROVENANCE_FIELD) or {})
+                        and not _is_empty(old_value)):
+                    continue
+                value = new_value
+            elif isinstance(old_value, dict) and isinstance(new_value, dict):
+                value = {**old_value, **new_value}
+            else:
+                value = new_value
+
+            if value != old_value:
+                label = label or source_label(new_tool)
+                self._set(field, value, label, run_date)
+                current = self.tool
+                changed = True
+        return changed
+
+    def finish(self, run_date):
+        """
+        Returns:
+            dict: 修改后的工具，没有字段变化时返回None
+        """
+        if self.tool is None:
+            return None
+        for field, items in (self.sets or {}).items():
+            if field in self.changed:
+                self.tool[field] = list(items)
+        self.tool['updated_date'] = run_date
+        return self.tool
+
+
+def update_tool(existing_tool, new_tool, run_date, policies=None):
+    """
+    按字段策略用新抓取的数据生成现有工具的更新版本
+
+    Args:
+        existing_tool (dict): 现有工具，不会被修改
+        new_tool (dict): 新工具数据
+        run_date (str): 本次运行的日期，YYYY-MM-DD
+        policies (dict): 字段合并策略，默认为 FIELD_POLICIES
+
+    Returns:
+        tuple: (更新后的工具副本, 变化的字段列表)；新数据不是爬虫来源或没有字段变化时工具为None
+    """
+    if not _is_crawled(new_tool):
+        return None, []
+    pending = _PendingUpdate(existing_tool)
+    pending.apply(new_tool, run_date, policies or FIELD_POLICIES)
+    return pending.finish(run_date), pending.changed
+
+
+def validate_tool(tool):
+    """
+    验证工具数据是否有效
+
+    Args:
+        tool (dict): 工具数据，类别无效时会被改为 other
+
+    Returns:
+        bool: 是否有效
+    """
+    # 基本验证：必须有名称、URL和描述
+    if not tool.get('name') or not tool.get('url') or not tool.get('description'):
+        return False
+
+    # URL必须是有效的
+    url = tool.get('url', '')
+    if not isinstance(url, str) or not url.startswith(('http://', 'https://')):
+        return False
+
+    # 类别必须有效
+    if tool.get('category') not in VALID_CATEGORIES:
+        # 设置默认类别
+        tool['category'] = 'other'
+
+    return True
+
+
+def prepare_new_tool(new_tool, is_id_taken, run_date):
+    """
+    为新工具去掉URL中的跟踪参数，补全ID和添加日期，并验证补全后的工具
+
+    Args:
+        new_tool (dict): 新工具数据，不会被修改
+        is_id_taken (callable): 以ID调用，返回该ID是否已被现有工具占用
+        run_date (str): 本次运行的日期，YYYY-MM-DD
+
+    Returns:
+        dict: 补全后的工具副本，工具无效时返回None（不计入添加，也不会被保存）
+    """
+    tool = dict(new_tool)
+    tool['url'] = clean_url(tool['url'])
+    if not validate_tool(tool):
+        return None
+    # 没有ID时由URL生成稳定ID；ID已被其他工具占用时追加序号，保证不与现有工具重复
+    tool['id'] = unique_id(tool.get('id') or stable_tool_id(tool['url']), is_id_taken)
+    tool.setdefault('added_date', run_date)
+    return tool
+
+
+def _url_keys(tools):
+    """计算规范化URL和URL别名（可在工作进程中执行），URL为空时为 (None, ('', None))"""
+    keys = []
+    for tool in tools:
+        norm_url, alias = url_keys(tool.get('url'))
+        keys.append((norm_url or None, (alias, None)))
+    return keys
+
+
+def _fingerprints(tools):
+    """计算包含文本特征的近似重复特征（可在工作进程中执行）"""
+    return [fingerprint(tool) for tool in tools]
+
+
+def _existing_keys(tools, near_duplicates):
+    """计算现有工具的规范化URL和近似重复特征（可在工作进程中执行）"""
+    keys = _url_keys(tools)
+    if near_duplicates:
+        keys = [(norm_url, features) for (norm_url, _), features in zip(keys, _fingerprints(tools))]
+    return keys
+
+
+def near_match(tool, record, score):
+    """
+    生成变化摘要中一条通过近似重复索引匹配的记录
+
+    Args:
+        tool (dict): 命中的工具
+        record (dict): 新记录
+        score (float): 文本相似度，按URL别名匹配时为None
+
+    Returns:
+        dict: {id, name, url, rule, score}，见 merge_batch
+    """
+    match = {'id': tool.get('id'), 'name': record.get('name'), 'url': record.get('url'),
+             'rule': 'alias' if score is None else 'text'}
+    if score is not None:
+        match['score'] = round(score, 3)
+    return match
+
+
+def _map_chunks(pool, func, items):
+    """在进程池中按块执行 func 并按原顺序拼接结果，没有进程池时在当前进程中执行"""
+    if pool is None:
+        return func(items)
+    chunks = [items[start:start + CHUNK_SIZE] for start in range(0, len(items), CHUNK_SIZE)]
+    return [result for chunk_result in pool.map(func, chunks) for result in chunk_result]
+
+
+def _slim(pool, tools):
+    """
+    传给工作进程时只保留计算规范化URL和近似重复特征所需的字段，减少序列化的数据量；
+    在当前进程中执行时直接使用原工具，不复制
+    """
+    if pool is None:
+        return tools
+    return [{'url': tool.get('url'), 'name': tool.get('name'), 'description': tool.get('description')}
+            for tool in tools]
+
+
+def _gc_paused(func):
+    """
+    执行期间暂停循环垃圾回收：合并时创建大量不含循环引用的字典和列表，分代回收会反复遍历
+    全部现有工具，占合并耗时的三分之一左右；引用计数照常释放对象，结束后恢复原来的状态
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if enabled:
+                gc.enable()
+    return wrapper
+
+
+@_gc_paused
+def merge_batch(existing_tools, new_tools, run_date, near_duplicates=False, policies=None, pool=None):
+    """
+    将一批新工具合并到现有工具中
+
+    按规范化URL、ID和近似重复索引（URL别名，开启 near_duplicates 时还有文本相似度）查找现有工具：找到时按字段策略合并（只接受爬虫来源的数据），
+    有字段变化时设置更新日期；找不到时验证后作为新工具追加到末尾，无效的新工具计入跳过。同一工具被多条记录命中时按记录的输入顺序
+    依次合并，列表字段在有序集合中累积。输入的列表和工具都不会被修改，未变化的工具在结果中与输入是同一个对象。
+
+    合并分为两步：计算规范化URL和近似重复特征；按输入顺序确定每条记录命中的工具并应用字段策略，
+    或作为新工具添加。只有第一步可以并行：每条记录的结果只依赖记录本身，传入进程池时分块执行并按原顺序拼接，
+    工作进程只收到URL、名称和描述，只返回规范化URL和特征。第二步在当前进程中顺序执行：ID查找、
+    近似重复匹配和新工具ID的去重都依赖此前添加的工具，按URL哈希拆分会改变结果；应用字段策略每条记录
+    只需几次字典操作，交给工作进程时序列化工具的开销比合并本身还大。因此进程池只在多核机器上、
+    规范化URL和文本特征占主要耗时时（如开启 near_duplicates 的大批量回填）才有收益，结果与不使用进程池时完全相同。
+    新记录按 BATCH_SIZE 条一批从迭代器中读取，每批依次执行两步，命中工具的修改跨批累积，
+    结果与整批处理相同，内存占用不随输入的记录数增长。
+
+    Args:
+        existing_tools (list): 现有工具列表
+        new_tools (iterable): 新工具列表或迭代器
+        run_date (str): 本次运行的日期，YYYY-MM-DD
+        near_duplicates (bool): 是否按名称和描述的文本相似度查找近似重复；URL别名总是参与匹配
+        policies (dict): 字段合并策略，默认为 FIELD_POLICIES
+        pool (multiprocessing.pool.Pool): 计算规范化URL和近似重复特征的进程池，为None时在当前进程中执行
+
+    Returns:
+        tuple: (合并后的工具列表, 统计, 变化摘要)
+            统计按新记录计数，包含 added、updated、unchanged、skipped 和 near_duplicates；
+            变化摘要为 {added: [新工具ID], updated: {工具ID: [变化的字段]}, near_duplicates: [匹配记录]}，
+            每条通过近似重复索引匹配的记录为 {id: 命中的工具ID, name, url: 记录的名称和URL,
+            rule: alias 或 text, score: 文本相似度（rule 为 text 时）}
+    """
+    policies = policies or FIELD_POLICIES
+    check_policies(policies)
+    merged = list(existing_tools)
+
+    # 第一步（现有工具部分）：规范化URL和近似重复特征
+    existing_keys = _map_chunks(pool, partial(_existing_keys, near_duplicates=near_duplicates), _slim(pool, merged))
+
+    # URL和ID分开建表，值为工具在结果中的位置，一个键只对应一个工具（重复时取最后一个，与SQLite后端一致）
+    url_map = {}
+    id_map = {}
+    index = NearDuplicateIndex(text=near_duplicates)
+    for position, (tool, (norm_url, features)) in enumerate(zip(merged, existing_keys)):
+        index.add(position, tool, features)
+        if norm_url:
+            url_map[norm_url] = position
+        tool_id = tool.get('id')
+        if tool_id:
+            id_map[tool_id] = position
+    del existing_keys
+
+    stats = {'added': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0, 'near_duplicates': 0}
+    added_ids = []
+    near_matches = []
+    # 命中的工具位置 -> 跨批累积的修改，按第一次命中的顺序排列
+    updates = {}
+    is_id_taken = id_map.__contains__
+
+    # 记录确定命中的工具后即可丢弃，按批读取输入，不把整个迭代器读入内存
+    new_tools = iter(new_tools)
+    while True:
+        records = list(islice(new_tools, BATCH_SIZE))
+        if not records:
+            break
+
+        # 第一步（本批记录部分）：规范化URL和URL别名；只有URL未命中已有工具的记录才需要文本特征
+        record_keys = _map_chunks(pool, _url_keys, _slim(pool, records))
+        if near_duplicates:
+            missed = [
+                seq for seq, (norm_url, _) in enumerate(record_keys)
+                if norm_url is not None and norm_url not in url_map
+            ]
+            features = _map_chunks(pool, _fingerprints, _slim(pool, [records[seq] for seq in missed]))
+            for seq, record_features in zip(missed, features):
+                record_keys[seq] = (record_keys[seq][0], record_features)
+
+        # 第二步：按输入顺序确定每条记录命中的工具并应用字段策略，或作为新工具添加；
+        # 工具第一次被命中时才创建修改，同一工具的修改按记录的输入顺序跨批累积
+        for new_tool, (norm_url, features) in zip(records, record_keys):
+            if norm_url is None:
+                stats['skipped'] += 1
+                continue
+
+            position = url_map.get(norm_url)
+            if position is None:
+                position = id_map.get(new_tool.get('id'))
+                if position is None:
+                    position, score = index.match(new_tool, features)
+                    if position is not None:
+                        stats['near_duplicates'] += 1
+                        near_matches.append(near_match(merged[position], new_tool, score))
+
+            if position is not None:
+                if not _is_crawled(new_tool):
+                    stats['skipped'] += 1
+                    continue
+                update = updates.get(position)
+                if update is None:
+                    update = updates[position] = _PendingUpdate(merged[position])
+                if update.apply(new_tool, run_date, policies):
+                    stats['updated'] += 1
+                else:
+                    stats['unchanged'] += 1
+            else:
+                tool = prepare_new_tool(new_tool, is_id_taken, run_date)
+                if tool is None:
+                    stats['skipped'] += 1
+                    continue
+                position = len(merged)
+                index.add(position, tool, features)
+                merged.append(tool)
+                url_map[norm_url] = position
+                id_map[tool['id']] = position
+                added_ids.append(tool['id'])
+                stats['added'] += 1
+
+    added = set(added_ids)
+    updated = {}
+    # 按第一次命中的顺序汇总，与分批方式无关
+    for position, update in updates.items():
+        tool = update.finish(run_date)
+        if tool is not None:
+            merged[position] = tool
+            if tool.get('id') not in added:
+                updated[tool.get('id')] = update.changed
+
+    return merged, stats, {'added': added_ids, 'updated': updated, 'near_duplicates': near_matches}
@@ -0,0 +1,370 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+工具库归档 - 以内容寻址的方式保存 tools.yaml 的历史快照，支持保留策略和快照还原
+
+归档目录结构:
+    snapshots/<快照ID>.json.gz  快照清单，记录每个文件由哪些内容块按顺序拼接而成，以及每个内容块所在的包
+    packs/<快照ID>.json.gz      该快照新增的内容块（块哈希 -> 文本）
+
+YAML文件按顶层列表元素切分为内容块（每个工具一块），未变化的工具在各快照之间共享同一个块，
+每次归档只新增变化过的工具。还原时按清单拼接内容块，得到与归档时逐字节一致的文件。
+"""
+
+import os
+import re
+import sys
+import glob
+import gzip
+import json
+import hashlib
+import logging
+import argparse
+from datetime import datetime
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from utils.yaml_io import write_text_atomic  # noqa: E402
+from utils.tool_shards import is_sharded, shard_files  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# 顶层列表中每个元素的起始行
+_TOP_LEVEL_ITEM = re.compile(r'(?m)^(?=-(?: |$))')
+
+# 旧版归档生成的完整副本，如 tools_20250101_120000.yaml 或分片目录 tools_20250101_120000/
+_LEGACY_NAME = re.compile(r'^tools_(\d{8}_\d{6})(?:\.yaml)?$')
+
+
+def split_chunks(text):
+    """
+    将YAML文本按顶层列表元素切分为内容块，拼接所有块即得到原文
+
+    Args:
+        text (str): YAML文本
+
+    Returns:
+        list: 内容块列表
+    """
+    return [chunk for chunk in _TOP_LEVEL_ITEM.split(text) if chunk]
+
+
+def chunk_hash(chunk):
+    """
+    计算内容块的哈希（SHA-256前128位）
+
+    Args:
+        chunk (str): 内容块
+
+    Returns:
+        str: 十六进制哈希
+    """
+    return hashlib.sha256(chunk.encode('utf-8')).hexdigest()[:32]
+
+
+def _read_json_gz(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json_gz(path, data):
+    tmp_path = f"{path}.tmp"
+    # mtime=0 使相同内容产生相同的压缩文件
+    with open(tmp_path, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+        f.write(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    os.replace(tmp_path, path)
+
+
+class ToolArchive:
+    """内容寻址的工具库快照归档"""
+
+    def __init__(self, archive_dir):
+        """
+        打开归档目录
+
+        Args:
+            archive_dir (str): 归档目录
+        """
+        self.archive_dir = archive_dir
+        self.snapshot_dir = os.path.join(archive_dir, "snapshots")
+        self.pack_dir = os.path.join(archive_dir, "packs")
+
+    def snapshots(self):
+        """
+        列出所有快照ID，从旧到新
+
+        Returns:
+            list: 快照ID列表
+        """
+        paths = glob.glob(os.path.join(self.snapshot_dir, "*.json.gz"))
+        return sorted(os.path.basename(path)[:-len(".json.gz")] for path in paths)
+
+    def manifest(self, snapshot_id):
+        """
+        读取快照清单
+
+        Args:
+            snapshot_id (str): 快照ID
+
+        Returns:
+            dict: 清单，包含 created_at、layout、files（文件名 -> 内容块哈希列表）
+                和 packs（包ID -> 其中被本快照引用的内容块哈希列表，旧版清单没有）
+        """
+        return _read_json_gz(os.path.join(self.snapshot_dir, f"{snapshot_id}.json.gz"))
+
+    def _pack_path(self, pack_id):
+        return os.path.join(self.pack_dir, f"{pack_id}.json.gz")
+
+    def _referenced(self, snapshot_ids=None):
+        """
+        返回指定快照（默认全部）引用的内容块及其所在的包
+
+        Returns:
+            dict: 内容块哈希 -> 包ID；旧版清单没有包索引，其中的内容块为None
+        """
+        referenced = {}
+        for snapshot_id in (self.snapshots() if snapshot_ids is None else snapshot_ids):
+            manifest = self.manifest(snapshot_id)
+            if 'packs' not in manifest:
+                for hashes in manifest['files'].values():
+                    for digest in hashes:
+                        referenced.setdefault(digest, None)
+                continue
+            for pack_id, digests in manifest['packs'].items():
+                for digest in digests:
+                    referenced[digest] = pack_id
+        return referenced
+
+    def _locate(self, digests):
+        """扫描所有包，查找内容块所在的包（用于没有包索引的旧版清单）"""
+        digests = set(digests)
+        located = {}
+        for pack_path in sorted(glob.glob(os.path.join(self.pack_dir, "*.json.gz"))):
+            pack_id = os.path.basename(pack_path)[:-len(".json.gz")]
+            for digest in digests.intersection(_read_json_gz(pack_path)):
+                located[digest] = pack_id
+        return located
+
+    def add(self, tools_path, snapshot_id=None):
+        """
+        归档工具库的当前内容，与最近一个快照完全相同时不新建快照
+
+        Args:
+            tools_path (str): YAML文件路径或分片目录
+            snapshot_id (str): 快照ID，默认为当前时间
+
+        Returns:
+            str: 新快照的ID，未新建时返回None
+        """
+        if is_sharded(tools_path):
+            layout = "sharded"
+            paths = dict((os.path.basename(path), path) for _, path in shard_files(tools_path))
+        else:
+            layout = "file"
+            paths = {os.path.basename(tools_path): tools_path}
+
+        files = {}
+        blobs = {}
+        for name, path in paths.items():
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                chunks = split_chunks(f.read())
+            files[name] = [chunk_hash(chunk) for chunk in chunks]
+            blobs.update(zip(files[name], chunks))
+
+        existing = self.snapshots()
+        if existing:
+            latest = self.manifest(existing[-1])
+            if latest['layout'] == layout and latest['files'] == files:
+                logger.info(f"工具库与最近的快照 {existing[-1]} 相同，不新建快照")
+                return None
+
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        os.makedirs(self.pack_dir, exist_ok=True)
+        snapshot_id = snapshot_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        base_id, suffix = snapshot_id, 1
+        while snapshot_id in existing:
+            snapshot_id = f"{base_id}_{suffix}"
+            suffix += 1
+
+        known = self._referenced(existing)
+        new_blobs = {digest: chunk for digest, chunk in blobs.items() if digest not in known}
+        unindexed = [digest for digest in blobs if digest in known and known[digest] is None]
+        if unindexed:
+            known.update(self._locate(unindexed))
+            # 旧版清单引用但所有包中都找不到的内容块重新保存
+            new_blobs.update((digest, blobs[digest]) for digest in unindexed if known[digest] is None)
+
+        # 清单中记录每个内容块所在的包，还原时只读取用到的包
+        packs = {}
+        for digest in blobs:
+            packs.setdefault(snapshot_id if digest in new_blobs else known[digest], []).append(digest)
+        if new_blobs:
+            _write_json_gz(self._pack_path(snapshot_id), new_blobs)
+        _write_json_gz(os.path.join(self.snapshot_dir, f"{snapshot_id}.json.gz"), {
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "layout": layout,
+            "files": files,
+            "packs": packs,
+        })
+        logger.info(f"已创建快照 {snapshot_id}: {len(blobs)} 个内容块，其中新增 {len(new_blobs)} 个")
+        return snapshot_id
+
+    def restore(self, snapshot_id, output_path):
+        """
+        按快照重建工具库
+
+        Args:
+            snapshot_id (str): 快照ID
+            output_path (str): 输出的YAML文件路径（单文件快照）或目录（分片快照）
+        """
+        manifest = self.manifest(snapshot_id)
+        needed = {digest for hashes in manifest['files'].values() for digest in hashes}
+        if 'packs' in manifest:
+            packs = manifest['packs']
+        else:
+            packs = {}
+            for digest, pack_id in self._locate(needed).items():
+                packs.setdefault(pack_id, []).append(digest)
+
+        blobs = {}
+        for pack_id, digests in packs.items():
+            pack_path = self._pack_path(pack_id)
+            if not os.path.exists(pack_path):
+                continue
+            pack = _read_json_gz(pack_path)
+            blobs.update((digest, pack[digest]) for digest in digests if digest in pack)
+        missing = needed - blobs.keys()
+        if missing:
+            raise ValueError(f"快照 {snapshot_id} 缺少 {len(missing)} 个内容块，归档已损坏")
+
+        for name, hashes in manifest['files'].items():
+            if manifest['layout'] == "sharded":
+                os.makedirs(output_path, exist_ok=True)
+                path = os.path.join(output_path, name)
+            else:
+                path = output_path
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            write_text_atomic(path, ''.join(blobs[digest] for digest in hashes))
+        logger.info(f"已将快照 {snapshot_id} 还原到 {output_path}")
+
+    def prune(self, keep_last=30, keep_monthly=12):
+        """
+        按保留策略删除旧快照，并清理不再被引用的内容块
+
+        保留最新的 keep_last 个快照，以及最近 keep_monthly 个月中每月的最后一个快照。
+
+        Args:
+            keep_last (int): 保留的最新快照数量
+            keep_monthly (int): 按月保留的月数
+
+        Returns:
+            int: 删除的快照数量
+        """
+        snapshot_ids = self.snapshots()
+        keep = set(snapshot_ids[-keep_last:]) if keep_last > 0 else set()
+        # 快照ID以 YYYYMM 开头，同一个月中后面的快照覆盖前面的
+        monthly = {}
+        for snapshot_id in snapshot_ids:
+            monthly[snapshot_id[:6]] = snapshot_id
+        if keep_monthly > 0:
+            keep.update(snapshot_id for _, snapshot_id in sorted(monthly.items())[-keep_monthly:])
+
+        removed = [snapshot_id for snapshot_id in snapshot_ids if snapshot_id not in keep]
+        if not removed:
+            return 0
+        for snapshot_id in removed:
+            os.remove(os.path.join(self.snapshot_dir, f"{snapshot_id}.json.gz"))
+
+        # 重写包含失效内容块的包，整个包都失效时直接删除
+        referenced = self._referenced()
+        dropped = 0
+        for pack_path in glob.glob(os.path.join(self.pack_dir, "*.json.gz")):
+            pack = _read_json_gz(pack_path)
+            live = {digest: chunk for digest, chunk in pack.items() if digest in referenced}
+            if len(live) == len(pack):
+                continue
+            dropped += len(pack) - len(live)
+            if live:
+                _write_json_gz(pack_path, live)
+            else:
+                os.remove(pack_path)
+
+        logger.info(f"保留策略删除了 {len(removed)} 个快照和 {dropped} 个不再引用的内容块")
+        return len(removed)
+
+    def import_legacy(self):
+        """
+        将旧版归档的完整副本（tools_<时间戳>.yaml 或分片目录）导入为快照并删除原副本
+
+        Returns:
+            int: 导入的副本数量
+        """
+        legacy = []
+        for name in os.listdir(self.archive_dir):
+            match = _LEGACY_NAME.match(name)
+            if match:
+                legacy.append((match.group(1), os.path.join(self.archive_dir, name)))
+
+        for timestamp, path in sorted(legacy):
+            self.add(path.rstrip(os.sep) if os.path.isdir(path) else path, snapshot_id=timestamp)
+            if os.path.isdir(path):
+                for _, shard_path in shard_files(path):
+                    os.remove(shard_path)
+                os.rmdir(path)
+            else:
+                os.remove(path)
+        logger.info(f"已导入 {len(legacy)} 个旧版归档副本")
+        return len(legacy)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='工具库快照归档')
+    parser.add_argument('--archive-dir', default='../../data/processed/tools_archive', help='归档目录')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('list', help='列出所有快照')
+
+    restore_parser = subparsers.add_parser('restore', help='还原快照')
+    restore_parser.add_argument('snapshot', help='快照ID，latest 表示最新快照')
+    restore_parser.add_argument('output', help='输出的YAML文件路径或分片目录')
+
+    prune_parser = subparsers.add_parser('prune', help='按保留策略删除旧快照')
+    prune_parser.add_argument('--keep-last', type=int, default=30, help='保留的最新快照数量')
+    prune_parser.add_argument('--keep-monthly', type=int, default=12, help='按月保留的月数')
+
+    subparsers.add_parser('import-legacy', help='将旧版完整副本导入为快照')
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler("tools_archive.log"),
+            logging.StreamHandler()
+        ]
+    )
+    args = parse_args()
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    archive = ToolArchive(os.path.abspath(os.path.join(script_dir, args.archive_dir)))
+
+    if args.command == 'list':
+        for snapshot_id in archive.snapshots():
+            manifest = archive.manifest(snapshot_id)
+            chunks = sum(len(hashes) for hashes in manifest['files'].values())
+            print(f"{snapshot_id}  {manifest['created_at']}  {manifest['layout']:>7}  {chunks} 个内容块")
+    elif args.command == 'restore':
+        snapshot_id = archive.snapshots()[-1] if args.snapshot == 'latest' else args.snapshot
+        archive.restore(snapshot_id, os.path.abspath(args.output))
+    elif args.command == 'prune':
+        archive.prune(args.keep_last, args.keep_monthly)
+    elif args.command == 'import-legacy':
+        archive.import_legacy()
+
+
+if __name__ == "__main__":
+    main()
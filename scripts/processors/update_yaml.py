@@ -8,12 +8,24 @@
 import os
 import sys
 import json
-import yaml
-import glob
 import logging
 import argparse
+import multiprocessing
 from datetime import datetime
-from urllib.parse import urlparse
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from raw_ingest import select_raw_files, iter_raw_records, ProcessedManifest  # noqa: E402
+from tools_archive import ToolArchive  # noqa: E402
+from tool_merge import merge_batch, update_tool, prepare_new_tool, validate_tool, near_match  # noqa: E402
+from utils.yaml_io import dump_yaml, write_text_atomic  # noqa: E402
+from utils.tools_cache import load_tools, write_sidecar  # noqa: E402
+from utils.tool_store import ToolStore  # noqa: E402
+from utils.tool_shards import is_sharded, shard_files, load_shards, save_shards  # noqa: E402
+from utils.urls import normalize_url  # noqa: E402
+from utils.near_duplicates import NearDuplicateIndex  # noqa: E402
+from utils.tool_ids import migrate_legacy_ids, save_remap  # noqa: E402
 
 
 # 配置日志
@@ -28,42 +40,27 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def normalize_url(url):
-    """
-    规范化URL，移除协议、www和尾部斜杠，用于URL去重
-    
-    Args:
-        url (str): 原始URL
-        
-    Returns:
-        str: 规范化后的URL
-    """
-    if not url:
-        return ""
-    
-    parsed = urlparse(url)
-    domain = parsed.netloc.replace("www.", "")
-    path = parsed.path.rstrip("/")
-    
-    return f"{domain}{path}"
-
-
-def load_tools_yaml(yaml_path):
+def load_tools_yaml(yaml_path, categories=None):
     """
     加载主工具数据库YAML文件
     
     Args:
-        yaml_path (str): YAML文件路径
+        yaml_path (str): YAML文件路径，或按分类分片的目录
+        categories (iterable): 分片目录时只读取这些分类，为None时读取全部；
+            保存时需把同一组分类传给 save_tools_yaml 的 loaded_categories
         
     Returns:
         list: 工具数据列表
     """
     try:
-        if os.path.exists(yaml_path):
-            with open(yaml_path, 'r', encoding='utf-8') as f:
-                tools = yaml.safe_load(f) or []
-                logger.info(f"从 {yaml_path} 加载了 {len(tools)} 个工具")
-                return tools
+        if is_sharded(yaml_path):
+            tools = load_shards(yaml_path, categories)
+            logger.info(f"从分片目录 {yaml_path} 加载了 {len(tools)} 个工具")
+            return tools
+        elif os.path.exists(yaml_path):
+            tools = load_tools(yaml_path) or []
+            logger.info(f"从 {yaml_path} 加载了 {len(tools)} 个工具")
+            return tools
         else:
             logger.warning(f"YAML文件不存在: {yaml_path}，将创建新文件")
             return []
@@ -72,159 +69,177 @@ def load_tools_yaml(yaml_path):
         return []
 
 
-def load_raw_json_files(raw_dir, days=7):
+def load_raw_json_files(raw_dir, days=7, file_list=None, manifest=None):
     """
     加载原始爬虫数据文件
     
+    按文件名中的时间戳挑选最近几天的文件，记录在合并时逐条读取，不会一次性全部载入内存。
+    
     Args:
         raw_dir (str): 原始数据目录
         days (int): 只处理最近几天的文件
+        file_list (str): 指定要处理的文件清单，提供时忽略days
+        manifest (ProcessedManifest): 已处理文件清单，提供时跳过已合并过的文件，并记录本次读取完成的文件
         
     Returns:
-        list: 工具数据列表
+        iterator: 工具数据迭代器
     """
-    all_tools = []
-    
-    # 递归查找所有JSON文件
-    json_files = []
-    for root, _, files in os.walk(raw_dir):
-        for file in files:
-            if file.endswith('.json'):
-                json_files.append(os.path.join(root, file))
-    
-    # 按修改时间排序，只处理最新的文件
-    json_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-    
-    # 读取并合并数据
-    for json_file in json_files[:days * 5]:  # 假设每天最多5个爬虫文件
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                tools = json.load(f)
-                if isinstance(tools, list):
-                    logger.info(f"从 {json_file} 加载了 {len(tools)} 个工具")
-                    all_tools.extend(tools)
-                else:
-                    logger.warning(f"JSON文件 {json_file} 格式不正确，应为列表")
-        except Exception as e:
-            logger.error(f"读取JSON文件 {json_file} 时出错: {str(e)}")
-    
-    return all_tools
+    raw_files = select_raw_files(raw_dir, days, file_list)
+    if manifest:
+        raw_files = manifest.filter_new(raw_files)
+    logger.info(f"共选中 {len(raw_files)} 个原始数据文件")
+    return iter_raw_records(raw_files, on_complete=manifest.mark if manifest else None)
 
 
-def merge_tools(existing_tools, new_tools):
+def merge_tools(existing_tools, new_tools, near_duplicates=False, run_date=None, workers=1):
     """
     合并新旧工具数据，处理重复和冲突
     
+    规范化URL和ID都没有命中时，再通过近似重复索引查找URL别名相同的工具；开启 near_duplicates 时
+    还查找名称、描述高度相似的工具。每条通过近似重复索引合并的记录都写入变化摘要。
+    
     Args:
         existing_tools (list): 现有工具列表
-        new_tools (list): 新工具列表
+        new_tools (iterable): 新工具列表或迭代器
+        near_duplicates (bool): 是否按名称和描述的文本相似度查找近似重复，URL别名总是参与匹配
+        run_date (str): 本次运行的日期，默认为今天
+        workers (int): 工作进程数，大于1时并行计算规范化URL和近似重复特征，结果与单进程相同；
+            超过CPU核数时按核数计
         
     Returns:
-        list: 合并后的工具列表
+        tuple: (合并后的工具列表, 变化摘要)，变化摘要见 tool_merge.merge_batch
     """
-    # 创建映射表，用于快速查找现有工具
-    existing_map = {}
-    for tool in existing_tools:
-        if 'url' in tool and tool['url']:
-            norm_url = normalize_url(tool['url'])
-            existing_map[norm_url] = tool
-        
-        # 也用ID作为键
-        if 'id' in tool and tool['id']:
-            existing_map[tool['id']] = tool
+    run_date = run_date or datetime.now().strftime("%Y-%m-%d")
+    cpu_count = os.cpu_count() or 1
+    if workers > cpu_count:
+        # 进程数超过核数时只增加进程间通信的开销，单核时直接在当前进程中合并
+        logger.warning(f"工作进程数 {workers} 超过CPU核数 {cpu_count}，按 {cpu_count} 个进程合并")
+        workers = cpu_count
+    if workers > 1:
+        logger.info(f"使用 {workers} 个工作进程合并")
+        with multiprocessing.Pool(workers) as pool:
+            merged_tools, stats, changes = merge_batch(
+                existing_tools, new_tools, run_date, near_duplicates, pool=pool
+            )
+    else:
+        merged_tools, stats, changes = merge_batch(existing_tools, new_tools, run_date, near_duplicates)
+    
+    logger.info(
+        f"合并结果: 添加 {stats['added']} 个新工具, 更新 {stats['updated']} 个现有工具, "
+        f"无变化 {stats['unchanged']} 个, 跳过 {stats['skipped']} 个工具"
+    )
+    if stats['near_duplicates']:
+        logger.info(f"其中 {stats['near_duplicates']} 个工具通过近似重复索引匹配到现有工具")
+        log_text_matches(changes['near_duplicates'])
+    
+    return merged_tools, changes
+
+
+def merge_tools_into_store(store, new_tools, near_duplicates=False, run_date=None):
+    """
+    将新工具合并到SQLite工具库，规则与 merge_tools 相同，但通过索引查找和逐条写入完成
+    
+    新工具在写入前先经过验证（见 tool_merge.prepare_new_tool），使数据库与导出的YAML保持一致。
     
-    # 计数器
+    Args:
+        store (ToolStore): 工具库
+        new_tools (iterable): 新工具列表或迭代器
+        near_duplicates (bool): 是否按名称和描述的文本相似度查找近似重复，URL别名总是参与匹配
+        run_date (str): 本次运行的日期，默认为今天
+        
+    Returns:
+        dict: 变化摘要，格式与 merge_tools 相同
+    """
+    run_date = run_date or datetime.now().strftime("%Y-%m-%d")
     added_count = 0
     updated_count = 0
+    unchanged_count = 0
     skipped_count = 0
+    near_duplicate_count = 0
+    changes = {'added': [], 'updated': {}, 'near_duplicates': []}
+    added_ids = set()
+    
+    index = NearDuplicateIndex(text=near_duplicates)
+    for position, tool in enumerate(store.all_tools()):
+        index.add(position, tool)
     
-    # 处理新工具
     for new_tool in new_tools:
         if not new_tool.get('url'):
             skipped_count += 1
             continue
         
         norm_url = normalize_url(new_tool['url'])
-        
-        # 检查是否已存在相同URL的工具
-        if norm_url in existing_map:
-            # 更新现有工具
-            existing_tool = existing_map[norm_url]
-            
-            # 只更新来源为爬虫的工具数据
-            if new_tool.get('source', {}).get('type') == 'crawler':
-                # 合并标签
-                if 'tags' in new_tool and new_tool['tags']:
-                    existing_tags = existing_tool.get('tags', [])
-                    for tag in new_tool['tags']:
-                        if tag not in existing_tags:
-                            existing_tags.append(tag)
-                    existing_tool['tags'] = existing_tags
-                
-                # 更新更新日期
-                existing_tool['updated_date'] = datetime.now().strftime("%Y-%m-%d")
-                
-                updated_count += 1
-            else:
+        position, existing_tool = store.find(norm_url=norm_url, tool_id=new_tool.get('id'))
+        if existing_tool is None:
+            position, score = index.match(new_tool)
+            if position is not None:
+                existing_tool = store.get(position)
+                near_duplicate_count += 1
+                changes['near_duplicates'].append(near_match(existing_tool, new_tool, score))
+        if existing_tool is not None:
+            if new_tool.get('source', {}).get('type') != 'crawler':
                 skipped_count += 1
+                continue
+            updated_tool, changed_fields = update_tool(existing_tool, new_tool, run_date)
+            if updated_tool is None:
+                unchanged_count += 1
+                continue
+            store.update(position, updated_tool)
+            updated_count += 1
+            if updated_tool['id'] not in added_ids:
+                fields = changes['updated'].setdefault(updated_tool['id'], [])
+                fields.extend(field for field in changed_fields if field not in fields)
         else:
-            # 添加新工具
-            if 'id' not in new_tool or not new_tool['id']:
-                # 生成ID
-                domain = urlparse(new_tool['url']).netloc.replace("www.", "")
-                new_tool['id'] = f"{domain.split('.')[0]}-{datetime.now().strftime('%Y%m%d')}"
-            
-            # 确保有添加日期
-            if 'added_date' not in new_tool:
-                new_tool['added_date'] = datetime.now().strftime("%Y-%m-%d")
-            
-            # 添加到现有列表和映射
-            existing_tools.append(new_tool)
-            existing_map[norm_url] = new_tool
-            existing_map[new_tool['id']] = new_tool
-            
+            prepared_tool = prepare_new_tool(
+                new_tool, lambda tool_id: store.find(tool_id=tool_id)[1] is not None, run_date
+            )
+            if prepared_tool is None:
+                logger.warning(f"工具数据无效，已跳过: {new_tool.get('name', 'unknown')}")
+                skipped_count += 1
+                continue
+            new_tool = prepared_tool
+            position = store.append(new_tool)
+            index.add(position, new_tool)
+            changes['added'].append(new_tool['id'])
+            added_ids.add(new_tool['id'])
             added_count += 1
     
-    logger.info(f"合并结果: 添加 {added_count} 个新工具, 更新 {updated_count} 个现有工具, 跳过 {skipped_count} 个工具")
-    
-    return existing_tools
+    store.commit()
+    logger.info(
+        f"合并结果: 添加 {added_count} 个新工具, 更新 {updated_count} 个现有工具, "
+        f"无变化 {unchanged_count} 个, 跳过 {skipped_count} 个工具"
+    )
+    if near_duplicate_count:
+        logger.info(f"其中 {near_duplicate_count} 个工具通过近似重复索引匹配到现有工具")
+        log_text_matches(changes['near_duplicates'])
+    return changes
 
 
-def validate_tool(tool):
+def log_text_matches(matches):
     """
-    验证工具数据是否有效
+    逐条记录按文本相似度合并的记录，这类匹配可能误把不同的工具合并
     
     Args:
-        tool (dict): 工具数据
-        
-    Returns:
-        bool: 是否有效
+        matches (list): 变化摘要中的 near_duplicates
     """
-    # 基本验证：必须有名称、URL和描述
-    if not tool.get('name') or not tool.get('url') or not tool.get('description'):
-        return False
-    
-    # URL必须是有效的
-    url = tool.get('url', '')
-    if not url.startswith(('http://', 'https://')):
-        return False
-    
-    # 类别必须有效
-    valid_categories = ['text', 'image', 'video', 'audio', 'workflow', 'robotics', 'multimodal', 'other']
-    if tool.get('category') not in valid_categories:
-        # 设置默认类别
-        tool['category'] = 'other'
-    
-    return True
+    for match in matches:
+        if match['rule'] == 'text':
+            logger.info(
+                f"按文本相似度 {match['score']} 合并: {match['name']} ({match['url']}) -> {match['id']}"
+            )
 
 
-def save_tools_yaml(tools, yaml_path):
+def save_tools_yaml(tools, yaml_path, loaded_categories=None):
     """
     保存工具数据到YAML文件
     
     Args:
         tools (list): 工具数据列表
-        yaml_path (str): YAML文件路径
+        yaml_path (str): YAML文件路径，或按分类分片的目录（只重写内容变化的分片）
+        loaded_categories (iterable): 工具只读取了这些分类的分片时，只重写或删除这些分片，见 save_shards
+        
+    Returns:
+        bool: 是否保存成功
     """
     # 验证数据
     validated_tools = []
@@ -239,48 +254,90 @@ def save_tools_yaml(tools, yaml_path):
     
     # 保存数据
     try:
-        with open(yaml_path, 'w', encoding='utf-8') as f:
-            yaml.dump(validated_tools, f, allow_unicode=True, sort_keys=False, indent=2)
+        if is_sharded(yaml_path):
+            save_shards(validated_tools, yaml_path, loaded_categories)
+            logger.info(f"已将 {len(validated_tools)} 个工具保存到分片目录 {yaml_path}")
+            return True
+        # 先写临时文件再原子替换，内容未变化时不写入，避免产生无意义的提交
+        if not write_text_atomic(yaml_path, dump_yaml(validated_tools)):
+            logger.info(f"工具数据未变化，跳过写入 {yaml_path}")
+            return True
+        # 下游脚本直接读取缓存，不必再解析刚写出的YAML
+        write_sidecar(yaml_path, validated_tools)
         logger.info(f"已将 {len(validated_tools)} 个工具保存到 {yaml_path}")
+        return True
     except Exception as e:
         logger.error(f"保存YAML文件 {yaml_path} 时出错: {str(e)}")
+        return False
 
 
-def archive_yaml(yaml_path, archive_dir):
+def archive_yaml(yaml_path, archive_dir, keep_last=30, keep_monthly=12):
     """
-    归档YAML文件
+    归档YAML文件为内容寻址快照，并按保留策略清理旧快照
     
     Args:
-        yaml_path (str): YAML文件路径
+        yaml_path (str): YAML文件路径，或按分类分片的目录
         archive_dir (str): 归档目录
+        keep_last (int): 保留的最新快照数量
+        keep_monthly (int): 按月保留的月数
     """
     if not os.path.exists(yaml_path):
         logger.warning(f"YAML文件不存在，无法归档: {yaml_path}")
         return
     
-    os.makedirs(archive_dir, exist_ok=True)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    archive_path = os.path.join(
-        archive_dir, 
-        f"tools_{timestamp}.yaml"
-    )
-    
     try:
-        with open(yaml_path, 'r', encoding='utf-8') as f_in:
-            with open(archive_path, 'w', encoding='utf-8') as f_out:
-                f_out.write(f_in.read())
-        logger.info(f"已将YAML文件归档到 {archive_path}")
+        archive = ToolArchive(archive_dir)
+        archive.add(yaml_path)
+        archive.prune(keep_last, keep_monthly)
     except Exception as e:
         logger.error(f"归档YAML文件时出错: {str(e)}")
 
 
+def save_change_summary(summary_path, run_date, changes):
+    """
+    保存本次合并的变化摘要，供下游步骤只处理变化的工具
+    
+    Args:
+        summary_path (str): 摘要文件路径
+        run_date (str): 本次运行的日期
+        changes (dict): merge_tools 返回的变化摘要
+    """
+    summary = {
+        'run_date': run_date,
+        'added': changes['added'],
+        'updated': changes['updated'],
+        'near_duplicates': changes.get('near_duplicates', []),
+    }
+    try:
+        write_text_atomic(summary_path, json.dumps(summary, ensure_ascii=False, indent=2) + '\n')
+        logger.info(
+            f"变化摘要已保存到 {summary_path}: 新增 {len(changes['added'])} 个, 更新 {len(changes['updated'])} 个, "
+            f"近似重复合并 {len(summary['near_duplicates'])} 个"
+        )
+    except OSError as e:
+        logger.error(f"保存变化摘要 {summary_path} 时出错: {str(e)}")
+
+
 def parse_args():
     parser = argparse.ArgumentParser(description='更新工具数据库')
     parser.add_argument('--raw-dir', default='../../data/raw', help='原始数据目录')
     parser.add_argument('--yaml-path', default='../../data/processed/tools.yaml', help='YAML文件路径')
+    parser.add_argument('--shard-dir', help='按分类分片的工具库目录，设置后代替 --yaml-path 作为工具库；目录为空时从 --yaml-path 迁移')
     parser.add_argument('--archive-dir', default='../../data/processed/tools_archive', help='归档目录')
+    parser.add_argument('--archive-keep', type=int, default=30, help='保留的最新快照数量')
+    parser.add_argument('--archive-keep-monthly', type=int, default=12, help='按月保留快照的月数')
+    parser.add_argument('--store', choices=['yaml', 'sqlite'], default='yaml', help='合并使用的存储后端')
+    parser.add_argument('--db-path', default='../../data/processed/tools.db', help='SQLite工具库路径（--store sqlite）')
+    parser.add_argument('--near-duplicates', action='store_true',
+                        help='同时按名称和描述的文本相似度查找近似重复（默认只按规范化URL、ID和URL别名去重）')
+    parser.add_argument('--migrate-ids', action='store_true', help='合并前将旧版 <域名首段>-<日期> 格式的ID迁移为稳定ID')
+    parser.add_argument('--id-remap-path', default='../../data/processed/id_remap.json', help='ID迁移映射表路径')
+    parser.add_argument('--changes-path', default='../../data/processed/last_changes.json', help='本次合并的变化摘要路径')
+    parser.add_argument('--workers', type=int, default=1, help='计算规范化URL和近似重复特征的工作进程数，不超过CPU核数（仅 --store yaml）')
     parser.add_argument('--days', type=int, default=7, help='处理最近几天的文件')
+    parser.add_argument('--manifest-path', default='../../data/processed/raw_manifest.json', help='已处理原始文件清单路径')
+    parser.add_argument('--reprocess', action='store_true', help='忽略已处理文件清单，重新合并窗口内的所有文件')
+    parser.add_argument('--file-list', help='要处理的原始文件清单（每行一个相对原始数据目录的路径）')
     return parser.parse_args()
 
 
@@ -295,25 +352,69 @@ def main():
     raw_dir = os.path.abspath(os.path.join(script_dir, args.raw_dir))
     yaml_path = os.path.abspath(os.path.join(script_dir, args.yaml_path))
     archive_dir = os.path.abspath(os.path.join(script_dir, args.archive_dir))
+    manifest_path = os.path.abspath(os.path.join(script_dir, args.manifest_path))
+    db_path = os.path.abspath(os.path.join(script_dir, args.db_path))
+    id_remap_path = os.path.abspath(os.path.join(script_dir, args.id_remap_path))
+    changes_path = os.path.abspath(os.path.join(script_dir, args.changes_path))
+    run_date = datetime.now().strftime("%Y-%m-%d")
+    
+    # 使用分片目录时，目录中还没有分片则从单个YAML文件迁移
+    tools_path = os.path.abspath(os.path.join(script_dir, args.shard_dir)) if args.shard_dir else yaml_path
+    source_path = tools_path
+    if args.shard_dir and not shard_files(tools_path) and os.path.exists(yaml_path):
+        logger.info(f"分片目录为空，将从 {yaml_path} 迁移")
+        source_path = yaml_path
     
     logger.info(f"原始数据目录: {raw_dir}")
-    logger.info(f"YAML文件路径: {yaml_path}")
+    logger.info(f"工具库路径: {tools_path}")
     logger.info(f"归档目录: {archive_dir}")
     
-    # 归档现有YAML文件
-    archive_yaml(yaml_path, archive_dir)
-    
-    # 加载现有工具数据
-    existing_tools = load_tools_yaml(yaml_path)
+    # 归档现有工具库
+    archive_yaml(source_path, archive_dir, args.archive_keep, args.archive_keep_monthly)
     
     # 加载新工具数据
-    new_tools = load_raw_json_files(raw_dir, args.days)
-    
-    # 合并数据
-    merged_tools = merge_tools(existing_tools, new_tools)
-    
-    # 保存结果
-    save_tools_yaml(merged_tools, yaml_path)
+    file_list = os.path.abspath(args.file_list) if args.file_list else None
+    manifest = ProcessedManifest(manifest_path, reprocess=args.reprocess)
+    new_tools = load_raw_json_files(raw_dir, args.days, file_list, manifest)
+    remap = []
+    
+    if args.store == 'sqlite':
+        # 在SQLite工具库中合并，再导出为YAML
+        store = ToolStore(db_path)
+        store.sync_from_yaml(source_path, load_tools_yaml)
+        if args.migrate_ids:
+            tools = store.all_tools()
+            old_ids = [tool.get('id') for tool in tools]
+            remap = migrate_legacy_ids(tools)
+            for position, (tool, old_id) in enumerate(zip(tools, old_ids)):
+                if tool.get('id') != old_id:
+                    store.update(position, tool)
+        if args.workers > 1:
+            logger.warning("SQLite后端逐条写入数据库，忽略 --workers")
+        changes = merge_tools_into_store(
+            store, new_tools, near_duplicates=args.near_duplicates, run_date=run_date
+        )
+        saved = store.export_yaml(tools_path, save_tools_yaml)
+        store.close()
+    else:
+        # 加载现有工具数据并合并
+        existing_tools = load_tools_yaml(source_path)
+        if args.migrate_ids:
+            remap = migrate_legacy_ids(existing_tools)
+        merged_tools, changes = merge_tools(
+            existing_tools, new_tools, near_duplicates=args.near_duplicates, run_date=run_date,
+            workers=args.workers
+        )
+        saved = save_tools_yaml(merged_tools, tools_path)
+    
+    # 保存成功后才记录已合并的文件，失败重跑时会重新处理
+    if saved:
+        manifest.save()
+        save_change_summary(changes_path, run_date, changes)
+        if args.migrate_ids:
+            logger.info(f"ID迁移: {len(remap)} 个旧版ID已替换为稳定ID")
+            if remap:
+                save_remap(id_remap_path, remap)
     
     logger.info("更新完成")
 
@@ -7,11 +7,18 @@
 
 import os
 import re
-import yaml
+import sys
 import logging
 import argparse
 from datetime import datetime, timedelta
 
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from utils.tools_cache import load_tools  # noqa: E402
+from utils.tool_store import ToolStore  # noqa: E402
+from utils.tool_shards import is_sharded, load_shards  # noqa: E402
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -28,17 +35,20 @@ def load_tools_yaml(yaml_path):
     加载工具数据YAML文件
     
     Args:
-        yaml_path (str): YAML文件路径
+        yaml_path (str): YAML文件路径，或按分类分片的目录
         
     Returns:
         list: 工具数据列表
     """
     try:
-        if os.path.exists(yaml_path):
-            with open(yaml_path, 'r', encoding='utf-8') as f:
-                tools = yaml.safe_load(f) or []
-                logger.info(f"从 {yaml_path} 加载了 {len(tools)} 个工具")
-                return tools
+        if is_sharded(yaml_path):
+            tools = load_shards(yaml_path)
+            logger.info(f"从分片目录 {yaml_path} 加载了 {len(tools)} 个工具")
+            return tools
+        elif os.path.exists(yaml_path):
+            tools = load_tools(yaml_path) or []
+            logger.info(f"从 {yaml_path} 加载了 {len(tools)} 个工具")
+            return tools
         else:
             logger.warning(f"YAML文件不存在: {yaml_path}")
             return []
@@ -164,8 +174,10 @@ def update_readme(readme_path, tools_table):
 
 def parse_args():
     parser = argparse.ArgumentParser(description='更新README中的工具表格')
-    parser.add_argument('--yaml-path', default='../../data/processed/tools.yaml', help='YAML文件路径')
+    parser.add_argument('--yaml-path', default='../../data/processed/tools.yaml', help='YAML文件路径或分片目录')
     parser.add_argument('--readme-path', default='../../README.md', help='README文件路径')
+    parser.add_argument('--store', choices=['yaml', 'sqlite'], default='yaml', help='读取工具数据的存储后端')
+    parser.add_argument('--db-path', default='../../data/processed/tools.db', help='SQLite工具库路径（--store sqlite）')
     parser.add_argument('--days', type=int, default=30, help='显示最近几天添加的工具')
     parser.add_argument('--limit', type=int, default=10, help='最多显示多少个工具')
     return parser.parse_args()
@@ -184,11 +196,17 @@ def main():
     logger.info(f"YAML文件路径: {yaml_path}")
     logger.info(f"README文件路径: {readme_path}")
     
-    # 加载工具数据
-    tools = load_tools_yaml(yaml_path)
-    
     # 获取最新工具
-    latest_tools = get_latest_tools(tools, args.days, args.limit)
+    if args.store == 'sqlite':
+        # 通过 added_date 索引查询，不必加载全部工具
+        store = ToolStore(os.path.abspath(os.path.join(script_dir, args.db_path)))
+        store.sync_from_yaml(yaml_path, load_tools_yaml)
+        date_threshold = (datetime.now() - timedelta(days=args.days)).strftime("%Y-%m-%d")
+        latest_tools = store.latest(date_threshold, args.limit)
+        store.close()
+    else:
+        tools = load_tools_yaml(yaml_path)
+        latest_tools = get_latest_tools(tools, args.days, args.limit)
     logger.info(f"找到 {len(latest_tools)} 个最新添加的工具")
     
     # 生成表格
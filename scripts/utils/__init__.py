@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+
+"""
+爬虫、处理与更新脚本共用的工具模块，各脚本将 scripts 目录加入导入路径后以 utils.xxx 导入
+"""
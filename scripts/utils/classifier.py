@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+"""
+关键词分类器 - 将分类关键词和标签别名编译为单个正则，一次扫描得到分类和标签；只需要分类时按优先级逐个查找分类关键词
+"""
+
+import os
+import re
+from bisect import bisect_right
+
+import yaml
+
+METADATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "metadata"
+)
+
+
+def _build_trie_pattern(keywords):
+    """
+    将关键词列表编译为前缀树形式的正则，匹配同一位置上最长的关键词
+
+    Args:
+        keywords (iterable): 关键词列表
+
+    Returns:
+        str: 正则表达式
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def to_regex(node):
+        branches = [re.escape(char) + to_regex(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            return '(?:' + body + ')?'
+        return body
+
+    return to_regex(trie)
+
+
+_WORD_BOUNDARY = re.compile(r'\b')
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+class KeywordClassifier:
+    """一次扫描同时确定分类和标签的关键词分类器"""
+
+    def __init__(self, category_keywords, tag_keywords=None, default_category='other'):
+        """
+        编译关键词表
+
+        Args:
+            category_keywords (dict): 分类到关键词列表的有序映射，顺序即优先级
+            tag_keywords (dict): 标签到关键词列表的映射
+            default_category (str): 没有命中任何分类关键词时的默认分类
+        """
+        self.categories = list(category_keywords)
+        self.default_category = default_category
+
+        # 关键词 -> (命中分类的最高优先级, 命中的标签)
+        no_rank = len(self.categories)
+        keyword_hits = {}
+        for rank, keywords in enumerate(category_keywords.values()):
+            for keyword in keywords:
+                best_rank, tags = keyword_hits.get(keyword.lower(), (no_rank, ()))
+                keyword_hits[keyword.lower()] = (min(best_rank, rank), tags)
+        for tag, keywords in (tag_keywords or {}).items():
+            for keyword in keywords:
+                best_rank, tags = keyword_hits.get(keyword.lower(), (no_rank, ()))
+                keyword_hits[keyword.lower()] = (best_rank, tags + (tag,))
+
+        # 正则在每个词首只返回最长的关键词，它的所有前缀关键词也在同一位置命中
+        self._hits = {}
+        for keyword in keyword_hits:
+            self._hits[keyword] = [
+                (len(prefix), rank, tags)
+                for prefix, (rank, tags) in keyword_hits.items()
+                if keyword.startswith(prefix)
+            ]
+        self._pattern = re.compile(r'\b(?=(' + _build_trie_pattern(keyword_hits) + '))')
+
+        # 只需要分类时按优先级逐个分类查找关键词，命中即停，不必扫描标签关键词
+        self._category_keywords = [
+            (category, list(dict.fromkeys(keyword.lower() for keyword in keywords)))
+            for category, keywords in category_keywords.items() if keywords
+        ]
+
+    @classmethod
+    def from_metadata(cls, metadata_dir=METADATA_DIR, default_category='other', crawler=None):
+        """
+        从 categories.yaml 和 tags.yaml 构建分类器
+
+        Args:
+            metadata_dir (str): 元数据目录
+            default_category (str): 默认分类
+            crawler (str): 爬虫名称，categories.yaml 的 crawler_rules 中有该爬虫时使用其中的优先级和关键词
+
+        Returns:
+            KeywordClassifier: 分类器
+        """
+        with open(os.path.join(metadata_dir, "categories.yaml"), 'r', encoding='utf-8') as f:
+            category_meta = yaml.safe_load(f)
+        with open(os.path.join(metadata_dir, "tags.yaml"), 'r', encoding='utf-8') as f:
+            tag_meta = yaml.safe_load(f)
+
+        categories = category_meta['categories']
+        rules = (category_meta.get('crawler_rules') or {}).get(crawler) or {}
+        keywords = rules.get('keywords') or {name: categories[name].get('keywords') or [] for name in categories}
+        category_keywords = {
+            name: keywords.get(name) or []
+            for name in rules.get('category_priority') or category_meta.get('category_priority', categories)
+        }
+
+        tag_keywords = {}
+        for group in tag_meta['tags'].values():
+            for tag in group.get('tags', []):
+                keywords = [tag['name']] + (tag.get('aliases') or [])
+                # 连字符写法同时匹配空格写法，如 open-source / open source
+                keywords += [keyword.replace('-', ' ') for keyword in keywords if '-' in keyword]
+                tag_keywords[tag['name']] = keywords
+
+        return cls(category_keywords, tag_keywords, default_category)
+
+    def classify(self, *texts):
+        """
+        一次扫描文本，返回分类和标签
+
+        分类关键词只要求出现在词首；标签关键词必须是完整的词。
+
+        Args:
+            *texts (str): 待分类文本（如标题、描述、评论）
+
+        Returns:
+            tuple: (分类, 标签集合)
+        """
+        return self.classify_many([texts])[0]
+
+    def classify_category(self, *texts):
+        """
+        只确定分类，结果与 classify 返回的分类相同
+
+        按优先级依次查找各分类的关键词，第一个在词首命中的分类即为结果，不扫描标签关键词，
+        高优先级的分类命中后不再查找其余分类。
+
+        Args:
+            *texts (str): 待分类文本（如标签、描述）
+
+        Returns:
+            str: 分类
+        """
+        text = '\n'.join(t for t in texts if t).lower()
+        for category, keywords in self._category_keywords:
+            for keyword in keywords:
+                # 子串查找比正则逐位置尝试快得多，找到后再确认位于词首（与 classify 使用相同的 \b 规则）
+                start = text.find(keyword)
+                while start != -1:
+                    if _WORD_BOUNDARY.match(text, start):
+                        return category
+                    start = text.find(keyword, start + 1)
+        return self.default_category
+
+    def classify_many(self, documents):
+        """
+        批量分类：将所有文档拼接后只做一次正则扫描
+
+        Args:
+            documents (iterable): 每个元素是一个文档的文本元组（如 (标题, 正文, 评论)）
+
+        Returns:
+            list: 与输入顺序一致的 (分类, frozenset标签) 列表
+        """
+        # 文档之间用 \0 分隔，它不属于任何关键词且构成词边界
+        parts = ['\n'.join(t for t in texts if t).lower() for texts in documents]
+        text = '\0'.join(parts)
+        text_length = len(text)
+
+        offsets = []
+        position = 0
+        for part in parts:
+            offsets.append(position)
+            position += len(part) + 1
+
+        no_rank = len(self.categories)
+        best_ranks = [no_rank] * len(parts)
+        doc_tags = [set() for _ in parts]
+
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            doc = bisect_right(offsets, start) - 1
+            tags = doc_tags[doc]
+            for length, rank, tag_names in self._hits[match.group(1)]:
+                if rank < best_ranks[doc]:
+                    best_ranks[doc] = rank
+                if tag_names:
+                    end = start + length
+                    if end == text_length or not _is_word_char(text[end]):
+                        tags.update(tag_names)
+
+        return [
+            (self.categories[rank] if rank < no_rank else self.default_category, frozenset(tags))
+            for rank, tags in zip(best_ranks, doc_tags)
+        ]
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+"""
+基于ETag/Last-Modified的磁盘HTTP缓存，用于条件请求并复用已解析的结果
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class HttpCache:
+    """按URL保存校验头和解析结果的磁盘缓存"""
+
+    def __init__(self, cache_dir, max_age_days=30, max_size_mb=100):
+        """
+        初始化HTTP缓存
+
+        Args:
+            cache_dir (str): 缓存目录
+            max_age_days (float): 条目最长保留天数，超过后被淘汰
+            max_size_mb (float): 缓存目录总大小上限(MB)，超过后淘汰最久未使用的条目
+        """
+        self.cache_dir = cache_dir
+        self.max_age = max_age_days * 86400
+        self.max_size = max_size_mb * 1024 * 1024
+        self.hits = 0
+        # 并发抓取时多个线程共享同一缓存，命中计数需要加锁
+        self._hits_lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, url):
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def get(self, url):
+        """
+        读取缓存条目
+
+        Args:
+            url (str): 请求URL
+
+        Returns:
+            dict: 缓存条目，不存在或损坏时返回None
+        """
+        try:
+            with open(self._path(url), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def conditional_headers(self, url):
+        """
+        生成条件请求头
+
+        Args:
+            url (str): 请求URL
+
+        Returns:
+            dict: If-None-Match / If-Modified-Since 请求头
+        """
+        entry = self.get(url)
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, response_headers, data):
+        """
+        保存响应校验头及解析结果，响应不带校验头时不缓存
+
+        Args:
+            url (str): 请求URL
+            response_headers: 响应头（大小写不敏感的映射）
+            data (dict): 解析后的数据
+        """
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "data": data,
+        }
+        path = self._path(url)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"写入HTTP缓存 {path} 时出错: {str(e)}")
+
+    def revalidated(self, url):
+        """
+        处理304响应：刷新条目时间并返回缓存的解析结果
+
+        Args:
+            url (str): 请求URL
+
+        Returns:
+            dict: 缓存的解析结果，条目缺失时返回None
+        """
+        entry = self.get(url)
+        if entry is None:
+            return None
+
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+        with self._hits_lock:
+            self.hits += 1
+        return entry.get('data')
+
+    def evict(self):
+        """按年龄和总大小淘汰缓存条目"""
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        # 最近使用的在前，超龄或超出总大小的条目被删除
+        entries.sort(reverse=True)
+        total_size = 0
+        removed = 0
+        for mtime, size, path in entries:
+            if now - mtime <= self.max_age and total_size + size <= self.max_size:
+                total_size += size
+                continue
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+
+        if removed:
+            logger.info(f"HTTP缓存淘汰了 {removed} 个条目")
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+"""
+流式JSONL输出 - 每条记录写一行，定期刷盘，并通过检查点文件支持断点续爬
+"""
+
+import os
+import glob
+import json
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class JsonlWriter:
+    """
+    按行追加写入爬虫记录
+
+    未完成的输出文件旁边有一个 <文件名>.progress 检查点，记录最后完成的抓取进度和
+    对应的文件长度；正常结束时检查点被删除。续爬时文件被截断到检查点长度，
+    丢弃崩溃前写了一半的页面。
+    """
+
+    def __init__(self, output_dir, prefix, flush_every=20, resume=False):
+        """
+        打开输出文件
+
+        Args:
+            output_dir (str): 输出目录
+            prefix (str): 文件名前缀，如 huggingface_spaces
+            flush_every (int): 每写入多少条记录刷盘一次
+            resume (bool): 是否续写最近一个未完成的输出文件
+        """
+        self.flush_every = flush_every
+        self.state = {}
+        self.count = 0
+        self._unflushed = 0
+
+        self.path = self._find_unfinished(output_dir, prefix) if resume else None
+        if self.path:
+            with open(self._progress_path, 'r', encoding='utf-8') as f:
+                progress = json.load(f)
+            self.state = progress['state']
+            self.count = progress['count']
+            with open(self.path, 'r+b') as f:
+                f.truncate(progress['size'])
+            logger.info(f"从 {self.path} 续爬，已有 {self.count} 条记录，进度: {self.state}")
+        else:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.path = os.path.join(output_dir, f"{prefix}_{timestamp}.jsonl")
+            suffix = 1
+            while os.path.exists(self.path):
+                self.path = os.path.join(output_dir, f"{prefix}_{timestamp}_{suffix}.jsonl")
+                suffix += 1
+            self._write_progress()
+
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    @property
+    def _progress_path(self):
+        return f"{self.path}.progress"
+
+    @staticmethod
+    def _find_unfinished(output_dir, prefix):
+        candidates = sorted(glob.glob(os.path.join(output_dir, f"{prefix}_*.jsonl")), reverse=True)
+        for path in candidates:
+            if os.path.exists(f"{path}.progress"):
+                return path
+        return None
+
+    def _write_progress(self):
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        tmp_path = f"{self._progress_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"state": self.state, "count": self.count, "size": size}, f, ensure_ascii=False)
+        os.replace(tmp_path, self._progress_path)
+
+    def records(self):
+        """
+        读取已写入的记录（续爬时用于恢复去重状态）
+
+        Yields:
+            dict: 记录
+        """
+        self._file.flush()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def write(self, record):
+        """
+        写入一条记录
+
+        Args:
+            record (dict): 记录
+        """
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.count += 1
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every:
+            self._file.flush()
+            self._unflushed = 0
+
+    def checkpoint(self, state):
+        """
+        记录一个完整的抓取进度（如一页或一个抓取单元）
+
+        Args:
+            state (dict): 续爬所需的进度信息
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unflushed = 0
+        self.state = state
+        self._write_progress()
+
+    def close(self):
+        """结束输出并删除检查点"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        if os.path.exists(self._progress_path):
+            os.remove(self._progress_path)
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+
+"""
+近似重复工具索引 - 合并时找出规范化URL不同但实际是同一工具的记录
+
+分两级查找:
+    1. URL别名: canonical_key 相同的URL视为同一工具（查询参数、子域名、GitHub仓库子页面、
+       HF Space的两种地址等）
+    2. 文本相似度（可选，默认关闭）: 名称的字符三元组和描述的相邻词对组成特征集合，用单次置换MinHash
+       生成签名，再按LSH分段分桶。查找时只比较与新工具至少落入一个相同桶的候选，并用精确的Jaccard系数确认，
+       不必与全部工具逐一比较。两条记录都是同一站点上的不同项目（如标题和README相同的两个Space分支）时
+       不按文本合并
+"""
+
+import re
+import zlib
+from array import array
+
+from utils.urls import canonical_key
+
+# 签名长度（分箱数）与LSH分段：8段×4行，Jaccard为0.8的记录对成为候选的概率约为98.5%，0.3时约为6%
+NUM_BINS = 32
+BANDS = 8
+ROWS = NUM_BINS // BANDS
+
+# 特征太少的记录（如只有一个短名称）相似度不可靠，不参与文本匹配
+MIN_SHINGLES = 8
+# 单个桶最多保存的记录数，避免模板化描述（如大量同名示例Space）使查找退化为逐一比较
+MAX_BUCKET_SIZE = 64
+
+# 别名代表站点内唯一项目的类型；同类型而别名不同的两条记录是不同的项目，不按文本相似度合并
+IDENTITY_KINDS = ('github', 'hf-space', 'reddit')
+
+_WORD = re.compile(r'\w+')
+_GOLDEN = 0x9E3779B1
+_MASK = 0xFFFFFFFF
+
+
+def shingles(tool):
+    """
+    提取工具的文本特征：名称的字符三元组和描述的相邻词对，以32位哈希表示
+
+    使用 crc32 而不是内置 hash，使不同进程得到相同的特征值。
+
+    Args:
+        tool (dict): 工具数据
+
+    Returns:
+        tuple: (名称特征集合, 描述特征集合)
+    """
+    name = ' '.join(_WORD.findall(str(tool.get('name') or '').lower()))
+    name_features = {zlib.crc32(('n' + name[i:i + 3]).encode('utf-8')) for i in range(len(name) - 2)}
+
+    words = _WORD.findall(str(tool.get('description') or '').lower())
+    description_features = {
+        zlib.crc32(f"d{first} {second}".encode('utf-8')) for first, second in zip(words, words[1:])
+    }
+    return name_features, description_features
+
+
+def signature(features):
+    """
+    计算单次置换MinHash签名：每个特征按哈希高位分箱，箱内取最小值；空箱取右侧最近的非空箱
+
+    Args:
+        features (set): 特征哈希集合，不能为空
+
+    Returns:
+        list: 长度为 NUM_BINS 的签名
+    """
+    bins = [None] * NUM_BINS
+    # 同一箱内哈希值的大小顺序与低位相同，从大到小写入后每箱留下的就是最小值
+    for mixed in sorted([(feature * _GOLDEN) & _MASK for feature in features], reverse=True):
+        bins[mixed >> 27] = mixed & 0x7FFFFFF
+
+    # 加上距离作为偏移，使借用同一个箱的空箱取值不同
+    filled = bins[:]
+    for index in range(NUM_BINS):
+        if filled[index] is None:
+            distance = 1
+            while bins[(index + distance) % NUM_BINS] is None:
+                distance += 1
+            filled[index] = bins[(index + distance) % NUM_BINS] + (distance << 27)
+    return filled
+
+
+def _bucket_keys(features):
+    values = signature(features)
+    return [hash((band,) + tuple(values[band * ROWS:(band + 1) * ROWS])) for band in range(BANDS)]
+
+
+def _identity(alias):
+    """别名所属的站点项目类型，普通网址返回None"""
+    kind, separator, _ = alias.partition(':')
+    return kind if separator and kind in IDENTITY_KINDS else None
+
+
+def fingerprint(tool, text=True):
+    """
+    计算工具在索引中使用的全部特征，只依赖工具本身，可以在其他进程中预先计算
+
+    Args:
+        tool (dict): 工具数据
+        text (bool): 是否计算文本特征，只按URL别名匹配时不需要
+
+    Returns:
+        tuple: (URL别名, 文本特征)；文本特征为 (名称特征, 描述特征, LSH桶键)，不计算或特征太少时为None
+    """
+    alias = canonical_key(tool.get('url'))
+    if not text:
+        return alias, None
+    name_features, description_features = shingles(tool)
+    if len(name_features) + len(description_features) < MIN_SHINGLES:
+        return alias, None
+    return alias, (
+        array('I', name_features),
+        array('I', description_features),
+        _bucket_keys(name_features | description_features),
+    )
+
+
+class NearDuplicateIndex:
+    """按URL别名和MinHash/LSH查找近似重复工具的索引"""
+
+    def __init__(self, threshold=0.8, name_threshold=0.5, text=True):
+        """
+        创建空索引
+
+        Args:
+            threshold (float): 名称与描述特征合并后的Jaccard系数下限（含）
+            name_threshold (float): 名称特征的Jaccard系数下限（含）
+            text (bool): 是否按文本相似度匹配，为False时只按URL别名匹配
+        """
+        self.threshold = threshold
+        self.name_threshold = name_threshold
+        self.text = text
+        self._aliases = {}
+        self._buckets = {}
+        self._features = {}
+
+    def __len__(self):
+        return len(self._features)
+
+    def add(self, key, tool, features=None):
+        """
+        将工具加入索引
+
+        Args:
+            key: 调用方用来定位工具的键（如列表下标或数据库位置）
+            tool (dict): 工具数据
+            features (tuple): 预先计算的 fingerprint(tool)，为None时现场计算
+        """
+        alias, text_features = features if features is not None else fingerprint(tool)
+        if alias:
+            # 已有相同别名时保留先加入的工具
+            self._aliases.setdefault(alias, key)
+
+        if text_features is None or not self.text:
+            return
+        name_features, description_features, buckets = text_features
+        self._features[key] = (len(self._features), name_features, description_features, _identity(alias))
+
+        for bucket in buckets:
+            members = self._buckets.setdefault(bucket, [])
+            if len(members) < MAX_BUCKET_SIZE:
+                members.append(key)
+
+    def find(self, tool, features=None):
+        """
+        查找与工具重复的已索引工具
+
+        Args:
+            tool (dict): 工具数据
+            features (tuple): 预先计算的 fingerprint(tool)，为None时现场计算
+
+        Returns:
+            object: 重复工具的键，没有重复时返回None
+        """
+        return self.match(tool, features)[0]
+
+    def match(self, tool, features=None):
+        """
+        查找与工具重复的已索引工具，并返回匹配的依据
+
+        先按URL别名查找；没有命中且开启了文本匹配时从LSH桶中取候选，返回相似度达到阈值且最高的一个，
+        相似度相同时返回先加入的工具。与新工具属于同一类站点项目（别名类型相同）的候选不参与文本匹配。
+
+        Args:
+            tool (dict): 工具数据
+            features (tuple): 预先计算的 fingerprint(tool)，为None时现场计算
+
+        Returns:
+            tuple: (重复工具的键, 相似度)；按URL别名匹配时相似度为None，没有重复时键为None
+        """
+        alias, text_features = features if features is not None else fingerprint(tool, self.text)
+        if alias in self._aliases:
+            return self._aliases[alias], None
+
+        if text_features is None or not self.text:
+            return None, None
+        name_array, description_array, buckets = text_features
+        name_features, description_features = set(name_array), set(description_array)
+        identity = _identity(alias)
+
+        # 候选可能落入多个相同的桶，只比较一次；比较的先后不影响结果（相似度相同时按加入顺序取）。
+        # 交集直接与保存的数组求，不为每个候选构造集合（数组中的元素互不相同），
+        # 并集大小由元素个数算出
+        name_count = len(name_features)
+        description_count = len(description_features)
+        name_intersection = name_features.intersection
+        description_intersection = description_features.intersection
+        name_threshold = self.name_threshold
+        features_of = self._features
+        seen = set()
+        best_key, best_score, best_order = None, 0.0, None
+        for bucket in buckets:
+            for key in self._buckets.get(bucket, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                order, stored_names, stored_descriptions, stored_identity = features_of[key]
+                if identity is not None and stored_identity == identity:
+                    continue
+                name_common = len(name_intersection(stored_names))
+                name_union = name_count + len(stored_names) - name_common
+                if not name_union or name_common / name_union < name_threshold:
+                    continue
+                description_common = len(description_intersection(stored_descriptions))
+                description_union = description_count + len(stored_descriptions) - description_common
+                score = (name_common + description_common) / (name_union + description_union)
+                if score < self.threshold or score < best_score:
+                    continue
+                if score > best_score or order < best_order:
+                    best_key, best_score, best_order = key, score, order
+        return best_key, (best_score if best_key is not None else None)
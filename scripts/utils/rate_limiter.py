@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+"""
+线程安全的令牌桶限速器，供多个抓取线程共享同一请求配额
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """令牌桶限速器：任意 period 秒内最多放行 max_calls 次请求"""
+
+    def __init__(self, max_calls, period):
+        """
+        初始化限速器
+
+        Args:
+            max_calls (int): 每个周期允许的最大请求数（同时也是突发容量）
+            period (float): 周期长度(秒)，小于等于0时不限速
+        """
+        self.max_calls = max(1, int(max_calls))
+        self.period = period
+        self._tokens = float(self.max_calls)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """阻塞直到获得一个令牌"""
+        if self.period <= 0:
+            return
+
+        refill_rate = self.max_calls / self.period
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.max_calls, self._tokens + (now - self._updated) * refill_rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / refill_rate
+            time.sleep(wait)
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+"""
+跨运行的已处理帖子索引 - 以帖子ID和规范化URL（与合并去重使用同一 normalize_url）为键保存在SQLite中，按TTL淘汰
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+
+from utils.urls import normalize_url
+
+logger = logging.getLogger(__name__)
+
+
+class SeenIndex:
+    """已处理帖子索引；爬虫在抓取单元的结果写出后才登记帖子，本次运行的记录在commit时才写入数据库，保证崩溃后可重跑"""
+
+    def __init__(self, db_path, ttl_days=14):
+        """
+        打开索引并淘汰过期记录
+
+        Args:
+            db_path (str): SQLite文件路径
+            ttl_days (float): 记录保留天数
+        """
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, seen_at REAL NOT NULL)")
+        self._lock = threading.Lock()
+        self._pending = {}
+        self.skipped = 0
+
+        cutoff = time.time() - ttl_days * 86400
+        with self._conn:
+            expired = self._conn.execute("DELETE FROM seen WHERE seen_at < ?", (cutoff,)).rowcount
+        if expired:
+            logger.info(f"已处理帖子索引淘汰了 {expired} 条过期记录")
+
+    def seen(self, post_id, url=None):
+        """
+        判断帖子ID或URL是否在之前的运行中处理过
+
+        Args:
+            post_id (str): 帖子ID
+            url (str): 帖子链接
+
+        Returns:
+            bool: 是否处理过
+        """
+        keys = [f"id:{post_id}"]
+        if url:
+            keys.append(f"url:{normalize_url(url)}")
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT 1 FROM seen WHERE key IN ({','.join('?' * len(keys))}) LIMIT 1", keys
+            ).fetchone()
+            if row:
+                self.skipped += 1
+        return row is not None
+
+    def add(self, post_id, url=None):
+        """
+        记录本次运行处理过的帖子
+
+        Args:
+            post_id (str): 帖子ID
+            url (str): 提取出工具时的链接，只有产出工具的URL才会被记录
+        """
+        now = time.time()
+        with self._lock:
+            self._pending[f"id:{post_id}"] = now
+            if url:
+                self._pending[f"url:{normalize_url(url)}"] = now
+
+    def commit(self):
+        """将本次运行的记录写入数据库"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO seen (key, seen_at) VALUES (?, ?)", self._pending.items()
+            )
+            self._pending.clear()
+
+    def close(self):
+        """关闭数据库连接"""
+        self._conn.close()
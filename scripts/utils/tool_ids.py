@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+"""
+工具ID - 由规范化URL的哈希生成稳定且不冲突的ID，并将旧版 <域名首段>-<日期> 格式的ID迁移到新格式
+"""
+
+import re
+import json
+import hashlib
+import logging
+from datetime import datetime
+from urllib.parse import urlparse
+
+from utils.urls import canonical_key
+from utils.yaml_io import write_text_atomic
+
+logger = logging.getLogger(__name__)
+
+# ID中哈希部分的长度（十六进制位数），48位哈希在百万级工具中发生碰撞的概率约为0.2%，碰撞时追加序号
+HASH_LENGTH = 12
+SLUG_LENGTH = 40
+
+_NON_SLUG = re.compile(r'[^a-z0-9]+')
+_LEGACY_ID = re.compile(r'^(.*)-(\d{8})$')
+
+
+def stable_tool_id(url):
+    """
+    由URL生成稳定的工具ID：可读的前缀加 canonical_key 的哈希，同一工具在任何一天生成的ID都相同
+
+    前缀取GitHub仓库或HF Space的 owner-name，其他URL取域名首段，如 example-3f2a9c1b7d4e。
+
+    Args:
+        url (str): 工具URL
+
+    Returns:
+        str: 工具ID
+    """
+    key = canonical_key(url)
+    if key.startswith(('github:', 'hf-space:')):
+        slug = key.split(':', 1)[1]
+    else:
+        slug = key.split('/', 1)[0].split('.')[0]
+    slug = _NON_SLUG.sub('-', slug.lower()).strip('-')[:SLUG_LENGTH].rstrip('-') or 'tool'
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()[:HASH_LENGTH]
+    return f"{slug}-{digest}"
+
+
+def unique_id(base_id, is_taken):
+    """
+    在ID已被其他工具占用时追加序号（-2、-3 ...）
+
+    Args:
+        base_id (str): 候选ID
+        is_taken (callable): 以ID调用，返回该ID是否已被占用
+
+    Returns:
+        str: 未被占用的ID
+    """
+    if not is_taken(base_id):
+        return base_id
+    suffix = 2
+    while is_taken(f"{base_id}-{suffix}"):
+        suffix += 1
+    return f"{base_id}-{suffix}"
+
+
+def is_legacy_id(tool):
+    """
+    判断工具ID是否由旧版规则（域名首段加添加当天的日期）生成
+
+    Args:
+        tool (dict): 工具数据
+
+    Returns:
+        bool: 是否为旧版生成的ID
+    """
+    match = _LEGACY_ID.match(str(tool.get('id') or ''))
+    if not match or not tool.get('url'):
+        return False
+    domain = urlparse(tool['url']).netloc.replace("www.", "")
+    return match.group(1) == domain.split('.')[0]
+
+
+def migrate_legacy_ids(tools):
+    """
+    将旧版生成的ID替换为稳定ID，原地修改
+
+    旧版ID在同一天添加的同域名工具之间会重复，迁移后所有生成的ID互不相同；
+    非旧版格式的ID（如爬虫提供的 hf-space-...）保持不变。
+
+    Args:
+        tools (list): 工具数据列表
+
+    Returns:
+        list: 映射表，每项为 {old_id, new_id, url}，按工具顺序排列
+    """
+    taken = {tool['id'] for tool in tools if tool.get('id') and not is_legacy_id(tool)}
+    remap = []
+    for tool in tools:
+        if not is_legacy_id(tool):
+            continue
+        new_id = unique_id(stable_tool_id(tool['url']), taken.__contains__)
+        taken.add(new_id)
+        remap.append({'old_id': tool['id'], 'new_id': new_id, 'url': tool['url']})
+        tool['id'] = new_id
+    return remap
+
+
+def save_remap(remap_path, remap):
+    """
+    将映射表追加到ID映射文件
+
+    文件为JSON对象，entries 中保存历次迁移的所有映射；旧ID可能对应多个新ID（旧ID本身重复时），
+    以 url 区分。
+
+    Args:
+        remap_path (str): ID映射文件路径
+        remap (list): migrate_legacy_ids 返回的映射表
+    """
+    try:
+        with open(remap_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        data = {'entries': []}
+    data['updated_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    data['entries'].extend(remap)
+    write_text_atomic(remap_path, json.dumps(data, ensure_ascii=False, indent=2) + '\n')
+    logger.info(f"已将 {len(remap)} 条ID映射写入 {remap_path}")
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+"""
+按分类分片的工具库 - 每个分类一个YAML文件（如 data/processed/tools/image.yaml），只读写需要的分片
+"""
+
+import os
+import logging
+
+from utils.yaml_io import dump_yaml, write_text_atomic
+from utils.tools_cache import load_tools, write_sidecar, sidecar_path
+
+logger = logging.getLogger(__name__)
+
+SHARD_EXTENSION = '.yaml'
+
+
+def is_sharded(path):
+    """
+    判断工具库路径是否为分片目录（不以 .yaml/.yml 结尾）
+
+    Args:
+        path (str): 工具库路径
+
+    Returns:
+        bool: 是否为分片目录
+    """
+    return not path.endswith(('.yaml', '.yml'))
+
+
+def shard_files(shard_dir):
+    """
+    按文件名顺序列出分片文件
+
+    Args:
+        shard_dir (str): 分片目录
+
+    Returns:
+        list: (分类, 文件路径) 列表
+    """
+    if not os.path.isdir(shard_dir):
+        return []
+    return [
+        (name[:-len(SHARD_EXTENSION)], os.path.join(shard_dir, name))
+        for name in sorted(os.listdir(shard_dir))
+        if name.endswith(SHARD_EXTENSION) and not name.startswith('.')
+    ]
+
+
+def load_shards(shard_dir, categories=None, write_cache=True):
+    """
+    读取分片，分片之间按文件名排序，分片内保持原有顺序
+
+    只读取部分分类时，保存需要把同一组分类传给 save_shards 的 loaded_categories，
+    否则未读取的分类会被当作已没有工具而删除。
+
+    Args:
+        shard_dir (str): 分片目录
+        categories (iterable): 只读取这些分类的分片，为None时读取全部
+        write_cache (bool): 是否重建或更新各分片的缓存，见 tools_cache.load_tools
+
+    Returns:
+        list: 工具数据列表
+    """
+    wanted = set(categories) if categories is not None else None
+    tools = []
+    for category, path in shard_files(shard_dir):
+        if wanted is None or category in wanted:
+            tools.extend(load_tools(path, write_cache) or [])
+    return tools
+
+
+def load_catalog(path, write_cache=True):
+    """
+    读取工具库：分片目录读取全部分片，否则读取单个YAML文件
+
+    Args:
+        path (str): tools.yaml 路径或分片目录
+        write_cache (bool): 是否重建或更新缓存，见 tools_cache.load_tools
+
+    Returns:
+        list: 工具数据列表
+
+    Raises:
+        FileNotFoundError: YAML文件不存在
+    """
+    if is_sharded(path):
+        return load_shards(path, write_cache=write_cache)
+    return load_tools(path, write_cache) or []
+
+
+def save_shards(tools, shard_dir, loaded_categories=None):
+    """
+    按分类写入分片，内容未变化的分片不重写，不再有工具的分类的分片被删除
+
+    Args:
+        tools (list): 已验证的工具数据列表
+        shard_dir (str): 分片目录
+        loaded_categories (iterable): 工具列表由 load_shards 按这些分类读取，只重写或删除这些分类的分片，
+            其他分片保持不变；为None时工具列表视为完整的工具库
+
+    Returns:
+        tuple: (写入的分片数, 未变化的分片数, 删除的分片数)
+
+    Raises:
+        ValueError: 有工具的分类不在 loaded_categories 中，写入会覆盖未读取的分片
+    """
+    groups = {}
+    for tool in tools:
+        groups.setdefault(tool.get('category') or 'other', []).append(tool)
+
+    scope = set(loaded_categories) if loaded_categories is not None else None
+    if scope is not None:
+        outside = sorted(set(groups) - scope)
+        if outside:
+            raise ValueError(f"工具分类不在已读取的分片中，写入会覆盖未读取的工具: {', '.join(outside)}")
+
+    os.makedirs(shard_dir, exist_ok=True)
+    written = unchanged = removed = 0
+
+    for category, path in shard_files(shard_dir):
+        if category not in groups and (scope is None or category in scope):
+            os.remove(path)
+            if os.path.exists(sidecar_path(path)):
+                os.remove(sidecar_path(path))
+            removed += 1
+
+    for category, group in groups.items():
+        path = os.path.join(shard_dir, f"{category}{SHARD_EXTENSION}")
+        if write_text_atomic(path, dump_yaml(group)):
+            write_sidecar(path, group)
+            written += 1
+        else:
+            unchanged += 1
+
+    logger.info(f"分片写入完成: 写入 {written} 个, 未变化 {unchanged} 个, 删除 {removed} 个")
+    return written, unchanged, removed
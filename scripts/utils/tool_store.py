@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+
+"""
+SQLite工具库 - tools.yaml 的可选存储后端，按 id、规范化URL、分类、添加日期和标签建索引
+
+tools.yaml 仍是仓库中的权威数据：数据库记录导入时YAML的内容哈希，YAML被外部修改
+（如手工编辑后提交）时会自动重新导入；合并结果通过 export_yaml 写回YAML。
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import logging
+from datetime import date, datetime
+
+from utils.urls import normalize_url, URL_KEY_VERSION
+from utils.tool_shards import is_sharded, shard_files
+
+logger = logging.getLogger(__name__)
+
+# data 列的编码版本，编码方式变化时递增，使已有数据库从YAML重新导入
+DATA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tools (
+    position INTEGER PRIMARY KEY,
+    id TEXT,
+    norm_url TEXT,
+    category TEXT,
+    added_date TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tools_id ON tools (id);
+CREATE INDEX IF NOT EXISTS idx_tools_norm_url ON tools (norm_url);
+CREATE INDEX IF NOT EXISTS idx_tools_category ON tools (category);
+CREATE INDEX IF NOT EXISTS idx_tools_added_date ON tools (added_date);
+CREATE TABLE IF NOT EXISTS tool_tags (
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (position, tag)
+);
+CREATE INDEX IF NOT EXISTS idx_tool_tags_tag ON tool_tags (tag);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _json_default(obj):
+    """手工编辑的YAML中未加引号的日期和时间会被解析为date/datetime对象，带类型标记保存，读出时还原"""
+    if isinstance(obj, datetime):
+        return {'$datetime': obj.isoformat()}
+    if isinstance(obj, date):
+        return {'$date': obj.isoformat()}
+    return str(obj)
+
+
+def _json_object_hook(obj):
+    if len(obj) == 1:
+        if '$datetime' in obj:
+            return datetime.fromisoformat(obj['$datetime'])
+        if '$date' in obj:
+            return date.fromisoformat(obj['$date'])
+    return obj
+
+
+def _encode(tool):
+    return json.dumps(tool, ensure_ascii=False, default=_json_default)
+
+
+def _decode(data):
+    return json.loads(data, object_hook=_json_object_hook)
+
+
+def _file_hash(path):
+    """计算YAML文件的SHA-256；分片目录按文件名顺序计算所有分片的文件名和内容"""
+    digest = hashlib.sha256()
+    paths = [p for _, p in shard_files(path)] if is_sharded(path) else [path]
+    for file_path in paths:
+        if is_sharded(path):
+            digest.update(os.path.basename(file_path).encode('utf-8') + b'\0')
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ToolStore:
+    """以SQLite保存的工具库，记录顺序与 tools.yaml 保持一致"""
+
+    def __init__(self, db_path):
+        """
+        打开数据库
+
+        Args:
+            db_path (str): SQLite文件路径
+        """
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.executescript(SCHEMA)
+
+    def _row_values(self, position, tool):
+        url = tool.get('url')
+        return (
+            position,
+            tool.get('id') or None,
+            normalize_url(url) if url else None,
+            tool.get('category'),
+            str(tool['added_date']) if tool.get('added_date') else None,
+            _encode(tool),
+        )
+
+    def _write(self, position, tool):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO tools (position, id, norm_url, category, added_date, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            self._row_values(position, tool)
+        )
+        self._conn.execute("DELETE FROM tool_tags WHERE position = ?", (position,))
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO tool_tags (position, tag) VALUES (?, ?)",
+            [(position, tag) for tag in tool.get('tags') or []]
+        )
+
+    def sync_from_yaml(self, yaml_path, load_tools):
+        """
+        YAML内容与上次导入或导出时不同，或URL规范化规则、数据编码方式已变化时，用YAML重建数据库
+
+        Args:
+            yaml_path (str): YAML文件路径或分片目录
+            load_tools (callable): 读取YAML工具列表的函数
+
+        Returns:
+            bool: 是否重新导入
+        """
+        yaml_hash = _file_hash(yaml_path) if os.path.exists(yaml_path) else ''
+        if (yaml_hash == self._get_meta('yaml_sha256')
+                and self._get_meta('url_key_version') == str(URL_KEY_VERSION)
+                and self._get_meta('data_version') == str(DATA_VERSION)):
+            return False
+
+        tools = (load_tools(yaml_path) or []) if yaml_hash else []
+        with self._conn:
+            self._conn.execute("DELETE FROM tools")
+            self._conn.execute("DELETE FROM tool_tags")
+            for position, tool in enumerate(tools):
+                self._write(position, tool)
+            self._set_meta('yaml_sha256', yaml_hash)
+            self._set_meta('url_key_version', str(URL_KEY_VERSION))
+            self._set_meta('data_version', str(DATA_VERSION))
+        logger.info(f"已从 {yaml_path} 导入 {len(tools)} 个工具到 {self.db_path}")
+        return True
+
+    def _get_meta(self, key):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def find(self, norm_url=None, tool_id=None):
+        """
+        按规范化URL或ID查找工具，URL优先
+
+        Args:
+            norm_url (str): 规范化URL
+            tool_id (str): 工具ID
+
+        Returns:
+            tuple: (位置, 工具数据)，不存在时返回 (None, None)
+        """
+        for column, value in (('norm_url', norm_url), ('id', tool_id)):
+            if not value:
+                continue
+            row = self._conn.execute(
+                f"SELECT position, data FROM tools WHERE {column} = ? ORDER BY position DESC LIMIT 1", (value,)
+            ).fetchone()
+            if row:
+                return row[0], _decode(row[1])
+        return None, None
+
+    def get(self, position):
+        """
+        读取指定位置的工具
+
+        Args:
+            position (int): 工具位置
+
+        Returns:
+            dict: 工具数据，不存在时返回None
+        """
+        row = self._conn.execute("SELECT data FROM tools WHERE position = ?", (position,)).fetchone()
+        return _decode(row[0]) if row else None
+
+    def update(self, position, tool):
+        """
+        覆盖指定位置的工具
+
+        Args:
+            position (int): find 返回的位置
+            tool (dict): 工具数据
+        """
+        self._write(position, tool)
+
+    def append(self, tool):
+        """
+        在末尾添加工具
+
+        Args:
+            tool (dict): 工具数据
+
+        Returns:
+            int: 新工具的位置
+        """
+        position = self._conn.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM tools").fetchone()[0]
+        self._write(position, tool)
+        return position
+
+    def commit(self):
+        """提交本次修改"""
+        self._conn.commit()
+
+    def all_tools(self):
+        """
+        按 tools.yaml 中的顺序返回全部工具
+
+        Returns:
+            list: 工具数据列表
+        """
+        return [_decode(data) for data, in self._conn.execute("SELECT data FROM tools ORDER BY position")]
+
+    def latest(self, since_date, limit):
+        """
+        按添加日期倒序返回最近添加的工具（使用 added_date 索引）
+
+        Args:
+            since_date (str): 起始日期，YYYY-MM-DD
+            limit (int): 最大数量
+
+        Returns:
+            list: 工具数据列表
+        """
+        rows = self._conn.execute(
+            "SELECT data FROM tools WHERE added_date >= ? ORDER BY added_date DESC, position LIMIT ?",
+            (since_date, limit)
+        )
+        return [_decode(data) for data, in rows]
+
+    def by_category(self, category):
+        """
+        返回指定分类的工具
+
+        Args:
+            category (str): 分类
+
+        Returns:
+            list: 工具数据列表
+        """
+        rows = self._conn.execute("SELECT data FROM tools WHERE category = ? ORDER BY position", (category,))
+        return [_decode(data) for data, in rows]
+
+    def by_tag(self, tag):
+        """
+        返回带有指定标签的工具
+
+        Args:
+            tag (str): 标签
+
+        Returns:
+            list: 工具数据列表
+        """
+        rows = self._conn.execute(
+            "SELECT t.data FROM tool_tags g JOIN tools t ON t.position = g.position "
+            "WHERE g.tag = ? ORDER BY t.position",
+            (tag,)
+        )
+        return [_decode(data) for data, in rows]
+
+    def duplicates(self, column):
+        """
+        查找 id 或 norm_url 重复的值
+
+        Args:
+            column (str): 'id' 或 'norm_url'
+
+        Returns:
+            dict: 重复值到位置列表的映射
+        """
+        if column not in ('id', 'norm_url'):
+            raise ValueError(f"不支持的列: {column}")
+        rows = self._conn.execute(
+            f"SELECT {column}, GROUP_CONCAT(position) FROM tools WHERE {column} IS NOT NULL "
+            f"GROUP BY {column} HAVING COUNT(*) > 1"
+        )
+        return {value: [int(p) for p in positions.split(',')] for value, positions in rows}
+
+    def export_yaml(self, yaml_path, save_tools):
+        """
+        将数据库导出为YAML，并记录导出后YAML的内容哈希
+
+        Args:
+            yaml_path (str): YAML文件路径或分片目录
+            save_tools (callable): 以 (工具列表, YAML路径) 调用的保存函数，返回是否成功
+
+        Returns:
+            bool: 是否导出成功
+        """
+        if not save_tools(self.all_tools(), yaml_path):
+            return False
+        with self._conn:
+            self._set_meta('yaml_sha256', _file_hash(yaml_path))
+        return True
+
+    def close(self):
+        """关闭数据库连接"""
+        self._conn.close()
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+"""
+tools.yaml 的二进制缓存 - 在YAML旁边保存一份pickle格式的副本，YAML未变化时直接读取副本
+"""
+
+import os
+import pickle
+import hashlib
+import logging
+
+from utils.yaml_io import load_yaml
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+
+def sidecar_path(yaml_path):
+    """
+    获取YAML文件对应的缓存文件路径，如 data/processed/.tools.yaml.cache
+
+    Args:
+        yaml_path (str): YAML文件路径
+
+    Returns:
+        str: 缓存文件路径
+    """
+    directory, name = os.path.split(yaml_path)
+    return os.path.join(directory, f".{name}.cache")
+
+
+def _yaml_hash(yaml_path):
+    digest = hashlib.sha256()
+    with open(yaml_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_header(cache_path):
+    """读取缓存文件头部；文件由头部和数据两个连续的pickle组成，校验头部时不必反序列化数据"""
+    f = open(cache_path, 'rb')
+    try:
+        header = pickle.load(f)
+        if isinstance(header, dict) and header.get('version') == CACHE_VERSION:
+            return header, f
+    except Exception:
+        pass
+    f.close()
+    return None, None
+
+
+def write_sidecar(yaml_path, tools, yaml_hash=None):
+    """
+    为YAML文件写入缓存，写入失败只记录警告
+
+    Args:
+        yaml_path (str): 已写好的YAML文件路径
+        tools (list): 与YAML内容一致的工具数据
+        yaml_hash (str): YAML文件内容的SHA-256，未提供时重新计算
+    """
+    cache_path = sidecar_path(yaml_path)
+    stat = os.stat(yaml_path)
+    header = {
+        'version': CACHE_VERSION,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': yaml_hash or _yaml_hash(yaml_path),
+    }
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(tools, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"写入缓存 {cache_path} 失败: {str(e)}")
+
+
+def load_tools(yaml_path, write_cache=True):
+    """
+    读取工具数据，缓存有效时直接反序列化缓存，否则解析YAML并重建缓存
+
+    YAML的修改时间和大小与缓存记录一致时直接使用缓存；不一致时（如git checkout后）
+    再比较内容哈希，内容未变只更新缓存头部。
+
+    Args:
+        yaml_path (str): YAML文件路径
+        write_cache (bool): 是否重建或更新缓存；为False时只读取有效的缓存，不在YAML旁边写入文件
+
+    Returns:
+        object: YAML内容，空文件返回None
+    """
+    cache_path = sidecar_path(yaml_path)
+    stat = os.stat(yaml_path)
+    yaml_hash = None
+
+    if os.path.exists(cache_path):
+        header, f = _read_header(cache_path)
+        if header:
+            with f:
+                fresh = header['mtime_ns'] == stat.st_mtime_ns and header['size'] == stat.st_size
+                if not fresh and header['size'] == stat.st_size:
+                    yaml_hash = _yaml_hash(yaml_path)
+                    fresh = header['sha256'] == yaml_hash
+                if fresh:
+                    try:
+                        tools = pickle.load(f)
+                    except Exception as e:
+                        logger.warning(f"读取缓存 {cache_path} 失败: {str(e)}，将重新解析YAML")
+                    else:
+                        if write_cache and header['mtime_ns'] != stat.st_mtime_ns:
+                            write_sidecar(yaml_path, tools, yaml_hash)
+                        return tools
+
+    tools = load_yaml(yaml_path)
+    if write_cache:
+        write_sidecar(yaml_path, tools, yaml_hash)
+    return tools
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+
+"""
+URL工具 - 工具去重使用的URL规范化
+
+解析结果按URL缓存（LRU），同一次运行中现有工具和新记录的URL只解析一次。规范化规则:
+    - 主机名转小写、国际化域名转为ASCII（IDNA）、去掉末尾的点、默认端口和 www./www2./m. 前缀
+      （去掉后至少还剩两级域名时，m.io 这样的域名本身保持不变）
+    - 去掉 utm_* 等跟踪参数
+    - 按已知站点的规则折叠：GitHub的 owner/repo 不区分大小写（其下的文件路径区分大小写，保持原样），hf.co 即 huggingface.co，
+      Reddit帖子的各种地址（old.reddit.com、redd.it 短链、带标题的路径）统一为 reddit.com/comments/<id>
+"""
+
+import re
+from functools import lru_cache
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+# 规范化规则的版本，规则变化导致 normalize_url 的结果变化时递增，使保存了规范化URL的数据重新计算
+URL_KEY_VERSION = 3
+
+# 解析结果缓存的条目数
+CACHE_SIZE = 1 << 18
+
+# 跟踪参数，不影响页面内容
+TRACKING_PARAMS = frozenset([
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid', '_ga', '_gl',
+    'ref', 'ref_src', 'ref_url', 'referrer', 'spm', 'si', 'share_id', 'trk', 'mkt_tok',
+])
+TRACKING_PREFIXES = ('utm_',)
+
+# 不代表不同站点的主机名前缀
+_HOST_PREFIXES = ('www.', 'www2.', 'm.')
+_REDDIT_PREFIXES = ('old.', 'new.', 'np.', 'amp.', 'i.')
+_DEFAULT_PORTS = (':80', ':443')
+
+_REDDIT_POST = re.compile(r'^(?:/r/[^/]+)?/comments/([a-z0-9]+)', re.IGNORECASE)
+
+
+def _fold_host(netloc):
+    """主机名转小写并转为IDNA形式，去掉用户信息、默认端口、末尾的点和无意义的前缀"""
+    host = netloc.rpartition('@')[2].lower()
+    if host.endswith(_DEFAULT_PORTS):
+        host = host.rpartition(':')[0]
+    host = host.rstrip('.')
+    if not host.isascii():
+        try:
+            host = host.encode('idna').decode('ascii')
+        except UnicodeError:
+            pass
+    for prefix in _HOST_PREFIXES:
+        # 前缀后只剩一级时前缀是域名本身的一部分（如 m.io），不能去掉
+        if host.startswith(prefix) and '.' in host[len(prefix):]:
+            host = host[len(prefix):]
+            break
+    return host
+
+
+def _split(url):
+    """
+    拆分URL为 (协议, 主机, 路径, 查询, 片段)
+
+    常见的 scheme://host/path 形式直接按分隔符切分，其他形式交给 urlsplit；
+    与 urlsplit 相同，没有协议的URL整体视为路径。
+    """
+    scheme, separator, rest = url.partition('://')
+    if not separator or not scheme.isalpha():
+        parts = urlsplit(url)
+        return parts.scheme, parts.netloc, parts.path, parts.query, parts.fragment
+    rest, _, fragment = rest.partition('#')
+    rest, _, query = rest.partition('?')
+    netloc, slash, path = rest.partition('/')
+    return scheme, netloc, slash + path, query, fragment
+
+
+def _strip_tracking(query):
+    """去掉跟踪参数，保留其余参数的顺序"""
+    if not query:
+        return query
+    pairs = parse_qsl(query, keep_blank_values=True)
+    kept = [
+        (name, value) for name, value in pairs
+        if name.lower() not in TRACKING_PARAMS and not name.lower().startswith(TRACKING_PREFIXES)
+    ]
+    if len(kept) == len(pairs):
+        return query
+    return urlencode(kept)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse(url):
+    """
+    解析并规范化URL（带缓存），同时生成清理后的URL，合并新工具时不必再解析一次
+
+    Returns:
+        tuple: (规范化的URL, 近似去重键, 清理后的URL)
+    """
+    scheme, netloc, path, query, fragment = _split(url.strip())
+    cleaned = _clean(url, scheme, netloc, path, query, fragment)
+    host = _fold_host(netloc)
+    path = path.rstrip('/')
+
+    if host == 'hf.co':
+        host = 'huggingface.co'
+    elif host == 'redd.it' and path:
+        host, path = 'reddit.com', f"/comments{path.lower()}"
+    elif host.endswith('reddit.com'):
+        for prefix in _REDDIT_PREFIXES:
+            if host.startswith(prefix):
+                host = host[len(prefix):]
+                break
+        match = _REDDIT_POST.match(path)
+        if host == 'reddit.com' and match:
+            path = f"/comments/{match.group(1).lower()}"
+    elif host == 'github.com':
+        # 只有 owner/repo 不区分大小写，blob/tree 下的文件路径区分大小写
+        parts = path.split('/', 3)
+        if len(parts) > 1:
+            parts[1] = parts[1].lower()
+        if len(parts) > 2:
+            parts[2] = parts[2].lower().removesuffix('.git')
+        path = '/'.join(parts)
+
+    segments = [segment for segment in path.split('/') if segment]
+    if host == 'github.com' and len(segments) >= 2:
+        key = f"github:{segments[0]}/{segments[1].removesuffix('.git')}"
+    elif host == 'huggingface.co' and len(segments) >= 3 and segments[0] == 'spaces':
+        key = f"hf-space:{_hf_space_subdomain(segments[1], segments[2])}"
+    elif host.endswith('.hf.space'):
+        key = f"hf-space:{host[:-len('.hf.space')]}"
+    elif host == 'reddit.com' and len(segments) == 2 and segments[0] == 'comments':
+        key = f"reddit:{segments[1]}"
+    else:
+        key = f"{host}{path}"
+    normalized = f"{host}{path}"
+    return normalized, (normalized if key == normalized else key), cleaned
+
+
+def _clean(url, scheme, netloc, path, query, fragment):
+    """clean_url 的实现，使用 _parse 已拆分的各部分；内容不变时返回原字符串，不在缓存中多存一份"""
+    raw_scheme, separator, _ = url.partition('://')
+    if not separator or not raw_scheme.isalpha():
+        return url
+    host = netloc.rpartition('@')[2].lower()
+    if host.endswith(_DEFAULT_PORTS):
+        host = host.rpartition(':')[0]
+    query = _strip_tracking(query)
+    cleaned = f"{scheme.lower()}://{host}{path}" + (f"?{query}" if query else '') + (f"#{fragment}" if fragment else '')
+    return url if cleaned == url else cleaned
+
+
+def normalize_url(url):
+    """
+    规范化URL，移除协议、查询参数、片段和尾部斜杠，用于URL去重
+
+    Args:
+        url (str): 原始URL
+
+    Returns:
+        str: 规范化后的URL
+    """
+    if not url:
+        return ""
+
+    return _parse(url)[0]
+
+
+def canonical_key(url):
+    """
+    生成用于近似去重的URL键，同一工具的不同入口得到相同的键
+
+    在 normalize_url 的基础上，GitHub仓库只取 owner/repo，其下的 tree/blob 等页面视为同一仓库；
+    Hugging Face Space 的 huggingface.co/spaces/owner/name 与 owner-name.hf.space 两种地址
+    视为同一个Space；Reddit帖子只取帖子ID。
+
+    Args:
+        url (str): 原始URL
+
+    Returns:
+        str: 去重键，URL为空时返回空字符串
+    """
+    if not url:
+        return ""
+
+    return _parse(url)[1]
+
+
+def url_keys(url):
+    """
+    一次查找同时得到 normalize_url 和 canonical_key 的结果
+
+    Args:
+        url (str): 原始URL
+
+    Returns:
+        tuple: (规范化URL, 去重键)，URL为空时都是空字符串
+    """
+    if not url:
+        return "", ""
+
+    normalized, key, _ = _parse(url)
+    return normalized, key
+
+
+def clean_url(url):
+    """
+    清理用于保存的URL：协议和主机名转小写，去掉用户信息、默认端口和跟踪参数，其余部分保持原样
+
+    与 normalize_url 共用解析缓存，已规范化过的URL不再重新解析。
+
+    Args:
+        url (str): 原始URL
+
+    Returns:
+        str: 清理后的URL，无法识别的URL原样返回
+    """
+    if not url:
+        return url
+
+    scheme, separator, _ = url.partition('://')
+    if not separator or not scheme.isalpha():
+        return url
+    return _parse(url)[2]
+
+
+def _hf_space_subdomain(owner, name):
+    """Space在 hf.space 上的子域名：小写，下划线和点替换为连字符"""
+    return f"{owner}-{name}".lower().replace('_', '-').replace('.', '-')
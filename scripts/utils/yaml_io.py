@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+"""
+YAML读写 - 可用时使用LibYAML的C实现，否则回退到纯Python实现，两者输出逐字节一致
+"""
+
+import os
+import re
+import hashlib
+import tempfile
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+    HAS_LIBYAML = True
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+    HAS_LIBYAML = False
+
+# tools.yaml 的固定输出格式
+DUMP_OPTIONS = {
+    "allow_unicode": True,
+    "sort_keys": False,
+    "indent": 2,
+}
+
+# LibYAML会把BMP以外的字符（如emoji）和U+0085转义为 \U........ / \N，纯Python实现原样输出
+_LIBYAML_ESCAPED = re.compile('[\x85\U00010000-\U0010FFFF]')
+
+# 纯Python实现以双引号输出的字符串：含不可打印字符（制表符、\r等），或有空格紧邻换行；
+# 这类字符串超出行宽时两种实现的折行位置和续行写法不同（纯Python还会在转义序列之后折行）
+_DOUBLE_QUOTED = re.compile(
+    '[ ][\n\x85\u2028\u2029]|[\n\x85\u2028\u2029][ ]'
+    '|[^\n\x20-\x7E\x85\xA0-\uD7FF\uE000-\uFFFD\U00010000-\U0010FFFF]|[\uFEFF\U0010FFFF]'
+)
+
+# 顶层列表中每个元素的起始行
+_TOP_LEVEL_ITEM = re.compile(r'(?m)^(?=-(?: |$))')
+
+
+def load_yaml(path, loader=SafeLoader):
+    """
+    读取YAML文件
+
+    Args:
+        path (str): 文件路径
+        loader (type): YAML加载器，默认优先使用C实现
+
+    Returns:
+        object: 解析结果，空文件返回None
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=loader)
+
+
+def write_text_atomic(path, text):
+    """
+    原子地写入文本文件：内容哈希与现有文件相同时跳过写入，否则写入同目录的临时文件，
+    fsync后重命名覆盖，写入中途崩溃不会留下写了一半的文件
+
+    Args:
+        path (str): 文件路径
+        text (str): 文件内容
+
+    Returns:
+        bool: 是否实际写入（内容未变化时为False）
+    """
+    data = text.encode('utf-8')
+    if os.path.exists(path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        if digest.digest() == hashlib.sha256(data).digest():
+            return False
+
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp创建的文件权限为0600，沿用原文件权限或按umask设置
+        if os.path.exists(path):
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    # 同步目录项，保证重命名本身也已落盘
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory or '.', os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    return True
+
+
+def dump_yaml(data, stream=None, dumper=SafeDumper):
+    """
+    按 tools.yaml 的格式序列化数据
+
+    使用C实现时，含两种实现输出不同的字符串（BMP以外的字符、U+0085、双引号字符串）的
+    顶层元素改用纯Python实现输出，保证结果与纯Python实现逐字节一致。
+
+    Args:
+        data (object): 待序列化的数据
+        stream (file): 输出流，为None时返回字符串
+        dumper (type): YAML序列化器，默认优先使用C实现
+
+    Returns:
+        str: stream为None时返回序列化结果
+    """
+    text = yaml.dump(data, Dumper=dumper, **DUMP_OPTIONS)
+    if dumper is not yaml.SafeDumper and _needs_python_dumper(data):
+        text = _redump_items(data, text)
+
+    if stream is None:
+        return text
+    stream.write(text)
+
+
+def _needs_python_dumper(obj):
+    """数据中是否有C实现与纯Python实现输出不同的字符串"""
+    if isinstance(obj, str):
+        return _LIBYAML_ESCAPED.search(obj) is not None or _DOUBLE_QUOTED.search(obj) is not None
+    if isinstance(obj, dict):
+        return any(_needs_python_dumper(key) or _needs_python_dumper(value) for key, value in obj.items())
+    if isinstance(obj, list):
+        return any(_needs_python_dumper(item) for item in obj)
+    return False
+
+
+def _redump_items(data, text):
+    """将C实现输出中含特殊字符串的顶层元素替换为纯Python实现的输出"""
+    chunks = _TOP_LEVEL_ITEM.split(text)[1:] if isinstance(data, list) else []
+    if len(chunks) != len(data if isinstance(data, list) else ()) or not chunks:
+        return yaml.dump(data, Dumper=yaml.SafeDumper, **DUMP_OPTIONS)
+
+    return ''.join(
+        yaml.dump([item], Dumper=yaml.SafeDumper, **DUMP_OPTIONS) if _needs_python_dumper(item) else chunk
+        for item, chunk in zip(data, chunks)
+    )
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+"""
+测试公共配置
+
+脚本以所在目录为导入路径独立运行，并把 scripts 目录加入导入路径以导入共用的 utils 包；
+测试按同样的方式设置 sys.path，爬虫和处理脚本可以直接按模块名导入。
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+
+import pytest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+for directory in ('processors', 'crawlers'):
+    sys.path.insert(0, os.path.join(SCRIPTS_DIR, directory))
+
+_original_cwd = os.getcwd()
+_work_dir = None
+
+
+def pytest_configure(config):
+    # 爬虫和处理脚本导入时在当前目录创建日志文件，测试在临时目录中运行
+    global _work_dir
+    _work_dir = tempfile.mkdtemp(prefix='toolverse-tests-')
+    os.chdir(_work_dir)
+
+
+def pytest_unconfigure(config):
+    os.chdir(_original_cwd)
+    shutil.rmtree(_work_dir, ignore_errors=True)
+
+
+class FakeResponse:
+    """requests.Response 的最小替身"""
+
+    def __init__(self, status_code=200, text="", json_data=None, headers=None, links=None):
+        self.status_code = status_code
+        self.text = text
+        self._json = json_data
+        self.headers = headers or {}
+        self.links = links or {}
+
+    def json(self):
+        return self._json
+
+
+@pytest.fixture
+def fake_session():
+    """按URL路径（含查询串）返回预设响应的会话，记录所有请求的URL"""
+
+    class FakeSession:
+        def __init__(self):
+            self.routes = {}
+            self.requested = []
+
+        def get(self, url, params=None, headers=None):
+            if params:
+                url = f"{url}?" + "&".join(f"{key}={value}" for key, value in params.items())
+            self.requested.append(url)
+            return self.routes.get(url, FakeResponse(404))
+
+    return FakeSession()
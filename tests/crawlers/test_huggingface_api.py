@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import logging
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+from huggingface_crawler import HuggingFaceCrawler
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'huggingface')
+
+logging.getLogger("huggingface_crawler").setLevel(logging.WARNING)
+
+DETAIL = ('<div class="space-readme"><article>Clone a voice from a short speech sample</article></div>'
+          '<div class="space-sdk-items"><a class="link-box">docker</a></div>'
+          '<span class="discussion-tab-count">4</span>')
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def stub_server():
+    """本地桩服务器：/api/spaces 返回录制的JSON，第一页通过Link头给出下一页游标；/spaces/... 返回详情页"""
+    requested = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requested.append(self.path)
+            parsed = urlparse(self.path)
+            query = parse_qs(parsed.query)
+            headers = {}
+            if parsed.path == '/api/spaces' and 'cursor' not in query:
+                body = read_fixture('api_spaces_page1.json')
+                base = f"http://{self.headers['Host']}"
+                headers['Link'] = f'<{base}/api/spaces?cursor=eyJwIjoxfQ&limit=2&full=true>; rel="next"'
+            elif parsed.path == '/api/spaces' and query['cursor'] == ['eyJwIjoxfQ']:
+                body = read_fixture('api_spaces_page2.json')
+            elif parsed.path.startswith('/spaces/'):
+                body = DETAIL.encode('utf-8')
+            else:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", requested
+    server.shutdown()
+    server.server_close()
+
+
+def crawl(base_url, output_dir):
+    crawler = HuggingFaceCrawler(base_url=base_url, max_pages=5, delay=0, use_cache=False,
+                                 use_api=True, api_page_size=2)
+    crawler.output_dir = str(output_dir)
+    count = crawler.crawl()
+    records = []
+    for name in sorted(os.listdir(output_dir)):
+        if name.endswith('.jsonl'):
+            with open(os.path.join(output_dir, name), encoding='utf-8') as f:
+                records.extend(json.loads(line) for line in f)
+    return count, records
+
+
+def test_api_mode_follows_link_cursor(tmp_path, stub_server):
+    base_url, requested = stub_server
+    count, records = crawl(base_url, tmp_path)
+
+    assert count == 3
+    assert [record['id'] for record in records] == [
+        'hf-space-acme-sketch-to-image', 'hf-space-lab42-voice-clone', 'hf-space-someone-video-captioner',
+    ]
+    api_requests = [path for path in requested if path.startswith('/api/spaces')]
+    assert len(api_requests) == 2
+    assert 'limit=2' in api_requests[0] and 'full=true' in api_requests[0]
+    assert 'cursor=eyJwIjoxfQ' in api_requests[1]
+
+
+def test_api_mode_fetches_details_only_when_needed(tmp_path, stub_server):
+    base_url, requested = stub_server
+    _, records = crawl(base_url, tmp_path)
+
+    # 只有缺少简介的Space请求了详情页
+    assert [path for path in requested if path.startswith('/spaces/')] == ['/spaces/lab42/voice-clone']
+
+    sketch, voice, _ = records
+    assert sketch['name'] == 'Sketch To Image'
+    assert sketch['description'] == 'Turn rough sketches into images with a diffusion model'
+    assert sketch['tech_stack'] == ['gradio']
+    assert sketch['updated_at'] == '2024-05-02T17:40:03.000Z'
+    assert sketch['category'] == 'image'
+    assert 'detailed_description' not in sketch
+
+    assert voice['detailed_description'] == 'Clone a voice from a short speech sample'
+    assert voice['comments_count'] == 4
+    assert voice['tech_stack'] == ['docker']
+    assert voice['updated_at'] == '2024-04-28T08:15:55.000Z'
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+import glob
+import json
+import logging
+
+import pytest
+import yaml
+
+from conftest import FakeResponse
+from huggingface_crawler import HuggingFaceCrawler
+
+BASE_URL = "https://hf.test"
+
+logging.getLogger("huggingface_crawler").setLevel(logging.WARNING)
+
+
+def card(name, updated_at):
+    return (f'<article class="space-card"><a class="header" href="/spaces/bench/{name}">{name}</a>'
+            f'<div class="description">stub {name}</div><time datetime="{updated_at}"></time></article>')
+
+
+# 只有一个 <time> 元素的详情页：详情页的更新时间解析为空
+DETAIL = ('<div class="space-readme"><article>image generator</article></div>'
+          '<div class="metadata"><time datetime="2024-01-05"></time></div>')
+
+
+def read_output(output_dir):
+    records = []
+    for path in glob.glob(f"{output_dir}/*.jsonl"):
+        with open(path, encoding='utf-8') as f:
+            records.extend(json.loads(line) for line in f)
+    return records
+
+
+@pytest.fixture
+def make_crawler(tmp_path, fake_session):
+    def make(tools_path, **kwargs):
+        crawler = HuggingFaceCrawler(base_url=BASE_URL, max_pages=2, delay=0, use_cache=False,
+                                     incremental=True, tools_yaml_path=str(tools_path), **kwargs)
+        crawler.output_dir = str(tmp_path)
+        crawler.session = fake_session
+        return crawler
+    return make
+
+
+@pytest.mark.parametrize('sharded', [False, True])
+def test_incremental_skips_unchanged_spaces(tmp_path, fake_session, make_crawler, sharded):
+    known = {'id': 'hf-space-bench-old', 'name': 'old', 'url': f"{BASE_URL}/spaces/bench/old",
+             'category': 'image', 'updated_at': '2024-01-02T00:00:00.000Z'}
+    if sharded:
+        tools_path = tmp_path / 'tools'
+        tools_path.mkdir()
+        (tools_path / 'image.yaml').write_text(yaml.safe_dump([known]), encoding='utf-8')
+    else:
+        tools_path = tmp_path / 'tools.yaml'
+        tools_path.write_text(yaml.safe_dump([known]), encoding='utf-8')
+
+    listing = card('old', '2024-01-02T00:00:00.000Z') + card('new', '2024-01-03T00:00:00.000Z')
+    fake_session.routes[f"{BASE_URL}/spaces?sort=trending&p=1"] = FakeResponse(text=listing)
+    fake_session.routes[f"{BASE_URL}/spaces?sort=trending&p=2"] = FakeResponse(text="<html></html>")
+    fake_session.routes[f"{BASE_URL}/spaces/bench/new"] = FakeResponse(text=DETAIL)
+
+    crawler = make_crawler(tools_path)
+    assert crawler.crawl() == 1
+    assert crawler.skipped_count == 1
+    assert f"{BASE_URL}/spaces/bench/old" not in fake_session.requested
+
+    # 写出的更新时间保持列表中的值，下次运行与列表比较时可以跳过
+    (record,) = read_output(tmp_path)
+    assert record['id'] == 'hf-space-bench-new'
+    assert record['updated_at'] == '2024-01-03T00:00:00.000Z'
+    assert record['detailed_description'] == 'image generator'
+
+
+def test_empty_detail_values_do_not_overwrite_listing(tmp_path, make_crawler):
+    crawler = make_crawler(tmp_path / 'missing.yaml')
+    space_data = {'id': 'hf-space-a-b', 'updated_at': '2024-01-03', 'description': 'card'}
+    crawler._merge_details(space_data, {'updated_at': '2024-02-01', 'description': '', 'comments_count': 3})
+    assert space_data == {'id': 'hf-space-a-b', 'updated_at': '2024-01-03', 'description': 'card',
+                          'comments_count': 3}
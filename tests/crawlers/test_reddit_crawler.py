@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+import time
+import logging
+from types import SimpleNamespace
+
+from reddit_crawler import RedditCrawler
+from utils.seen_index import SeenIndex
+
+logging.getLogger("reddit_crawler").setLevel(logging.WARNING)
+
+
+class FailingComments:
+    def replace_more(self, limit=0):
+        raise RuntimeError("comment fetch failed")
+
+
+class Comments:
+    def replace_more(self, limit=0):
+        pass
+
+    def list(self):
+        return [SimpleNamespace(body="nice tool")]
+
+
+class FakeSubreddit:
+    def __init__(self, name):
+        self.name = name
+
+    def _posts(self, prefix):
+        comments = FailingComments() if self.name == 'broken' else Comments()
+        return [SimpleNamespace(
+            id=f"{self.name}-{prefix}", title="I built an AI tool for image generation",
+            selftext="", url=f"https://example.com/{self.name}/{prefix}", comments=comments,
+            score=1, num_comments=1, upvote_ratio=1.0,
+            permalink=f"/r/{self.name}/comments/{prefix}", created_utc=time.time(),
+        )]
+
+    def new(self, limit):
+        return self._posts('new')
+
+    def search(self, query, sort, time_filter, limit):
+        return self._posts(query.replace(' ', '_'))
+
+
+def test_failed_units_are_not_recorded_as_seen(tmp_path):
+    reddit = SimpleNamespace(subreddit=FakeSubreddit)
+    crawler = RedditCrawler('id', 'secret', 'agent', ['good', 'broken'], limit=4,
+                            reddit_factory=lambda: reddit, use_seen_index=False)
+    crawler.output_dir = str(tmp_path)
+    index_path = str(tmp_path / 'seen.sqlite3')
+    crawler.seen_index = SeenIndex(index_path)
+
+    count = crawler.crawl()
+    crawler.seen_index.close()
+
+    index = SeenIndex(index_path)
+    assert count == 7
+    assert index.seen('good-new')
+    assert index.seen('other-post', 'https://EXAMPLE.com/good/new/')
+    # 评论获取失败的单元没有写出工具，其帖子下次运行仍会处理
+    assert not index.seen('broken-new')
+    assert not index.seen('other-post', 'https://example.com/broken/new')
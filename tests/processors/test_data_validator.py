@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+import sys
+
+import data_validator
+from data_validator import validate_tools
+from utils.tools_cache import sidecar_path
+
+CATALOG = """\
+- id: tool
+  name: Tool
+  url: https://example.com/tool
+  description: A tool
+  category: text
+"""
+
+
+def test_unhashable_category_is_reported():
+    tools = [
+        {'id': 'a', 'name': 'A', 'url': 'https://a.example.com', 'description': 'A', 'category': ['text']},
+        {'id': 'b', 'name': 'B', 'url': 'https://b.example.com', 'description': 'B', 'category': {'x': 1}},
+    ]
+    errors = validate_tools(tools)
+    assert [(error['index'], error['rule']) for error in errors] == [(0, 'invalid-category'), (1, 'invalid-category')]
+
+
+def test_validation_does_not_write_cache(tmp_path, monkeypatch, capsys):
+    path = tmp_path / 'tools.yaml'
+    path.write_text(CATALOG, encoding='utf-8')
+    shard_dir = tmp_path / 'shards'
+    shard_dir.mkdir()
+    (shard_dir / 'text.yaml').write_text(CATALOG, encoding='utf-8')
+
+    for target in (path, shard_dir):
+        monkeypatch.setattr(sys, 'argv', ['data_validator.py', str(target)])
+        data_validator.main()
+        assert 'All tools validated successfully.' in capsys.readouterr().out
+
+    assert not (tmp_path / sidecar_path('tools.yaml')).exists()
+    assert not (shard_dir / sidecar_path('text.yaml')).exists()
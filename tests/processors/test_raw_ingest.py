@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+from datetime import datetime, timedelta
+
+import raw_ingest
+from raw_ingest import select_raw_files, iter_raw_records, ProcessedManifest
+from update_yaml import load_raw_json_files
+from utils.jsonl_writer import JsonlWriter
+
+
+def write_jsonl(path, records):
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def test_unfinished_crawl_output_is_skipped(tmp_path):
+    raw_dir = tmp_path / 'raw'
+    raw_dir.mkdir()
+    write_jsonl(str(raw_dir / 'huggingface_spaces_20250101_120000.jsonl'), [{'name': 'done'}])
+    # 爬取中断后留下 .progress 检查点的文件不应被合并，检查点本身也不是原始文件
+    writer = JsonlWriter(str(raw_dir), 'reddit_tools')
+    writer.write({'name': 'partial'})
+    writer.checkpoint({'page': 1})
+    writer._file.close()
+
+    now = datetime(2025, 1, 2)
+    paths = select_raw_files(str(raw_dir), days=7, now=now)
+    assert [os.path.basename(path) for path in paths] == ['huggingface_spaces_20250101_120000.jsonl']
+    assert [record['name'] for record in iter_raw_records(paths)] == ['done']
+
+    # 续爬完成、检查点删除后，同一文件才会被选中
+    resumed = JsonlWriter(str(raw_dir), 'reddit_tools', resume=True)
+    resumed.close()
+    paths = select_raw_files(str(raw_dir), days=7, now=datetime.now())
+    assert resumed.path in paths
+
+
+def test_manifest_skips_merged_files_after_save(tmp_path):
+    raw_dir = tmp_path / 'raw'
+    raw_dir.mkdir()
+    first = str(raw_dir / 'reddit_tools_20250101_120000.jsonl')
+    write_jsonl(first, [{'name': 'a'}])
+    manifest_path = str(tmp_path / 'processed' / 'raw_manifest.json')
+
+    manifest = ProcessedManifest(manifest_path)
+    assert manifest.filter_new([first]) == [first]
+    manifest.mark(first)
+    # 保存前标记不生效，合并失败重跑时会重新处理
+    assert ProcessedManifest(manifest_path).filter_new([first]) == [first]
+    manifest.save()
+
+    # 改名后内容不变的文件不会重复合并，内容变化后重新合并
+    renamed = str(raw_dir / 'reddit_tools_20250102_120000.jsonl')
+    os.rename(first, renamed)
+    second = str(raw_dir / 'huggingface_spaces_20250102_120000.jsonl')
+    write_jsonl(second, [{'name': 'b'}])
+    manifest = ProcessedManifest(manifest_path)
+    assert manifest.filter_new([renamed, second]) == [second]
+    write_jsonl(renamed, [{'name': 'a'}, {'name': 'c'}])
+    assert manifest.filter_new([renamed, second]) == [renamed, second]
+
+    with open(manifest_path, encoding='utf-8') as f:
+        entries = json.load(f)['files']
+    assert [entry['path'] for entry in entries.values()] == [os.path.join('..', 'raw', os.path.basename(first))]
+
+
+def test_records_are_marked_only_after_the_file_is_read(tmp_path):
+    raw_dir = tmp_path / 'raw'
+    raw_dir.mkdir()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    paths = [str(raw_dir / f"{prefix}_{timestamp}.jsonl") for prefix in ('huggingface_spaces', 'reddit_tools')]
+    for number, path in enumerate(paths):
+        write_jsonl(path, [{'name': f"tool-{number}"}])
+    manifest_path = str(tmp_path / 'raw_manifest.json')
+
+    manifest = ProcessedManifest(manifest_path)
+    records = load_raw_json_files(str(raw_dir), days=1, manifest=manifest)
+    next(records)
+    assert len(manifest._pending) == 0
+    list(records)
+    assert len(manifest._pending) == 2
+    manifest.save()
+
+    assert list(load_raw_json_files(str(raw_dir), days=1, manifest=ProcessedManifest(manifest_path))) == []
+    # --reprocess 忽略清单，重新读取窗口内的所有文件
+    reprocessed = load_raw_json_files(str(raw_dir), days=1, manifest=ProcessedManifest(manifest_path, reprocess=True))
+    assert sorted(record['name'] for record in reprocessed) == ['tool-0', 'tool-1']
+
+
+def test_save_prunes_expired_entries(tmp_path):
+    manifest_path = str(tmp_path / 'raw_manifest.json')
+    expired = (datetime.now() - timedelta(days=raw_ingest.MANIFEST_RETENTION_DAYS + 1)).strftime("%Y-%m-%d %H:%M:%S")
+    recent = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S")
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({'files': {'old': {'path': 'old.jsonl', 'merged_at': expired},
+                             'recent': {'path': 'recent.jsonl', 'merged_at': recent}}}, f)
+
+    manifest = ProcessedManifest(manifest_path)
+    manifest.save()
+    assert sorted(ProcessedManifest(manifest_path).entries) == ['recent']
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+
+import tool_merge
+from tool_merge import merge_batch
+
+CRAWLED = {'type': 'crawler'}
+
+
+def make_existing(count):
+    return [
+        {'id': f"tool-{i}", 'name': f"Tool {i}", 'url': f"https://site{i}.example.com/app",
+         'description': f"Existing tool {i}", 'category': 'other', 'tags': [f"t{i}"], 'source': CRAWLED}
+        for i in range(count)
+    ]
+
+
+def make_records(count, existing_count):
+    # 新记录交替命中现有工具、新工具和此前添加的新工具，同一工具被多批记录命中
+    for i in range(count):
+        target = i % (existing_count + 3)
+        yield {'name': f"Tool {target}", 'url': f"https://www.site{target}.example.com/app/?utm_source=x",
+               'description': f"Existing tool {target}", 'tags': [f"t{i % 5}"], 'likes': i,
+               'source': CRAWLED}
+
+
+def test_batched_stream_matches_single_batch(monkeypatch):
+    existing = make_existing(10)
+    expected = merge_batch(existing, list(make_records(40, 10)), '2025-01-01')
+
+    monkeypatch.setattr(tool_merge, 'BATCH_SIZE', 3)
+    consumed = []
+
+    def stream():
+        for record in make_records(40, 10):
+            consumed.append(record)
+            yield record
+
+    records = stream()
+    assert merge_batch(existing, records, '2025-01-01') == expected
+    assert len(consumed) == 40 and next(records, None) is None
+    assert expected[1]['added'] == 3 and expected[1]['updated'] + expected[1]['unchanged'] == 37
+
+
+def test_text_matches_are_opt_in_and_recorded():
+    existing = [{'id': 'voice-clone', 'name': 'Voice Clone', 'url': 'https://huggingface.co/spaces/alice/voice-clone',
+                 'description': 'Clone any voice from a short sample and read text aloud', 'source': CRAWLED}]
+    fork = dict(existing[0], url='https://huggingface.co/spaces/bob/voice-clone')
+    del fork['id']
+    mirror = dict(fork, url='https://voice-clone.example.org/')
+
+    merged, stats, changes = merge_batch(existing, [fork, mirror], '2025-01-01')
+    assert stats['added'] == 2 and changes['near_duplicates'] == []
+
+    merged, stats, changes = merge_batch(existing, [fork, mirror], '2025-01-01', near_duplicates=True)
+    assert stats['added'] == 1 and merged[1]['url'] == fork['url']
+    assert changes['near_duplicates'] == [
+        {'id': 'voice-clone', 'name': 'Voice Clone', 'url': 'https://voice-clone.example.org/',
+         'rule': 'text', 'score': 1.0},
+    ]
+
+
+def test_pool_matches_serial(monkeypatch):
+    existing = make_existing(10)
+    records = list(make_records(40, 10))
+    expected = merge_batch(existing, records, '2025-01-01', near_duplicates=True)
+
+    # 小块使每个工作进程都分到多块，工作进程只计算规范化URL和特征，合并在当前进程中进行
+    monkeypatch.setattr(tool_merge, 'CHUNK_SIZE', 4)
+    with multiprocessing.Pool(2) as pool:
+        assert merge_batch(existing, iter(records), '2025-01-01', near_duplicates=True, pool=pool) == expected
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import pytest
+
+import tools_archive
+from tools_archive import ToolArchive
+
+
+def catalog(*names):
+    # 含非ASCII字符、行尾空格和CRLF换行，还原时必须逐字节一致
+    return ''.join(f"- id: {name}\r\n  name: 工具 {name} \n  tags: [a, b]\n" for name in names)
+
+
+def write(path, text):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return ToolArchive(str(tmp_path / 'archive'))
+
+
+def test_restore_is_byte_identical(tmp_path, archive):
+    tools_path = str(tmp_path / 'tools.yaml')
+    versions = [catalog('a', 'b'), catalog('a', 'b', 'c'), catalog('c', 'a')]
+    for number, text in enumerate(versions):
+        write(tools_path, text)
+        archive.add(tools_path, snapshot_id=f"2025010{number + 1}_000000")
+
+    for snapshot_id, text in zip(archive.snapshots(), versions):
+        output = str(tmp_path / 'restored' / f"{snapshot_id}.yaml")
+        archive.restore(snapshot_id, output)
+        assert read_bytes(output) == text.encode('utf-8')
+
+
+def test_sharded_restore_reads_only_indexed_packs(tmp_path, archive, monkeypatch):
+    shard_dir = tmp_path / 'tools'
+    shard_dir.mkdir()
+    write(str(shard_dir / 'text.yaml'), catalog('a'))
+    write(str(shard_dir / 'image.yaml'), catalog('b'))
+    archive.add(str(shard_dir), snapshot_id='20250101_000000')
+    write(str(shard_dir / 'image.yaml'), catalog('b', 'c'))
+    archive.add(str(shard_dir), snapshot_id='20250102_000000')
+    write(str(shard_dir / 'text.yaml'), catalog('d'))
+    archive.add(str(shard_dir), snapshot_id='20250103_000000')
+
+    read = []
+    original = tools_archive._read_json_gz
+    monkeypatch.setattr(tools_archive, '_read_json_gz', lambda path: read.append(path) or original(path))
+    output = tmp_path / 'restored'
+    archive.restore('20250102_000000', str(output))
+
+    # 第三个快照新增的包与该快照无关，不会被读取
+    packs = sorted(os.path.basename(path) for path in read if os.sep + 'packs' + os.sep in path)
+    assert packs == ['20250101_000000.json.gz', '20250102_000000.json.gz']
+    assert read_bytes(str(output / 'text.yaml')) == catalog('a').encode('utf-8')
+    assert read_bytes(str(output / 'image.yaml')) == catalog('b', 'c').encode('utf-8')
+
+
+def test_unchanged_catalog_is_not_archived_again(tmp_path, archive):
+    tools_path = str(tmp_path / 'tools.yaml')
+    write(tools_path, catalog('a', 'b'))
+    assert archive.add(tools_path, snapshot_id='20250101_000000') == '20250101_000000'
+    assert archive.add(tools_path, snapshot_id='20250102_000000') is None
+    assert archive.snapshots() == ['20250101_000000']
+
+    # 只新增变化过的内容块
+    write(tools_path, catalog('a', 'c'))
+    assert archive.add(tools_path, snapshot_id='20250103_000000') == '20250103_000000'
+    assert len(tools_archive._read_json_gz(archive._pack_path('20250103_000000'))) == 1
+
+
+def test_prune_keeps_last_and_monthly_and_collects_packs(tmp_path, archive):
+    tools_path = str(tmp_path / 'tools.yaml')
+    snapshot_ids = ['20250110_000000', '20250120_000000', '20250215_000000', '20250301_000000',
+                    '20250302_000000', '20250303_000000']
+    for number, snapshot_id in enumerate(snapshot_ids):
+        # 每个快照都有一个只属于它的工具和一个所有快照共享的工具
+        write(tools_path, catalog('shared', f"only-{number}"))
+        archive.add(tools_path, snapshot_id=snapshot_id)
+
+    # 保留最新的2个，以及最近2个月（2月、3月）每月的最后一个
+    assert archive.prune(keep_last=2, keep_monthly=2) == 3
+    kept = ['20250215_000000', '20250302_000000', '20250303_000000']
+    assert archive.snapshots() == kept
+
+    # 只剩失效内容块的包被删除，共享内容块所在的包只保留仍被引用的块
+    packs = sorted(name[:-len('.json.gz')] for name in os.listdir(archive.pack_dir))
+    assert packs == ['20250110_000000'] + kept
+    assert len(tools_archive._read_json_gz(archive._pack_path('20250110_000000'))) == 1
+    for number, snapshot_id in [(2, kept[0]), (4, kept[1]), (5, kept[2])]:
+        output = str(tmp_path / f"{snapshot_id}.yaml")
+        archive.restore(snapshot_id, output)
+        assert read_bytes(output) == catalog('shared', f"only-{number}").encode('utf-8')
+
+
+def test_legacy_manifest_without_pack_index_still_restores(tmp_path, archive):
+    tools_path = str(tmp_path / 'tools.yaml')
+    write(tools_path, catalog('a', 'b'))
+    archive.add(tools_path, snapshot_id='20250101_000000')
+    manifest_path = os.path.join(archive.snapshot_dir, '20250101_000000.json.gz')
+    manifest = archive.manifest('20250101_000000')
+    del manifest['packs']
+    tools_archive._write_json_gz(manifest_path, manifest)
+
+    write(tools_path, catalog('a', 'c'))
+    archive.add(tools_path, snapshot_id='20250102_000000')
+    assert archive.manifest('20250102_000000')['packs']['20250101_000000'] != []
+
+    for snapshot_id, text in [('20250101_000000', catalog('a', 'b')), ('20250102_000000', catalog('a', 'c'))]:
+        output = str(tmp_path / f"{snapshot_id}.yaml")
+        archive.restore(snapshot_id, output)
+        assert read_bytes(output) == text.encode('utf-8')
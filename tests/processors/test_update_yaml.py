@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from update_yaml import load_tools_yaml, save_tools_yaml, merge_tools, merge_tools_into_store
+from utils.tool_store import ToolStore
+
+EXISTING = """\
+- id: existing
+  name: Existing
+  url: https://example.com/existing
+  description: Already in the catalog
+  category: text
+"""
+
+
+def new_tools():
+    tools = [
+        {'name': f"New {i}", 'url': f"https://new{i}.example.com", 'description': f"New tool {i}",
+         'category': 'image', 'source': {'type': 'crawler'}}
+        for i in range(4)
+    ]
+    tools.insert(2, {'name': 'FTP', 'url': 'ftp://x', 'description': 'Not a web tool',
+                     'source': {'type': 'crawler'}})
+    return tools
+
+
+def merge_yaml(source, output):
+    merged, changes = merge_tools(load_tools_yaml(str(source)), new_tools(), run_date='2025-01-01')
+    assert save_tools_yaml(merged, str(output))
+    return changes
+
+
+def merge_sqlite(source, output):
+    store = ToolStore(str(output.parent / 'tools.db'))
+    store.sync_from_yaml(str(source), load_tools_yaml)
+    changes = merge_tools_into_store(store, new_tools(), run_date='2025-01-01')
+    assert store.export_yaml(str(output), save_tools_yaml)
+    store.close()
+    return changes
+
+
+@pytest.mark.parametrize('merge', [merge_yaml, merge_sqlite])
+def test_invalid_new_tool_is_not_counted_as_added(tmp_path, merge):
+    source = tmp_path / 'tools.yaml'
+    source.write_text(EXISTING, encoding='utf-8')
+    output = tmp_path / 'out' / 'tools.yaml'
+    output.parent.mkdir()
+
+    changes = merge(source, output)
+
+    saved = load_tools_yaml(str(output))
+    assert len(changes['added']) == 4
+    assert [tool['id'] for tool in saved[1:]] == changes['added']
+    assert all(tool['url'] != 'ftp://x' for tool in saved)
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from utils.classifier import KeywordClassifier
+
+TEXTS = [
+    ('gradio docker', 'A stable diffusion demo that also does text-to-video'),
+    ('', 'Began as a side project across several teams'),
+    ('robot', 'A multimodal agent for drones'),
+    ('', 'Chat with your PDF, writing assistant'),
+    ('', ''),
+    ('', 'Ported from asp.net'),
+]
+
+
+@pytest.fixture(scope='module')
+def classifier():
+    return KeywordClassifier({'image': ['gan', 'stable diffusion'], 'video': ['text-to-video'],
+                              'robotics': ['robot', 'drone'], 'text': ['chat', '.net']},
+                             {'docker': ['docker']}, default_category='other')
+
+
+def test_category_only_matches_full_scan(classifier):
+    for texts in TEXTS:
+        assert classifier.classify_category(*texts) == classifier.classify(*texts)[0]
+    assert [classifier.classify_category(*texts) for texts in TEXTS] == \
+        ['image', 'other', 'robotics', 'text', 'other', 'text']
+
+
+def test_category_keywords_must_start_a_word(classifier):
+    # 'gan' 出现在 began/organ 中，'robot' 出现在 microbot 中，都不在词首
+    assert classifier.classify_category('organ microbot', 'it began') == 'other'
+    assert classifier.classify_category('gans and robots') == 'image'
+
+
+def test_metadata_classifier_agrees_with_full_scan():
+    classifier = KeywordClassifier.from_metadata(default_category='text')
+    for texts in TEXTS:
+        assert classifier.classify_category(*texts) == classifier.classify(*texts)[0]
+
+
+def test_metadata_priority_order():
+    # 通用规则（Reddit）：机器人先于多模态，文本关键词排在最后
+    general = KeywordClassifier.from_metadata(default_category='other')
+    assert general.categories == ['image', 'video', 'audio', 'workflow', 'robotics', 'multimodal', 'text']
+    assert general.classify_category('A multimodal robot') == 'robotics'
+    assert general.classify_category('Chat with a drone') == 'robotics'
+
+    # Hugging Face 沿用原来的规则：多模态先于机器人，只用原来的关键词，没有命中时归为 text
+    huggingface = KeywordClassifier.from_metadata(default_category='text', crawler='huggingface')
+    assert huggingface.categories == ['image', 'video', 'audio', 'workflow', 'multimodal', 'robotics']
+    assert huggingface.classify_category('A multimodal robot') == 'multimodal'
+    assert huggingface.classify_category('Chat with a drone') == 'text'
+    assert huggingface.classify_category('gradio', 'Film editing agent') == 'text'
+    for texts in TEXTS:
+        assert huggingface.classify_category(*texts) == huggingface.classify(*texts)[0]
+
+
+def test_metadata_tags_keep_reddit_tag_names():
+    classifier = KeywordClassifier.from_metadata()
+    for text in ('Full customization of prompts', 'Personalize your feed', 'A recommendation engine'):
+        assert 'personalization' in classifier.classify(text)[1], text
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+
+from utils.jsonl_writer import JsonlWriter
+
+
+def test_resume_truncates_to_last_checkpoint(tmp_path):
+    writer = JsonlWriter(str(tmp_path), 'reddit_tools', flush_every=1)
+    writer.write({'id': 'a'})
+    writer.write({'id': 'b'})
+    writer.checkpoint({'page': 1})
+    # 模拟崩溃：检查点之后写了一条记录和半行，文件未关闭
+    writer.write({'id': 'c'})
+    writer._file.write('{"id": "d"')
+    writer._file.flush()
+    path = writer.path
+    assert os.path.exists(f"{path}.progress")
+
+    resumed = JsonlWriter(str(tmp_path), 'reddit_tools', resume=True)
+    assert resumed.path == path
+    assert resumed.state == {'page': 1}
+    assert resumed.count == 2
+    assert [record['id'] for record in resumed.records()] == ['a', 'b']
+
+    resumed.write({'id': 'c'})
+    resumed.close()
+    assert not os.path.exists(f"{path}.progress")
+    with open(path, encoding='utf-8') as f:
+        assert [json.loads(line)['id'] for line in f] == ['a', 'b', 'c']
+
+
+def test_resume_without_unfinished_file_starts_new_output(tmp_path):
+    finished = JsonlWriter(str(tmp_path), 'reddit_tools')
+    finished.write({'id': 'a'})
+    finished.close()
+
+    writer = JsonlWriter(str(tmp_path), 'reddit_tools', resume=True)
+    assert writer.path != finished.path
+    assert writer.count == 0 and writer.state == {}
+    writer.close()
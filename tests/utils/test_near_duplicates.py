@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+from array import array
+
+import pytest
+
+from utils.near_duplicates import NearDuplicateIndex
+
+README = ("Clone any voice from a short sample and read text aloud with natural intonation, "
+          "runs on a single GPU and exports wav files")
+
+
+def space(owner, name='Voice Clone', description=README):
+    return {'name': name, 'url': f"https://huggingface.co/spaces/{owner}/voice-clone", 'description': description}
+
+
+def test_mirror_on_another_site_matches_by_text():
+    index = NearDuplicateIndex()
+    index.add(0, space('alice'))
+    mirror = {'name': 'voice clone', 'url': 'https://github.com/alice-lab/voice-clone-app',
+              'description': README + '.'}
+
+    key, score = index.match(mirror)
+    assert key == 0 and score >= index.threshold
+    # 只按URL别名匹配时文本相同也不合并
+    text_off = NearDuplicateIndex(text=False)
+    text_off.add(0, space('alice'))
+    assert text_off.match(mirror) == (None, None)
+
+
+def test_fork_with_same_title_and_readme_stays_separate():
+    index = NearDuplicateIndex()
+    index.add(0, space('alice'))
+    assert index.match(space('bob')) == (None, None)
+    # 同一个Space的另一种地址仍按URL别名匹配
+    assert index.match({'url': 'https://alice-voice-clone.hf.space/'}) == (0, None)
+
+
+def text_features(names, descriptions):
+    return '', (array('I', names), array('I', descriptions), [1])
+
+
+@pytest.mark.parametrize('shared, expected', [(6, 0), (5, None)])
+def test_combined_threshold_is_inclusive(shared, expected):
+    # 名称完全相同（10/10），描述共有 shared 个特征：(10 + 6) / 20 = 0.8 达到阈值，(10 + 5) / 20 不到
+    index = NearDuplicateIndex(threshold=0.8)
+    index.add(0, None, text_features(range(10), range(100, 110)))
+    query = text_features(range(10), range(100, 100 + shared))
+    key, score = index.match(None, query)
+    assert key == expected
+    assert score == (pytest.approx(0.8) if expected is not None else None)
+
+
+@pytest.mark.parametrize('shared, expected', [(4, 0), (3, None)])
+def test_name_threshold_is_inclusive(shared, expected):
+    # 名称共有 shared 个特征：4 / 8 = 0.5 达到名称阈值，3 / 8 不到；描述完全相同，合并相似度足够高
+    index = NearDuplicateIndex(threshold=0.5, name_threshold=0.5)
+    index.add(0, None, text_features(range(6), range(100, 130)))
+    query = text_features(list(range(shared)) + [50, 51], range(100, 130))
+    assert index.find(None, query) == expected
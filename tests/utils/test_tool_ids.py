@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+from utils.tool_ids import stable_tool_id, unique_id, is_legacy_id, migrate_legacy_ids, save_remap
+
+
+def test_legacy_ids_are_remapped_to_stable_ids():
+    tools = [
+        {'id': 'example-20250101', 'url': 'https://www.example.com/a'},
+        {'id': 'example-20250101', 'url': 'https://example.com/b'},
+        {'id': 'hf-space-owner-app', 'url': 'https://huggingface.co/spaces/owner/app'},
+        {'id': 'other-20250101', 'url': 'https://example.com/c'},
+    ]
+    remap = migrate_legacy_ids(tools)
+
+    assert [entry['old_id'] for entry in remap] == ['example-20250101', 'example-20250101']
+    assert [tool['id'] for tool in tools[:2]] == [stable_tool_id(tools[0]['url']), stable_tool_id(tools[1]['url'])]
+    assert tools[0]['id'].startswith('example-') and tools[0]['id'] != tools[1]['id']
+    # 爬虫提供的ID和与域名不符的ID不是旧版格式，保持不变
+    assert [tool['id'] for tool in tools[2:]] == ['hf-space-owner-app', 'other-20250101']
+    assert not is_legacy_id(tools[3])
+
+
+def test_colliding_ids_get_numeric_suffixes():
+    taken = {'tool-abc', 'tool-abc-2'}
+    assert unique_id('tool-new', taken.__contains__) == 'tool-new'
+    assert unique_id('tool-abc', taken.__contains__) == 'tool-abc-3'
+
+    # 两个旧版ID的工具指向同一URL时，第二个追加序号；已被非旧版工具占用的ID同样避开
+    url = 'https://example.com/app'
+    tools = [
+        {'id': stable_tool_id(url), 'url': 'https://elsewhere.org/'},
+        {'id': 'example-20250101', 'url': url},
+        {'id': 'example-20250102', 'url': url},
+    ]
+    migrate_legacy_ids(tools)
+    assert [tool['id'] for tool in tools[1:]] == [f"{stable_tool_id(url)}-2", f"{stable_tool_id(url)}-3"]
+
+
+def test_ids_are_stable_across_reruns(tmp_path):
+    # 同一工具的不同写法得到相同的ID，与运行日期无关
+    variants = ['https://GitHub.com/Owner/Repo', 'https://github.com/owner/repo/tree/main/src',
+                'http://www.github.com/owner/repo/?utm_source=x']
+    assert len({stable_tool_id(url) for url in variants}) == 1
+    assert stable_tool_id(variants[0]).startswith('owner-repo-')
+
+    tools = [{'id': 'example-20250101', 'url': 'https://example.com/a'}]
+    first = migrate_legacy_ids(tools)
+    assert migrate_legacy_ids(tools) == []
+    assert tools[0]['id'] == first[0]['new_id']
+
+    remap_path = str(tmp_path / 'id_remap.json')
+    save_remap(remap_path, first)
+    save_remap(remap_path, [])
+    with open(remap_path, encoding='utf-8') as f:
+        assert json.load(f)['entries'] == first
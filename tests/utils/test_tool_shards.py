@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from utils.tool_shards import load_shards, save_shards
+
+
+def make_tool(index, category):
+    return {'id': f"tool-{index}", 'name': f"Tool {index}", 'url': f"https://tool{index}.example.com",
+            'description': f"Tool {index}", 'category': category}
+
+
+@pytest.fixture
+def shard_dir(tmp_path):
+    path = tmp_path / 'tools'
+    save_shards([make_tool(0, 'text'), make_tool(1, 'image'), make_tool(2, 'video')], str(path))
+    return path
+
+
+def test_partial_load_then_save_keeps_other_shards(shard_dir):
+    untouched = {name: (shard_dir / name).read_bytes() for name in ('text.yaml', 'video.yaml')}
+
+    tools = load_shards(str(shard_dir), categories=['image', 'audio'])
+    assert [tool['id'] for tool in tools] == ['tool-1']
+    tools[0]['description'] = 'Changed'
+    tools.append(make_tool(3, 'audio'))
+
+    assert save_shards(tools, str(shard_dir), loaded_categories=['image', 'audio']) == (2, 0, 0)
+    assert {name: (shard_dir / name).read_bytes() for name in untouched} == untouched
+    assert [tool['id'] for tool in load_shards(str(shard_dir))] == ['tool-3', 'tool-1', 'tool-0', 'tool-2']
+
+
+def test_partial_save_only_removes_loaded_shards(shard_dir):
+    tools = load_shards(str(shard_dir), categories=['image'])
+    assert save_shards([], str(shard_dir), loaded_categories=['image']) == (0, 0, 1)
+    assert sorted(path.name for path in shard_dir.glob('*.yaml')) == ['text.yaml', 'video.yaml']
+
+    # 分类改到未读取的分片时拒绝写入，不覆盖该分片中的工具
+    tools[0]['category'] = 'text'
+    with pytest.raises(ValueError):
+        save_shards(tools, str(shard_dir), loaded_categories=['image'])
+    assert [tool['id'] for tool in load_shards(str(shard_dir), categories=['text'])] == ['tool-0']
+
+
+def test_full_save_removes_empty_categories(shard_dir):
+    tools = [tool for tool in load_shards(str(shard_dir)) if tool['category'] != 'video']
+    assert save_shards(tools, str(shard_dir)) == (0, 2, 1)
+    assert not (shard_dir / 'video.yaml').exists()
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+from update_yaml import load_tools_yaml, save_tools_yaml
+from utils.tool_store import ToolStore
+
+# 手工编辑的记录：日期和时间未加引号，YAML加载为 date/datetime 对象
+HAND_EDITED = """\
+- id: hand-edited
+  name: Hand Edited
+  url: https://example.com/tool
+  description: Added by hand
+  category: text
+  added_date: 2025-01-01
+  source:
+    type: manual
+    checked_at: 2025-01-02 03:04:05
+- id: crawled
+  name: Crawled
+  url: https://example.org/app
+  description: From a crawler
+  category: image
+  added_date: '2025-01-03'
+"""
+
+
+def test_sqlite_export_matches_yaml_path(tmp_path):
+    source = tmp_path / 'tools.yaml'
+    source.write_text(HAND_EDITED, encoding='utf-8')
+
+    yaml_output = tmp_path / 'yaml' / 'tools.yaml'
+    assert save_tools_yaml(load_tools_yaml(str(source)), str(yaml_output))
+
+    store = ToolStore(str(tmp_path / 'tools.db'))
+    store.sync_from_yaml(str(source), load_tools_yaml)
+    sqlite_output = tmp_path / 'sqlite' / 'tools.yaml'
+    assert store.export_yaml(str(sqlite_output), save_tools_yaml)
+    store.close()
+
+    assert sqlite_output.read_text(encoding='utf-8') == yaml_output.read_text(encoding='utf-8') == HAND_EDITED
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+
+from utils.urls import normalize_url, canonical_key
+
+
+def test_host_prefix_is_kept_when_it_is_part_of_the_domain():
+    assert normalize_url('https://m.io/app') == 'm.io/app'
+    assert normalize_url('https://www.co/') == 'www.co'
+    assert normalize_url('https://m.example.io/app') == 'example.io/app'
+    assert normalize_url('https://WWW.Example.com/app/') == 'example.com/app'
+    assert normalize_url('https://m.io/app') != normalize_url('https://io/app')
+
+
+def test_github_file_paths_keep_their_case():
+    assert normalize_url('https://github.com/Owner/Repo.git') == 'github.com/owner/repo'
+    assert normalize_url('https://github.com/Owner') == 'github.com/owner'
+    readme = normalize_url('https://github.com/Owner/Repo/blob/main/README.md')
+    assert readme == 'github.com/owner/repo/blob/main/README.md'
+    assert readme != normalize_url('https://github.com/owner/repo/blob/main/readme.md')
+    assert canonical_key('https://github.com/Owner/Repo/tree/Main/Docs') == 'github:owner/repo'
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+
+import pytest
+import yaml
+
+from utils import yaml_io
+from utils.yaml_io import HAS_LIBYAML, DUMP_OPTIONS, dump_yaml, write_text_atomic
+
+requires_libyaml = pytest.mark.skipif(not HAS_LIBYAML, reason="PyYAML未编译LibYAML支持")
+
+REDDIT_SELFTEXT = (
+    "I built a tool for summarizing PDFs with a local LLM. \n\n"
+    "Repo: https://github.com/someuser/some-really-long-repository-name-for-pdf-summaries/tree/main/src \n\n"
+    "Feedback welcome!"
+)
+
+
+def python_dump(data):
+    return yaml.dump(data, Dumper=yaml.SafeDumper, **DUMP_OPTIONS)
+
+
+@requires_libyaml
+def test_folded_double_quoted_scalar_matches_python_dumper():
+    data = [
+        {'id': 'plain', 'description': 'no special characters here'},
+        {'id': 'reddit', 'description': REDDIT_SELFTEXT, 'tags': ['🚀 launch']},
+    ]
+    assert dump_yaml(data) == python_dump(data)
+
+
+@requires_libyaml
+def test_random_double_quoted_scalars_match_python_dumper():
+    rng = random.Random(0)
+    words = ['tool', 'https://github.com/someuser/some-really-long-repository-name/tree/main/src',
+             'x' * 30, '\n', ' \n', '\t', 'é', '🚀', '"', ':', '\\']
+    for _ in range(300):
+        text = ''.join(rng.choice(words) + rng.choice(['', ' ']) for _ in range(rng.randint(1, 40)))
+        data = [{'id': 't', 'description': text, 'source': {'url': text[:50]}}]
+        assert dump_yaml(data) == python_dump(data), repr(text)
+
+
+@requires_libyaml
+def test_astral_and_private_use_characters_match_python_dumper():
+    data = [
+        {'id': 'plain', 'name': 'Plain tool', 'tags': ['api']},
+        {'id': 'emoji', 'name': '🚀 Rocket', 'description': "It's fast 🚀: really", 'tags': ['🎨']},
+        {'id': 'nel', 'description': 'line\x85break'},
+        {'id': 'private', 'description': 'private \ue000 use'},
+        {'id': 'quoted', 'description': '🚀\ttab'},
+    ]
+    text = dump_yaml(data)
+    assert text == python_dump(data)
+    # 不含特殊字符的元素保留C实现的输出
+    assert text.startswith(yaml.dump(data[:1], Dumper=yaml.CSafeDumper, **DUMP_OPTIONS))
+
+
+def test_write_text_atomic_skips_unchanged_content(tmp_path):
+    path = str(tmp_path / 'tools.yaml')
+    assert write_text_atomic(path, '- id: a\n')
+    os.utime(path, (0, 0))
+
+    # 内容相同时不写入，修改时间保持不变
+    assert not write_text_atomic(path, '- id: a\n')
+    assert os.stat(path).st_mtime == 0
+
+    assert write_text_atomic(path, '- id: b\n')
+    assert os.stat(path).st_mtime != 0
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == '- id: b\n'
+
+
+def test_failed_write_keeps_original_file(tmp_path, monkeypatch):
+    path = str(tmp_path / 'tools.yaml')
+    write_text_atomic(path, '- id: a\n')
+
+    def fail(fd):
+        raise OSError("磁盘已满")
+
+    monkeypatch.setattr(yaml_io.os, 'fsync', fail)
+    with pytest.raises(OSError):
+        write_text_atomic(path, '- id: b\n')
+
+    # 原文件内容不变，也不留下临时文件
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == '- id: a\n'
+    assert os.listdir(str(tmp_path)) == ['tools.yaml']